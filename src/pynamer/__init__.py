@@ -45,8 +45,16 @@
 setup_file_py_trv = project_path.joinpath("setup.py")
 setup_base_file_trv = project_path.joinpath("setup_base.txt")
 project_count_file_trv = project_path.joinpath("project_count.pickle")
+index_meta_file_trv = project_path.joinpath("index_meta.pickle")
 pypi_index_file_trv = project_path.joinpath("pypi_index")
+pypi_index_filter_file_trv = project_path.joinpath("pypi_index.filter")
+pypi_index_delta_file_trv = project_path.joinpath("pypi_index.delta")
+pypi_index_lock_file_trv = project_path.joinpath("pypi_index.lock")
+pypi_index_trigram_file_trv = project_path.joinpath("pypi_index.trigrams")
+pypi_index_hash_file_trv = project_path.joinpath("pypi_index.hashes.npy")
+pypi_index_hash_names_file_trv = project_path.joinpath("pypi_index.names.npy")
 meta_file_trv = project_path.joinpath("meta.pickle")
+http_cache_file_trv = project_path.joinpath("http_cache.sqlite3")
 
 
 if setup_file_trv.is_file():
@@ -61,6 +69,12 @@
     project_count = 877526
 
 
+if index_meta_file_trv.is_file():
+    index_meta = pickle.loads(index_meta_file_trv.read_bytes())
+else:  # pragma: no cover
+    index_meta = {}
+
+
 if meta_file_trv.is_file():
     meta = pickle.loads(meta_file_trv.read_bytes())
 else:  # pragma: no cover
@@ -87,6 +87,30 @@ def _parse_args(args: list) -> tuple[argparse.Namespace, argparse.ArgumentParser
         type=str,
         help="file to save the test results",
     )
+    parser.add_argument(
+        "--prefix",
+        metavar="PREFIX",
+        default="None",
+        type=str,
+        help="list the projects in the PyPI index starting with PREFIX",
+    )
+    parser.add_argument(
+        "--jobs",
+        metavar="N",
+        default=1,
+        type=int,
+        help="check up to N project names at once",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="neither use nor update the cache of PyPI and GitHub responses",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="fetch every response again and update the cache",
+    )
     parser.add_argument(
         "--version",
         action="store_true",
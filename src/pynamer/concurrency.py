@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Adaptive limits on the requests in flight to each host.
+
+No fixed --jobs value suits PyPI at every time of day: too few and a long list of
+names is checked slowly, too many and PyPI answers '429 Too Many Requests' or slows
+to a crawl. Every request instead takes a slot from the limit of its host, which
+adapts the way TCP does (additive increase, multiplicative decrease):
+
+    increase    each answer that comes back healthy while every slot was in use
+                adds 1 / limit, about one more slot per round of requests.
+    decrease    a 429, a 5xx, a failed connection or an answer slower than
+                config.concurrency_latency_factor times the usual latency cuts the
+                limit by config.concurrency_decrease, at most once per round trip.
+
+The usual latency is kept for each route of a host, the first part of the path, as
+the search pages of PyPI take far longer than its JSON documents.
+
+The limit starts at config.concurrency_initial and stays between 1 and the size of
+the connection pool, the engine keeps --jobs as the ceiling of each host.
+"""
+
+# Core Library modules
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+# Local modules
+from . import logger
+from .config import config
+
+# the answers that say the host has more requests than it can take
+CONGESTION_STATUSES = (429, 500, 502, 503, 504)
+LATENCY_SMOOTHING = 0.1
+
+
+class AdaptiveLimit:
+    """The AIMD limit on the requests in flight to one host, shared by every thread.
+
+    Attributes:
+        limit:          the requests allowed in flight, the integer part is used.
+        in_flight:      the requests in flight now.
+        latencies:      the smoothed latency of the answers of each route, in
+                        seconds.
+        peak:           the highest limit reached.
+        increases:      the times the limit was raised.
+        cuts:           the times the limit was cut.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        initial: float,
+        maximum: float,
+        decrease: float = 0.5,
+        latency_factor: float = 4.0,
+    ) -> None:
+        self.host = host
+        self.maximum = max(1.0, maximum)
+        self.limit = min(max(1.0, initial), self.maximum)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.in_flight = 0
+        self.latencies: dict[str, float] = {}
+        self.peak = self.limit
+        self.increases = 0
+        self.cuts = 0
+        self._cut_at = 0.0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> bool:
+        """Waits for a free slot and takes it.
+
+        Returns:
+            bool:           True if the request fills the limit, only such requests
+                            can show that a higher limit would be used.
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+            return self.in_flight >= int(self.limit)
+
+    def release(
+        self, status: int, elapsed: float, saturated: bool, route: str = ""
+    ) -> None:
+        """Gives the slot back and adapts the limit to how the request went.
+
+        Args:
+            status:         the status of the answer, 0 if there was none.
+            elapsed:        how long the answer took, in seconds.
+            saturated:      what acquire() returned for the request.
+            route:          the first part of the path of the request.
+        """
+        now = time.monotonic()
+        with self._condition:
+            self.in_flight -= 1
+            usual = self.latencies.get(route)
+            slow = usual is not None and elapsed > self.latency_factor * usual
+            latency = self.latencies[route] = (
+                elapsed
+                if usual is None
+                else usual + LATENCY_SMOOTHING * (elapsed - usual)
+            )
+            if status == 0 or status in CONGESTION_STATUSES or slow:
+                # the answers to requests sent before the last cut are not news
+                if now - self._cut_at > latency:
+                    self.limit = max(1.0, self.limit * self.decrease)
+                    self.cuts += 1
+                    self._cut_at = now
+                    logger.debug(
+                        "cut the requests in flight to %s to %s (%s in %.2f s)",
+                        self.host,
+                        int(self.limit),
+                        status or "no answer",
+                        elapsed,
+                    )
+            elif saturated and self.limit < self.maximum:
+                before = int(self.limit)
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                self.peak = max(self.peak, self.limit)
+                self.increases += 1
+                if int(self.limit) > before:
+                    logger.debug(
+                        "raised the requests in flight to %s to %s",
+                        self.host,
+                        int(self.limit),
+                    )
+            self._condition.notify_all()
+
+
+class Slot:
+    """A slot taken for one request, the status is set once it is answered."""
+
+    def __init__(self) -> None:
+        self.status = 0
+
+
+class AdaptiveConcurrency:
+    """The adaptive limits of every host, created on first use from the config.
+
+    Turned off by config.concurrency_adaptive, then only --jobs limits the requests
+    in flight.
+    """
+
+    def __init__(self) -> None:
+        self._limits: dict[str, AdaptiveLimit] = {}
+        self._lock = threading.Lock()
+
+    def limit_for(self, host: str) -> AdaptiveLimit:
+        """Returns the limit of the host, creating it if needed."""
+        limit = self._limits.get(host)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.get(host)
+                if limit is None:
+                    limit = self._limits[host] = AdaptiveLimit(
+                        host,
+                        config.concurrency_initial,
+                        config.http_pool_size,
+                        config.concurrency_decrease,
+                        config.concurrency_latency_factor,
+                    )
+        return limit
+
+    def current(self, host: str) -> Optional[int]:
+        """Returns the requests allowed in flight to the host, None if none sent."""
+        limit = self._limits.get(host)
+        return None if limit is None else int(limit.limit)
+
+    def limits(self) -> list[AdaptiveLimit]:
+        """Returns the limit of every host a request has been sent to."""
+        return list(self._limits.values())
+
+    def reset(self) -> None:
+        """Forgets every limit, the next request to a host starts again."""
+        with self._lock:
+            self._limits.clear()
+
+    @contextmanager
+    def slot(self, host: str, route: str = "") -> Iterator[Slot]:
+        """Holds a slot of the host for the request made in the with block.
+
+        Args:
+            host:           the host name of the request, e.g. "pypi.org".
+            route:          the first part of the path of the request, e.g. "search".
+
+        Yields:
+            Slot:           set its status to that of the answer, a request that
+                            raises counts as having no answer.
+        """
+        slot = Slot()
+        if not config.concurrency_adaptive:
+            yield slot
+            return
+        limit = self.limit_for(host)
+        saturated = limit.acquire()
+        start = time.monotonic()
+        try:
+            yield slot
+        finally:
+            limit.release(slot.status, time.monotonic() - start, saturated, route)
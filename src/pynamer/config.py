@@ -6,7 +6,7 @@
 from typing import Optional
 
 # Local modules
-from . import project_count
+from . import index_meta, project_count
 
 
 class Config:
@@ -16,6 +16,34 @@ class Config:
     original_project_name: str = "project_name"
     no_cleanup: bool = False
     project_count: int = project_count
+    index_built_at: float = index_meta.get("built_at", 0.0)
+    index_ttl: int = 86400
+    index_lock_timeout: int = 120
+    index_backend: str = "bisect"
+    project_probe: str = "head"
+    http_pool_size: int = 10
+    http_retries: int = 3
+    http_retry_budget: int = 100
+    http_backoff: float = 0.5
+    http_backoff_max: float = 30.0
+    http_retry_after_max: float = 120.0
+    concurrency_adaptive: bool = True
+    concurrency_initial: int = 4
+    concurrency_decrease: float = 0.5
+    concurrency_latency_factor: float = 4.0
+    # requests and period in seconds per host, just under the limit of each
+    rate_limits: dict[str, tuple[float, float]] = {
+        "pypi.org": (10, 1.0),
+        "api.github.com": (55, 3600.0),
+    }
+    # the longest a request waits for a token before it is given up
+    rate_limit_max_wait: float = 60.0
+    http_cache_size: int = 64 * 1024 * 1024
+    http_cache_bypass: bool = False
+    http_cache_refresh: bool = False
+    cache_ttl_json: int = 3600
+    cache_ttl_search: int = 3600
+    cache_ttl_github: int = 86400
     package_version: str = "0.0.0"
     description: str = "placeholder"
     pypi_search_url: str = "https://pypi.org/search/"
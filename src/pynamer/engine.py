@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Runs the network tests of many project names concurrently.
+
+Checking a name waits on PyPI for most of its time, so a long list of names is far
+quicker checked many at a time. check_names() runs the tests of every name as
+asyncio tasks. Each blocking request runs in a worker thread over the shared
+sessions of pynamer.network, and a semaphore per host bounds how many requests are
+in flight to any one host at once. Within that ceiling the requests in flight adapt
+to how each host is coping, see pynamer.concurrency, and the progress bar shows the
+current limit of PyPI.
+
+The results are the same as running run_checks() on each name in turn, only the
+order in which the requests are sent differs. A name whose requests still fail after
+their retries is returned with an error rather than ending the run, so the rest of
+the batch is checked.
+"""
+
+# Core Library modules
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple
+from urllib.parse import urlsplit
+
+# Third party modules
+import requests
+from tqdm import tqdm
+
+# Local modules
+from . import logger, network
+from .config import config
+from .exceptions import RequestFailed
+from .validators import github_meta, ping_project, project_details, pypi_search
+
+
+class ProjectChecks(NamedTuple):
+    """The results of the network tests of a project name.
+
+    Attributes:
+        found:          True if the PyPI JSON URL of the project exists (test 1).
+        details:        the PyPI details of the project if it was found.
+        match:          the exact matches of the PyPI search (test 3).
+        others:         the other projects the PyPI search found.
+        others_total:   the total of the other projects found.
+        error:          why the tests could not be run, empty if they were.
+    """
+
+    found: bool
+    details: str
+    match: list
+    others: list
+    others_total: str
+    error: str = ""
+
+
+class _CheckFailed(Exception):
+    # asyncio stops the event loop on a SystemExit, so a RequestFailed is carried
+    # out of a task as this instead
+    pass
+
+
+def _failed(project_name: str, e: BaseException) -> ProjectChecks:
+    logger.debug("the checks of %s failed: %s", project_name, e)
+    return ProjectChecks(False, "", [], [], "0", error=str(e))
+
+
+def _project_details(project_name: str) -> tuple[bool, str, str]:
+    # the JSON document is downloaded once for both, see fetch_project_json
+    if ping_project(project_name, details=True):
+        return (True, *project_details(project_name))
+    return False, "", ""
+
+
+def _project_details_and_stats(project_name: str, stats: bool) -> tuple[bool, str]:
+    found, details, github_url = _project_details(project_name)
+    if github_url and stats:
+        details = "".join([details, github_meta(github_url)])
+    return found, details
+
+
+def run_checks(project_name: str, stats: bool = False) -> ProjectChecks:
+    """Runs the network tests of a project name side by side.
+
+    Test 1 and test 3 are independent requests, so both are sent at once from a
+    pair of threads and a name takes about as long as the slower of the two rather
+    than their sum. The GitHub stats depend on the homepage in the PyPI details so
+    they follow test 1 in the same thread.
+
+    Args:
+        project_name:   the name of the project to test.
+        stats:          display stats from github json url.
+
+    Returns:
+        ProjectChecks:  the results of the tests, with an error if a request failed
+                        after its retries.
+    """
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        details = executor.submit(_project_details_and_stats, project_name, stats)
+        search = executor.submit(pypi_search, project_name)
+        try:
+            found, details_text = details.result()
+            match, others, others_total = search.result()
+        except (RequestFailed, requests.RequestException) as e:
+            return _failed(project_name, e)
+    return ProjectChecks(found, details_text, match, others, others_total)
+
+
+def _host(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+async def _run_checks_async(
+    project_name: str, stats: bool, limits: defaultdict[str, asyncio.Semaphore]
+) -> ProjectChecks:
+    async def limited(url: str, func: Callable, *args: Any) -> Any:
+        async with limits[_host(url)]:
+            try:
+                return await asyncio.to_thread(func, *args)
+            except RequestFailed as e:
+                raise _CheckFailed(str(e)) from e
+
+    async def details_and_stats() -> tuple[bool, str]:
+        found, details, github_url = await limited(
+            config.pypi_json_url, _project_details, project_name
+        )
+        if github_url and stats:
+            # GitHub has a limit of its own, a name waiting on its stats must not
+            # hold one of the slots of PyPI
+            stats_text = await limited(config.github_api_url, github_meta, github_url)
+            details = "".join([details, stats_text])
+        return found, details
+
+    # test 1 and test 3 of a name are independent so they are sent side by side
+    try:
+        (found, details), (match, others, others_total) = await asyncio.gather(
+            details_and_stats(),
+            limited(config.pypi_search_url, pypi_search, project_name),
+        )
+    except (_CheckFailed, requests.RequestException) as e:
+        return _failed(project_name, e)
+    return ProjectChecks(found, details, match, others, others_total)
+
+
+async def _check_names(
+    project_names: list[str], stats: bool, jobs: int
+) -> dict[str, ProjectChecks]:
+    loop = asyncio.get_running_loop()
+    # every host can have jobs requests in flight, the JSON API and search of PyPI
+    # share one host
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=2 * jobs))
+    limits: defaultdict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(jobs)
+    )
+    pypi_host = urlsplit(config.pypi_json_url).hostname or ""
+    with tqdm(total=len(project_names), disable=len(project_names) < 2) as progress:
+
+        async def check(project_name: str) -> ProjectChecks:
+            checks = await _run_checks_async(project_name, stats, limits)
+            current = network.concurrency.current(pypi_host)
+            if current is not None:
+                progress.set_postfix(in_flight=min(current, jobs), refresh=False)
+            progress.update(1)
+            return checks
+
+        results = await asyncio.gather(*map(check, project_names))
+    return dict(zip(project_names, results))
+
+
+def check_names(
+    project_names: list[str], stats: bool = False, jobs: int = 8
+) -> dict[str, ProjectChecks]:
+    """Runs the network tests of many project names concurrently.
+
+    Args:
+        project_names:  the names of the projects to test.
+        stats:          display stats from github json url.
+        jobs:           the most requests in flight to any one host at once, the
+                        adaptive limit of each host starts again below it.
+
+    Returns:
+        dict:           the results of the tests of each project name, with an error
+                        for each name whose requests failed after their retries.
+    """
+    if jobs > config.http_pool_size:
+        # a pool smaller than the number of requests in flight discards connections
+        config.http_pool_size = jobs
+        network.close_sessions()
+    network.concurrency.reset()
+    logger.debug("checking %s names, up to %s at a time", len(project_names), jobs)
+    return asyncio.run(_check_names(project_names, stats, jobs))
@@ -14,28 +14,47 @@
 from . import logger
 
 
+class RequestFailed(SystemExit):
+    """A request failed for good, after any retries.
+
+    Uncaught it ends the run with its message like any SystemExit, a batch of names
+    catches it to mark only the name being checked as errored.
+    """
+
+
+class RateLimited(RequestException):
+    """A request was not sent, the rate limit of its host would hold it too long.
+
+    See pynamer.rate_limit, raised in place of waiting longer than
+    config.rate_limit_max_wait for a token.
+    """
+
+
 def request_exception(func: Callable) -> Callable:
     def wrapper(*args: Any, **kwargs: Any) -> Any:
         try:
             result = func(*args, **kwargs)
         except ConnectionError as e:  # pragma: no cover
             logger.error("A connection error occurred: %s", e)
-            raise SystemExit("A connection error occurred") from e
+            raise RequestFailed("A connection error occurred") from e
         except TooManyRedirects as e:  # pragma: no cover
             logger.error("Too many redirects occurred: %s", e)
-            raise SystemExit("Too many redirects occurred") from e
+            raise RequestFailed("Too many redirects occurred") from e
         except Timeout as e:  # pragma: no cover
             logger.error("The request timed out: %s", e)
-            raise SystemExit("The request timed out") from e
+            raise RequestFailed("The request timed out") from e
+        except RateLimited as e:
+            logger.error("The rate limit was reached: %s", e)
+            raise RequestFailed("The rate limit was reached") from e
         except HTTPError as e:  # pragma: no cover
             logger.error("An HTTP error occurred.: %s", e)
-            raise SystemExit("An HTTP error occurred.") from e
+            raise RequestFailed("An HTTP error occurred.") from e
         except RequestException as e:  # pragma: no cover
             logger.error(
                 "An ambiguous exception occurred while handling request: %s",
                 e,
             )
-            raise SystemExit(
+            raise RequestFailed(
                 "An ambiguous exception occurred while handling request."
             ) from e
         return result
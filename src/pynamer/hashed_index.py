@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""A NumPy backed index of hashed project names for vectorized bulk lookups.
+
+Every normalized name in the PyPI index is hashed to a 64-bit integer and the hashes
+are saved, sorted, as NumPy arrays in .npy files next to the index:
+
+    hashes      two rows of unsigned 64-bit integers. The first row holds the name
+                count and directory offset of the PyPI index the hashes were built
+                from followed by the sorted hashes, the second row holds two zeros
+                followed by where each name ends in the names file.
+    names       the names, in the order of their hashes, as one run of bytes.
+
+A batch of names is hashed the same way and resolved with a single searchsorted
+call. Hash matches are then confirmed against the text of the name with that hash,
+so two names that share a hash can never give a false match.
+
+NumPy is an optional dependency, installed with 'pip install pynamer[numpy]'. The
+backend is selected with config.index_backend = "numpy".
+"""
+
+# Core Library modules
+from collections.abc import Iterable, Iterator
+from hashlib import blake2b
+from importlib.resources import as_file
+from importlib.resources.abc import Traversable
+from typing import Any, Literal, Optional
+
+# Local modules
+from . import logger, pypi_index_hash_file_trv, pypi_index_hash_names_file_trv
+from .index import (
+    MAP_INDEX_FILE,
+    PyPIIndex,
+    atomic_writer,
+    normalize_block,
+    normalize_name,
+    pypi_index,
+)
+
+try:
+    # Third party modules
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+def hash_names(names: Iterable[bytes]) -> Any:
+    """Hashes normalized names to 64-bit integers.
+
+    Args:
+        names:          the normalized names to hash.
+
+    Returns:
+        numpy.ndarray:  the hash of every name, as unsigned 64-bit integers.
+    """
+    digests = b"".join(blake2b(name, digest_size=8).digest() for name in names)
+    return np.frombuffer(digests, dtype="<u8")
+
+
+def write_hashed_index(
+    hash_file: Traversable,
+    names_file: Traversable,
+    names: PyPIIndex,
+    index_key: tuple[int, int],
+) -> None:
+    """Hashes every name in the PyPI index and writes the sorted hashes and names.
+
+    Args:
+        hash_file:      the .npy file to write the hashes to.
+        names_file:     the .npy file to write the names, in hash order, to.
+        names:          the PyPI index to hash.
+        index_key:      the name count and directory offset of the PyPI index.
+    """
+    # one blob of every name rather than an object each, see index.NameStore
+    store = names.load_names()
+    hashes = hash_names(store)
+    order = np.argsort(hashes, kind="stable")
+    lengths = np.diff(np.frombuffer(store.offsets, dtype=np.uintc))
+    table = np.zeros((2, len(store) + 2), dtype="<u8")
+    table[0, :2] = index_key
+    table[0, 2:] = hashes[order]
+    table[1, 2:] = np.cumsum(lengths[order], dtype="<u8")
+    blob = np.frombuffer(
+        b"".join(store[position] for position in order.tolist()), dtype=np.uint8
+    )
+    with as_file(names_file) as file, atomic_writer(file) as f:
+        np.save(f, blob)
+    with as_file(hash_file) as file, atomic_writer(file) as f:
+        np.save(f, table)
+
+
+class HashedIndex:
+    """The hashed names of the local PyPI index, loaded on first use.
+
+    If the hash file is missing, or was built from a different PyPI index, it is
+    rebuilt from the PyPI index before the first lookup. Later lookups memory map
+    the saved file, or read it on Windows, as for the PyPI index (see
+    pynamer.index.MAP_INDEX_FILE).
+    """
+
+    def __init__(
+        self, hash_file: Traversable, names_file: Traversable, names: PyPIIndex
+    ) -> None:
+        self.hash_file = hash_file
+        self.names_file = names_file
+        self.names = names
+        self._hashes: Optional[Any] = None
+        self._ends: Optional[Any] = None
+        self._blob: Optional[Any] = None
+        self._index_key = (0, 0)
+
+    def _open(self) -> Optional[tuple[Any, Any]]:
+        if not (self.hash_file.is_file() and self.names_file.is_file()):
+            return None
+        mmap_mode: Optional[Literal["r"]] = "r" if MAP_INDEX_FILE else None
+        with as_file(self.hash_file) as hash_file, as_file(self.names_file) as names:
+            try:
+                table = np.load(hash_file, mmap_mode=mmap_mode)
+                blob = np.load(names, mmap_mode=mmap_mode)
+            except (OSError, ValueError):
+                return None
+        if (
+            table.dtype != np.dtype("<u8")
+            or table.shape[:1] != (2,)
+            or table.shape[1] < 2
+            or tuple(table[0, :2].tolist()) != self.names.key()
+            or len(blob) != (table[1, -1] if table.shape[1] > 2 else 0)
+        ):
+            logger.debug("the hashed index is not for the current PyPI index")
+            return None
+        return table, blob
+
+    def _load(self) -> Any:
+        if np is None:
+            raise SystemExit(
+                "The numpy index backend needs NumPy, install it with "
+                "'pip install pynamer[numpy]'"
+            )
+        if self._hashes is not None and self._index_key != self.names.key():
+            # the PyPI index has been reloaded since the hashes were
+            self.refresh()
+        if self._hashes is None:
+            opened = self._open()
+            if opened is None:
+                logger.debug("building the hashed index of the PyPI index")
+                write_hashed_index(
+                    self.hash_file, self.names_file, self.names, self.names.key()
+                )
+                opened = self._open()
+                assert opened is not None
+            # plain arrays over the same mappings index far quicker than memmaps
+            table, blob = (array.view(np.ndarray) for array in opened)
+            self._hashes = table[0, 2:]
+            # where each name starts and ends, the first starts at 0
+            self._ends = table[1, 1:]
+            self._blob = blob
+            self._index_key = self.names.key()
+        return self._hashes
+
+    def refresh(self) -> None:
+        """Releases the current mappings, the next lookup loads the files again."""
+        self._hashes = None
+        self._ends = None
+        self._blob = None
+
+    def _name_matches(self, position: int, probe: int, target: bytes) -> bool:
+        hashes, ends, blob = self._hashes, self._ends, self._blob
+        assert hashes is not None and ends is not None and blob is not None
+        # names that share a hash sit next to each other
+        while position < len(hashes) and hashes[position] == probe:
+            start, end = ends[position : position + 2].tolist()
+            if blob[start:end].tobytes() == target:
+                return True
+            position += 1
+        return False
+
+    def contains_many(self, project_names: Iterable[str]) -> Iterator[tuple[str, bool]]:
+        """Finds which of a batch of project names are in the index.
+
+        Args:
+            project_names:  the names to check, as given.
+
+        Yields:
+            tuple:          each name, as given, and True if it is in the index, in
+                            the order given.
+        """
+        hashes = self._load()
+        project_names = list(project_names)
+        joined = "\n".join(project_names)
+        if joined.isascii() and joined.count("\n") == len(project_names) - 1:
+            # valid names are ASCII, so the whole batch is normalized in one go
+            targets = normalize_block(joined.encode("ascii")).split(b"\n")
+        else:
+            targets = [
+                normalize_name(project_name).encode("utf-8")
+                for project_name in project_names
+            ]
+        probes = hash_names(targets)
+        positions = np.searchsorted(hashes, probes)
+        hits = (
+            hashes[np.minimum(positions, len(hashes) - 1)] == probes
+            if len(hashes)
+            else np.zeros(len(probes), dtype=bool)
+        )
+        for project_name, target, probe, position, hit in zip(
+            project_names,
+            targets,
+            probes.tolist(),
+            positions.tolist(),
+            hits.tolist(),
+        ):
+            # a shared hash is not proof, the few hits are checked against the names
+            yield project_name, hit and self._name_matches(position, probe, target)
+
+    def lookup_many(
+        self, project_names: Iterable[str]
+    ) -> Iterator[tuple[str, Optional[str]]]:
+        """Finds which of a batch of project names are taken, and by which project.
+
+        Args:
+            project_names:  the names to check, as given.
+
+        Yields:
+            tuple:          each name, as given, and the normalized name of the
+                            existing project, or None if it is not taken, in the
+                            order given.
+        """
+        for project_name, found in self.contains_many(project_names):
+            yield project_name, normalize_name(project_name) if found else None
+
+    def __contains__(self, project_name: object) -> bool:
+        if not isinstance(project_name, str):
+            return False
+        return next(self.contains_many([project_name]))[1]
+
+
+hashed_index = HashedIndex(
+    pypi_index_hash_file_trv, pypi_index_hash_names_file_trv, pypi_index
+)
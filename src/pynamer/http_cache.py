@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""A disk cache of HTTP responses shared by every run of pynamer.
+
+Re-checking the same names within a few minutes would otherwise fetch the same PyPI
+JSON documents, search pages and GitHub stats again. Responses are kept in a SQLite
+database next to the index, keyed by the full URL including its query string:
+
+    entries     key, the pickled response, its size, when it was stored and when
+                it was last used.
+
+Every lookup gives the longest age it accepts, so each class of endpoint keeps its
+own time to live (see config.cache_ttl_json and friends). Once the entries add up to
+more than the size limit, the least recently used are evicted.
+
+The cache is best effort: a database that cannot be opened or read is treated as
+empty, and the request is made as if there were no cache.
+"""
+
+# Core Library modules
+import pickle
+import sqlite3
+import threading
+import time
+from importlib.resources import as_file
+from importlib.resources.abc import Traversable
+from typing import Optional
+
+# Third party modules
+import requests
+
+# Local modules
+from . import logger
+
+# only answers that will be the same next time are kept, not errors or throttling
+CACHEABLE_STATUSES = (200, 404)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    response BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    stored_at REAL NOT NULL,
+    used_at REAL NOT NULL
+)
+"""
+
+
+class ResponseCache:
+    """HTTP responses kept on disk with a time to live and a size limit.
+
+    The connection is opened on first use and shared by every thread, behind a lock.
+    The hits and misses of this process are counted for the run summary.
+    """
+
+    def __init__(self, cache_file: Traversable, max_size: int) -> None:
+        self.cache_file = cache_file
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            with as_file(self.cache_file) as cache_file:
+                connection = sqlite3.connect(
+                    cache_file, timeout=5, check_same_thread=False
+                )
+            connection.execute(_SCHEMA)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def get(self, key: str, ttl: float) -> Optional[requests.Response]:
+        """Finds a response stored less than ttl seconds ago.
+
+        Args:
+            key:            the URL of the request, including its query string.
+            ttl:            the oldest response to accept, in seconds.
+
+        Returns:
+            requests.Response:  the stored response, or None if there is no fresh
+                                one, which counts as a miss.
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                row = connection.execute(
+                    "SELECT response FROM entries WHERE key = ? AND stored_at > ?",
+                    (key, now - ttl),
+                ).fetchone()
+                if row is not None:
+                    connection.execute(
+                        "UPDATE entries SET used_at = ? WHERE key = ?", (now, key)
+                    )
+                    connection.commit()
+            except sqlite3.Error as e:
+                logger.debug("the response cache could not be read: %s", e)
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        logger.debug("cache hit for %s", key)
+        response: requests.Response = pickle.loads(row[0])
+        return response
+
+    def count_miss(self) -> None:
+        """Counts a miss for a response fetched without looking it up first."""
+        with self._lock:
+            self.misses += 1
+
+    def put(self, key: str, response: requests.Response) -> None:
+        """Stores a response, then evicts the least recently used past the limit.
+
+        Args:
+            key:            the URL of the request, including its query string.
+            response:       the response, stored only if its status is cacheable.
+        """
+        if response.status_code not in CACHEABLE_STATUSES:
+            return
+        data = pickle.dumps(response)
+        now = time.time()
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data), now, now),
+                )
+                (total,) = connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+                if total > self.max_size:
+                    self._evict(connection, total - self.max_size)
+                connection.commit()
+            except sqlite3.Error as e:
+                logger.debug("the response cache could not be written: %s", e)
+
+    def _evict(self, connection: sqlite3.Connection, excess: int) -> None:
+        evicted = []
+        for key, size in connection.execute(
+            "SELECT key, size FROM entries ORDER BY used_at"
+        ):
+            if excess <= 0:
+                break
+            evicted.append((key,))
+            excess -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.debug("evicted %s responses from the cache", len(evicted))
+
+    def clear(self) -> None:
+        """Removes every stored response."""
+        with self._lock:
+            try:
+                connection = self._connect()
+                connection.execute("DELETE FROM entries")
+                connection.commit()
+            except sqlite3.Error as e:
+                logger.debug("the response cache could not be cleared: %s", e)
+
+    def close(self) -> None:
+        """Closes the database, the next lookup opens it again."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+            self._connection = None
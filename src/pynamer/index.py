@@ -0,0 +1,871 @@
+#!/usr/bin/env python3
+"""Collection of functions to write and search the local PyPI simple index file.
+
+The index file holds the PEP 503 normalized project names, sorted by code point, in
+a compact versioned binary format:
+
+    header      magic, format version, names per block, name count, block count
+                and the offset of the block directory.
+    blocks      zlib compressed, front coded runs of BLOCK_SIZE consecutive names.
+    directory   the offset of every block followed by the first name of every
+                block, so a name can be found by bisection and only the one block
+                that could hold it is decompressed.
+"""
+
+# Core Library modules
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from importlib.resources import as_file
+from importlib.resources.abc import Traversable
+from itertools import chain, compress, groupby, repeat
+from operator import itemgetter, ne
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+
+# Third party modules
+from packaging.utils import canonicalize_name
+
+if sys.platform == "win32":  # pragma: no cover
+    # Core Library modules
+    import msvcrt
+else:
+    # Core Library modules
+    import fcntl
+
+# Local modules
+from . import logger, pypi_index_file_trv, pypi_index_filter_file_trv
+
+SIMPLE_JSON_CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+SIMPLE_ACCEPT = ", ".join(
+    [
+        SIMPLE_JSON_CONTENT_TYPE,
+        "application/vnd.pypi.simple.v1+html;q=0.2",
+        "text/html;q=0.01",
+    ]
+)
+
+_ANCHOR_PATTERN = re.compile(rb"<a\b[^>]*>([^<]*)</a>")
+_JSON_NAME_PATTERN = re.compile(rb'"name"\s*:\s*"([^"]*)"')
+_JSON_SERIAL_PATTERN = re.compile(rb'"meta"\s*:\s*\{[^}]*"_last-serial"\s*:\s*(\d+)')
+_SEPARATORS = bytes.maketrans(b"_.", b"--")
+
+INDEX_MAGIC = b"PYNAMER\x00"
+INDEX_VERSION = 1
+BLOCK_SIZE = 128
+# front coding has already taken out the shared prefixes, so the fastest level
+# costs little more than 1% in size and halves the compression time
+BLOCK_COMPRESS_LEVEL = 1
+# Windows cannot rename a file over one that is mapped, by this or any other
+# process, so there the index is read whole and the file closed straight away
+MAP_INDEX_FILE = sys.platform != "win32"
+
+_HEADER = struct.Struct("<8sHHIIQ")
+_BLOCK_COUNT = struct.Struct("<H")
+
+FILTER_MAGIC = b"PYNAMFLT"
+FILTER_VERSION = 1
+FILTER_BITS_PER_NAME = 12
+
+_FILTER_HEADER = struct.Struct("<8sHQIQ")
+_FILTER_MIX = 0x9E3779B97F4A7C15
+_MASK_64 = (1 << 64) - 1
+# sorts after every normalized name, marks the end of a block during a merge
+_END_OF_BLOCK = b"\xff"
+
+
+def normalize_name(project_name: str) -> str:
+    """Returns the PEP 503 normalized form of a project name.
+
+    Args:
+        project_name:   the name of the project to normalize.
+
+    Returns:
+        str:            the lowercase name with runs of '-', '_' and '.' replaced
+                        by a single '-'.
+    """
+    return str(canonicalize_name(project_name))
+
+
+def normalize_block(block: bytes) -> bytes:
+    """Applies PEP 503 normalization to every name in a block of bytes at once.
+
+    Valid project names are ASCII so bytes.lower() is sufficient. The markup around
+    the names in a simple index page is not affected in any way that matters to
+    _ANCHOR_PATTERN, so a whole chunk of the page can be normalized in one go.
+
+    Args:
+        block:          bytes containing any number of project names.
+
+    Returns:
+        bytes:          the block with names lowercased and runs of '-', '_' and '.'
+                        replaced by a single '-'.
+    """
+    block = block.lower().translate(_SEPARATORS)
+    while b"--" in block:
+        block = block.replace(b"--", b"-")
+    return block
+
+
+def _iter_names(
+    chunks: Iterable[bytes], pattern: re.Pattern, terminator: bytes
+) -> Iterator[list[bytes]]:
+    tail = b""
+    for chunk in chunks:
+        buffer = b"".join([tail, chunk])
+        cut = buffer.rfind(terminator)
+        if cut == -1:
+            tail = buffer
+            continue
+        cut += len(terminator)
+        yield pattern.findall(normalize_block(buffer[:cut]))
+        tail = buffer[cut:]
+    if tail:
+        yield pattern.findall(normalize_block(tail))
+
+
+def iter_simple_index(chunks: Iterable[bytes]) -> Iterator[list[bytes]]:
+    """Extracts the normalized project names from a PEP 503 simple index page.
+
+    Works on the raw byte chunks of a streamed response. Each chunk is cut after its
+    last complete anchor, normalized, and all anchors before the cut are extracted
+    in one regex pass. The remainder is carried over to the next chunk.
+
+    Args:
+        chunks:         the body of the simple index page as byte chunks.
+
+    Yields:
+        list[bytes]:    the normalized project names found in each chunk.
+    """
+    return _iter_names(chunks, _ANCHOR_PATTERN, b"</a>")
+
+
+def iter_simple_index_json(chunks: Iterable[bytes]) -> Iterator[list[bytes]]:
+    """Extracts the normalized project names from a PEP 691 JSON simple index.
+
+    The 'projects' array is parsed in the same streaming fashion as the HTML page,
+    each chunk is cut after its last complete project object.
+
+    Args:
+        chunks:         the body of the JSON simple index as byte chunks.
+
+    Yields:
+        list[bytes]:    the normalized project names found in each chunk.
+    """
+    return _iter_names(chunks, _JSON_NAME_PATTERN, b"}")
+
+
+def parse_last_serial(block: bytes) -> Optional[str]:
+    """Finds meta._last-serial in the start of a PEP 691 JSON simple index.
+
+    Args:
+        block:          the first chunk of the JSON simple index.
+
+    Returns:
+        str:            the last serial if found, otherwise None.
+    """
+    serial = _JSON_SERIAL_PATTERN.search(block)
+    return serial.group(1).decode("ascii") if serial is not None else None
+
+
+def _encode_block(names: list[bytes]) -> bytes:
+    # every name padded to one width, so the block XOR the block shifted by one
+    # name is zero over the prefix each name shares with the one before it
+    width = min(max(1, *map(len, names)), 255)
+    padded = b"".join([name[:width].ljust(width, b"\0") for name in names])
+    differing = (
+        int.from_bytes(padded[:-width]) ^ int.from_bytes(padded[width:])
+    ).to_bytes(len(padded) - width)
+    shared_lengths = bytearray(1)
+    shared_lengths += bytes(
+        [
+            width - len(differing[start : start + width].lstrip(b"\0"))
+            for start in range(0, len(differing), width)
+        ]
+    )
+    suffixes = [name[shared:] for shared, name in zip(shared_lengths, names)]
+    block = b"".join(
+        [_BLOCK_COUNT.pack(len(names)), shared_lengths, b"\n".join(suffixes)]
+    )
+    return zlib.compress(block, BLOCK_COMPRESS_LEVEL)
+
+
+def _decode_block(data: bytes) -> list[bytes]:
+    block = zlib.decompress(data)
+    (count,) = _BLOCK_COUNT.unpack_from(block)
+    shared_lengths = block[2 : 2 + count]
+    names = []
+    previous = b""
+    for shared, suffix in zip(shared_lengths, block[2 + count :].split(b"\n")):
+        previous = previous[:shared] + suffix
+        names.append(previous)
+    return names
+
+
+def _iter_decoded_block(data: bytes) -> Iterator[bytes]:
+    block = zlib.decompress(data)
+    (count,) = _BLOCK_COUNT.unpack_from(block)
+    previous = b""
+    for shared, suffix in zip(block[2 : 2 + count], block[2 + count :].split(b"\n")):
+        previous = previous[:shared] + suffix
+        yield previous
+
+
+def _filter_probe(name: bytes) -> tuple[int, int]:
+    digest = zlib.crc32(name) << 32 | zlib.crc32(name[::-1])
+    digest = (digest * _FILTER_MIX) & _MASK_64
+    mask = (
+        1 << (digest & 63)
+        | 1 << (digest >> 6 & 63)
+        | 1 << (digest >> 12 & 63)
+        | 1 << (digest >> 18 & 63)
+        | 1 << (digest >> 24 & 63)
+        | 1 << (digest >> 30 & 63)
+    )
+    return digest >> 36, mask
+
+
+class NameFilter:
+    """A blocked Bloom filter over the normalized names in the index.
+
+    Every name sets six bits in a single 64-bit word, so a probe touches one word.
+    A name that is not in the filter is definitely not in the index, a name that is
+    in the filter may be. At FILTER_BITS_PER_NAME bits per name the false positive
+    rate is about 1%.
+
+    The filter records the name count and directory offset of the index it was built
+    for, see matches(), so a filter left over from an older index is never used.
+    """
+
+    def __init__(self, words: array, index_key: tuple[int, int]) -> None:
+        self.words = words
+        self.index_key = index_key
+
+    @classmethod
+    def build(cls, names: list[bytes], index_key: tuple[int, int]) -> "NameFilter":
+        """Builds a filter holding every name in the list."""
+        word_count = max(1, len(names) * FILTER_BITS_PER_NAME // 64)
+        words = array("Q", bytes(8 * word_count))
+        for name in names:
+            word, mask = _filter_probe(name)
+            words[word % word_count] |= mask
+        return cls(words, index_key)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional["NameFilter"]:
+        """Loads a filter written by to_bytes, None if it is not a current filter."""
+        if len(data) < _FILTER_HEADER.size:
+            return None
+        magic, version, word_count, name_count, directory_offset = (
+            _FILTER_HEADER.unpack_from(data)
+        )
+        if magic != FILTER_MAGIC or version != FILTER_VERSION:
+            return None
+        words = array("Q")
+        words.frombytes(
+            data[_FILTER_HEADER.size : _FILTER_HEADER.size + 8 * word_count]
+        )
+        return cls(words, (name_count, directory_offset))
+
+    def to_bytes(self) -> bytes:
+        """Serializes the filter with a versioned header."""
+        header = _FILTER_HEADER.pack(
+            FILTER_MAGIC, FILTER_VERSION, len(self.words), *self.index_key
+        )
+        return b"".join([header, self.words.tobytes()])
+
+    def matches(self, name_count: int, directory_offset: int) -> bool:
+        """Returns True if the filter was built for the index with this header."""
+        return self.index_key == (name_count, directory_offset)
+
+    def __contains__(self, name: bytes) -> bool:
+        word, mask = _filter_probe(name)
+        return self.words[word % len(self.words)] & mask == mask
+
+
+class NameStore:
+    """A sorted run of normalized names held in one bytes object.
+
+    The names are concatenated into a single blob with an array of where each one
+    starts, plus a final entry for where the last one ends. A million names then
+    cost their bytes plus 4 bytes each, rather than a Python object each, and a
+    name only becomes an object when it is looked at.
+
+    The names must be given sorted for the bisection methods to be meaningful.
+    """
+
+    __slots__ = ("blob", "offsets")
+
+    def __init__(self, blob: bytes, offsets: array) -> None:
+        self.blob = blob
+        self.offsets = offsets
+
+    @classmethod
+    def from_names(cls, names: Iterable[bytes]) -> "NameStore":
+        """Builds a store from the names, which are read one at a time."""
+        blob = bytearray()
+        offsets = array("I", [0])
+        for name in names:
+            blob += name
+            offsets.append(len(blob))
+        return cls(bytes(blob), offsets)
+
+    def bisect_left(self, target: bytes, low: int = 0) -> int:
+        """Returns where the target would be inserted, before any equal name."""
+        offsets, blob = self.offsets, self.blob
+        high = len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if blob[offsets[middle] : offsets[middle + 1]] < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def bisect_right(self, target: bytes, low: int = 0) -> int:
+        """Returns where the target would be inserted, after any equal name."""
+        offsets, blob = self.offsets, self.blob
+        high = len(offsets) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if target < blob[offsets[middle] : offsets[middle + 1]]:
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    def startswith(self, prefix: bytes) -> Iterator[bytes]:
+        """Yields the names that start with the prefix, in order."""
+        offsets, blob = self.offsets, self.blob
+        for position in range(self.bisect_left(prefix), len(self)):
+            if not blob.startswith(prefix, offsets[position], offsets[position + 1]):
+                return
+            yield blob[offsets[position] : offsets[position + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position: int) -> bytes:
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("name position out of range")
+        return self.blob[self.offsets[position] : self.offsets[position + 1]]
+
+    def __iter__(self) -> Iterator[bytes]:
+        offsets, blob = self.offsets, self.blob
+        for position in range(len(self)):
+            yield blob[offsets[position] : offsets[position + 1]]
+
+    def __contains__(self, name: object) -> bool:
+        if not isinstance(name, bytes):
+            return False
+        position = self.bisect_left(name)
+        return position < len(self) and self[position] == name
+
+
+@contextmanager
+def atomic_writer(target: Path) -> Iterator[BinaryIO]:
+    """Opens a temporary file that is renamed over the target once it is written.
+
+    Args:
+        target:         the file to replace.
+
+    Yields:
+        BinaryIO:       the temporary file, unique to the writer and in the same
+                        directory as the target. It is removed if writing fails.
+    """
+    file_descriptor, temp_name = tempfile.mkstemp(
+        dir=target.parent, prefix=f"{target.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(file_descriptor, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_name, 0o644)
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_index(
+    index_file: Path, project_names: list[bytes], filter_file: Optional[Path] = None
+) -> int:
+    """Sorts and de-duplicates the normalized project names then writes the index.
+
+    PyPI serves its simple index (almost) in normalized order, so sorting the names
+    in place is close to linear. The index and filter are written to temporary files,
+    unique to the writer, and renamed into place so a reader only ever sees a
+    complete file.
+
+    Args:
+        index_file:     the file to write the index to.
+        project_names:  the normalized project names, sorted in place.
+        filter_file:    if given, a NameFilter for the index is written to it.
+
+    Returns:
+        int:            the number of unique names written.
+    """
+    project_names.sort()
+    names = list(
+        compress(project_names, map(ne, project_names, chain([b""], project_names)))
+    )
+    block_count = -(-len(names) // BLOCK_SIZE)
+    offsets = array("Q")
+    first_names = []
+    with atomic_writer(index_file) as f:
+        f.seek(_HEADER.size)
+        for start in range(0, len(names), BLOCK_SIZE):
+            offsets.append(f.tell())
+            first_names.append(names[start])
+            f.write(_encode_block(names[start : start + BLOCK_SIZE]))
+        directory_offset = f.tell()
+        offsets.append(directory_offset)
+        f.write(offsets.tobytes())
+        f.write(b"\n".join(first_names))
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                INDEX_MAGIC,
+                INDEX_VERSION,
+                BLOCK_SIZE,
+                len(names),
+                block_count,
+                directory_offset,
+            )
+        )
+    if filter_file is not None:
+        name_filter = NameFilter.build(names, (len(names), directory_offset))
+        with atomic_writer(filter_file) as f:
+            f.write(name_filter.to_bytes())
+    return len(names)
+
+
+def diff_names(
+    previous: Iterable[bytes], current: Iterable[bytes]
+) -> Iterator[tuple[bytes, bytes]]:
+    """Compares two sorted runs of names in a single linear merge.
+
+    Neither run is held in memory, each is read once and in order, so the previous
+    index can be compared with the new one before it is replaced. Repeated
+    names in either run are treated as one.
+
+    Args:
+        previous:       the names before, sorted.
+        current:        the names after, sorted.
+
+    Yields:
+        tuple:          b"+" and each name only in current, or b"-" and each name
+                        only in previous, in order.
+    """
+    previous_names = map(itemgetter(0), groupby(previous))
+    current_names = map(itemgetter(0), groupby(current))
+    old = next(previous_names, None)
+    new = next(current_names, None)
+    while old is not None and new is not None:
+        if old == new:
+            old = next(previous_names, None)
+            new = next(current_names, None)
+        elif old < new:
+            yield b"-", old
+            old = next(previous_names, None)
+        else:
+            yield b"+", new
+            new = next(current_names, None)
+    if old is not None:
+        yield b"-", old
+        yield from zip(repeat(b"-"), previous_names)
+    if new is not None:
+        yield b"+", new
+        yield from zip(repeat(b"+"), current_names)
+
+
+def write_delta(
+    delta_file: Path, previous: Iterable[bytes], current: Iterable[bytes]
+) -> tuple[int, int]:
+    """Writes the names added and removed between two sorted runs of names.
+
+    Each line of the delta file is '+' or '-' followed by a normalized name, in
+    name order, see diff_names().
+
+    Args:
+        delta_file:     the file to write the delta to.
+        previous:       the names in the previous index, sorted.
+        current:        the names in the new index, sorted.
+
+    Returns:
+        tuple:          the number of names added and the number removed.
+    """
+    counts = {b"+": 0, b"-": 0}
+    with atomic_writer(delta_file) as f:
+        for change, name in diff_names(previous, current):
+            counts[change] += 1
+            f.write(b"".join([change, name, b"\n"]))
+    return counts[b"+"], counts[b"-"]
+
+
+class IndexLock:
+    """An exclusive lock that lets only one pynamer process generate the index.
+
+    Uses an OS file lock on a lock file next to the index, so the lock is released
+    by the OS if the process holding it dies.
+    """
+
+    def __init__(self, lock_file: Path) -> None:
+        self.lock_file = lock_file
+        self._file: Optional[BinaryIO] = None
+
+    def _try_lock(self) -> bool:
+        assert self._file is not None
+        try:
+            if sys.platform == "win32":  # pragma: no cover
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+
+    def acquire(self, timeout: float = 0.0) -> bool:
+        """Acquires the lock, waiting up to timeout seconds for another holder.
+
+        Args:
+            timeout:        seconds to wait, 0 to give up straight away.
+
+        Returns:
+            True:           the lock is now held by this process.
+            False:          another process still holds the lock.
+        """
+        self._file = self.lock_file.open("ab")
+        deadline = time.monotonic() + timeout
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                self._file.close()
+                self._file = None
+                return False
+            time.sleep(0.1)
+        return True
+
+    def release(self) -> None:
+        """Releases the lock if it is held."""
+        if self._file is None:
+            return
+        if sys.platform == "win32":  # pragma: no cover
+            msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+        self._file.close()
+        self._file = None
+
+
+def is_index_file(index_file: Traversable) -> bool:
+    """Checks that a file exists and is an index in the current format.
+
+    Args:
+        index_file:     the file to check.
+
+    Returns:
+        True:           the file starts with the index magic and current version.
+        False:          the file is missing, or is an index in an older format.
+    """
+    if not index_file.is_file():
+        return False
+    with index_file.open("rb") as f:
+        header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return False
+    magic, version, *_ = _HEADER.unpack(header)
+    return magic == INDEX_MAGIC and version == INDEX_VERSION
+
+
+class PyPIIndex:
+    """The local PyPI index, loaded on first use and shared for the whole process.
+
+    The index file is opened and memory mapped once, on the first lookup, when only
+    the header and block directory are read. Each lookup then decompresses the one
+    block that could hold the name. Call refresh() after the file has been rebuilt
+    so that the next lookup maps the new file.
+
+    If a filter file built for the same index is present it is read, in one read,
+    alongside the directory and a name the filter rules out is answered without
+    touching the index at all.
+
+    A rebuilt index is renamed over the old file, so the current mapping stays
+    valid until reload_if_changed() or refresh() swaps in the new one. On Windows,
+    where a mapped file cannot be renamed over, the index is read into memory
+    instead of mapped (see MAP_INDEX_FILE) and holds no handle on the file.
+    """
+
+    def __init__(
+        self, index_file: Traversable, filter_file: Optional[Traversable] = None
+    ) -> None:
+        self.index_file = index_file
+        self.filter_file = filter_file
+        self._buffer: Optional[Union[mmap.mmap, bytes]] = None
+        self._filter: Optional[NameFilter] = None
+        self._file_id: Optional[tuple[int, int]] = None
+        self._name_count = 0
+        self._directory_offset = 0
+        self._offsets = array("Q")
+        self._first_names: list[bytes] = []
+
+    def exists(self) -> bool:
+        """Returns True if the index file has been generated in the current format."""
+        return self._buffer is not None or is_index_file(self.index_file)
+
+    def _load(self) -> Union[mmap.mmap, bytes]:
+        if self._buffer is None:
+            with as_file(self.index_file) as index_file, index_file.open("rb") as f:
+                buffer: Union[mmap.mmap, bytes] = (
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if MAP_INDEX_FILE
+                    else f.read()
+                )
+                file_stat = os.fstat(f.fileno())
+            magic, version, _, name_count, block_count, directory_offset = (
+                _HEADER.unpack_from(buffer)
+            )
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                if isinstance(buffer, mmap.mmap):
+                    buffer.close()
+                raise SystemExit("The PyPI index is not in a supported format")
+            names_offset = directory_offset + 8 * (block_count + 1)
+            self._offsets = array("Q")
+            self._offsets.frombytes(buffer[directory_offset:names_offset])
+            self._first_names = (
+                buffer[names_offset:].split(b"\n") if block_count else []
+            )
+            self._name_count = name_count
+            self._directory_offset = directory_offset
+            self._filter = self._load_filter(name_count, directory_offset)
+            self._file_id = (file_stat.st_ino, file_stat.st_mtime_ns)
+            self._buffer = buffer
+            logger.debug("loaded the PyPI index from %s", self.index_file)
+        return self._buffer
+
+    def _load_filter(
+        self, name_count: int, directory_offset: int
+    ) -> Optional[NameFilter]:
+        if self.filter_file is None or not self.filter_file.is_file():
+            return None
+        name_filter = NameFilter.from_bytes(self.filter_file.read_bytes())
+        if name_filter is None or not name_filter.matches(name_count, directory_offset):
+            logger.debug("ignoring the PyPI index filter, it is not for this index")
+            return None
+        return name_filter
+
+    def _block(self, block_number: int) -> list[bytes]:
+        buffer = self._load()
+        start, end = self._offsets[block_number], self._offsets[block_number + 1]
+        return _decode_block(buffer[start:end])
+
+    def _iter_block(self, block_number: int) -> Iterator[bytes]:
+        buffer = self._load()
+        start, end = self._offsets[block_number], self._offsets[block_number + 1]
+        return _iter_decoded_block(buffer[start:end])
+
+    def refresh(self) -> None:
+        """Releases the current mapping, the next lookup loads the file again."""
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+        self._buffer = None
+        self._filter = None
+
+    def reload_if_changed(self) -> None:
+        """Releases the current mapping if the index file has been replaced."""
+        if self._buffer is None:
+            return
+        with as_file(self.index_file) as index_file:
+            try:
+                file_stat = index_file.stat()
+            except FileNotFoundError:
+                return
+        if (file_stat.st_ino, file_stat.st_mtime_ns) != self._file_id:
+            logger.debug("the PyPI index has been replaced, reloading")
+            self.refresh()
+
+    def key(self) -> tuple[int, int]:
+        """Returns the name count and directory offset that identify this index."""
+        self._load()
+        return self._name_count, self._directory_offset
+
+    def load_names(self) -> NameStore:
+        """Decompresses every name in the index into a NameStore.
+
+        For callers that go over the whole index many times, the names are held in
+        one bytes object rather than one Python object each, and are read a block
+        at a time so no more than one block is ever decoded at once.
+
+        Returns:
+            NameStore:      the normalized names, in order.
+        """
+        return NameStore.from_names(self.iter_encoded())
+
+    def iter_encoded(self) -> Iterator[bytes]:
+        """Yields every normalized name in the index, in order, as bytes."""
+        self._load()
+        for block_number in range(len(self._first_names)):
+            yield from self._iter_block(block_number)
+
+    def names_at(self, positions: Iterable[int]) -> dict[int, bytes]:
+        """Finds the names at positions in the sorted index.
+
+        Args:
+            positions:      positions of names in the index, 0 for the first name.
+
+        Returns:
+            dict:           the normalized name at each position, decompressing each
+                            block once however many of its names are wanted.
+        """
+        self._load()
+        names = {}
+        for block_number, block_positions in groupby(
+            sorted(positions), key=lambda position: position // BLOCK_SIZE
+        ):
+            block = self._block(block_number)
+            for position in block_positions:
+                names[position] = block[position % BLOCK_SIZE]
+        return names
+
+    def startswith(self, prefix: str) -> Iterator[str]:
+        """Finds every project name in the index that starts with the prefix.
+
+        The prefix is PEP 503 normalized like the names in the index. The first block
+        that could hold a match is found by bisection and blocks are then only
+        decompressed, in order, until a name no longer matches, so a query takes
+        O(log n + k) time for k matches.
+
+        Args:
+            prefix:         the start of the project names to find, e.g. 'django-'.
+
+        Yields:
+            str:            the normalized names starting with the prefix, in order.
+        """
+        target = normalize_name(prefix).encode("utf-8")
+        self._load()
+        block_number = max(bisect_right(self._first_names, target) - 1, 0)
+        for number in range(block_number, len(self._first_names)):
+            block = self._block(number)
+            for name in block[bisect_left(block, target) :]:
+                if not name.startswith(target):
+                    return
+                yield name.decode("utf-8")
+
+    def _merge(self, project_names: Iterable[str]) -> Iterator[tuple[str, bytes, bool]]:
+        self._load()
+        targets = sorted(
+            (normalize_name(project_name).encode("utf-8"), project_name)
+            for project_name in project_names
+        )
+        block_number = -1
+        block: Iterator[bytes] = iter(())
+        name = b""
+        for target, project_name in targets:
+            found = False
+            if self._filter is None or target in self._filter:
+                # the targets are sorted so the merge only ever moves forwards, and a
+                # block is only decoded as far as the last target that falls in it
+                number = bisect_right(self._first_names, target, max(block_number, 0))
+                if number > 0:
+                    if number - 1 != block_number:
+                        block_number = number - 1
+                        block = self._iter_block(block_number)
+                        name = next(block)
+                    while name < target:
+                        name = next(block, _END_OF_BLOCK)
+                    found = name == target
+            yield project_name, target, found
+
+    def contains_many(self, project_names: Iterable[str]) -> Iterator[tuple[str, bool]]:
+        """Finds which of a batch of project names are in the index.
+
+        The names are normalized and sorted once and then merged against the index in
+        a single sequential pass, each block that could hold one of them is
+        decompressed once however many of the names fall in it. The index itself is
+        never read into memory, and the results are yielded as the merge reaches
+        them.
+
+        Args:
+            project_names:  the names to check, as given.
+
+        Yields:
+            tuple:          each name, as given, and True if it is in the index, in
+                            normalized order.
+        """
+        for project_name, _, found in self._merge(project_names):
+            yield project_name, found
+
+    def lookup_many(
+        self, project_names: Iterable[str]
+    ) -> Iterator[tuple[str, Optional[str]]]:
+        """Finds which of a batch of project names are taken, and by which project.
+
+        PyPI compares names in their PEP 503 normalized form, so a name is in the
+        index exactly when it collides with the existing project of its normalized
+        name. The one merge of contains_many() answers both.
+
+        Args:
+            project_names:  the names to check, as given.
+
+        Yields:
+            tuple:          each name, as given, and the normalized name of the
+                            existing project, or None if it is not taken, in
+                            normalized order.
+        """
+        for project_name, target, found in self._merge(project_names):
+            yield project_name, target.decode("utf-8") if found else None
+
+    def collisions(self, project_names: Iterable[str]) -> Iterator[tuple[str, str]]:
+        """Finds the project names that PyPI would treat as an existing project.
+
+        PyPI compares names in their PEP 503 normalized form, so 'Foo_Bar' is taken
+        if 'foo-bar' is. The names are merged against the index in a single pass as
+        in contains_many().
+
+        Args:
+            project_names:  the names to check, as given.
+
+        Yields:
+            tuple:          each name, as given, that is taken and the normalized
+                            name of the existing project it collides with, in
+                            normalized order.
+        """
+        for project_name, existing_name in self.lookup_many(project_names):
+            if existing_name is not None:
+                yield project_name, existing_name
+
+    def __len__(self) -> int:
+        self._load()
+        return self._name_count
+
+    def __iter__(self) -> Iterator[str]:
+        self._load()
+        for block_number in range(len(self._first_names)):
+            for name in self._block(block_number):
+                yield name.decode("utf-8")
+
+    def __contains__(self, project_name: object) -> bool:
+        if not isinstance(project_name, str):
+            return False
+        target = normalize_name(project_name).encode("utf-8")
+        self._load()
+        if self._filter is not None and target not in self._filter:
+            return False
+        block_number = bisect_right(self._first_names, target) - 1
+        if block_number < 0:
+            return False
+        return target in self._block(block_number)
+
+
+pypi_index = PyPIIndex(pypi_index_file_trv, pypi_index_filter_file_trv)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""Shared HTTP sessions, one per host, for every request pynamer makes.
+
+A requests.get() call opens a new connection, and for HTTPS a new TLS handshake,
+every time. Checking a list of names against PyPI made several requests per name,
+so most of the time went on connecting. Requests made through get() reuse the
+keep-alive connections of the session for the host instead.
+
+Each session has a connection pool of config.http_pool_size connections, enough for
+that many requests in flight at once.
+
+A request that fails to connect, times out or is answered '429 Too Many Requests' or
+a 5xx status is retried up to config.http_retries times. Retries wait an
+exponentially growing, randomly jittered time, or as long as the Retry-After header
+of a 429 or 503 response asks. Every retry is taken from a budget shared by the
+whole run, so a server that is down does not hold up a long batch of names with
+retries that cannot succeed.
+
+Before it is sent, every request, retries included, waits for a token from the rate
+limiter of its host, see pynamer.rate_limit, and for a slot under the adaptive limit
+on the requests in flight to the host, see pynamer.concurrency. A request whose
+token is not due within config.rate_limit_max_wait raises RateLimited unsent. The
+X-RateLimit-Remaining and X-RateLimit-Reset headers of a response update the rate
+limiter of its host with the requests the host says are left.
+
+A request given a time to live is answered from the disk cache of responses if it
+has a fresh one, see pynamer.http_cache.
+"""
+
+# Core Library modules
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+# Third party modules
+import requests
+from requests.adapters import HTTPAdapter
+
+# Local modules
+from . import __version__, http_cache_file_trv, logger
+from .concurrency import AdaptiveConcurrency
+from .config import config
+from .http_cache import ResponseCache
+from .rate_limit import RateLimiter
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# the statuses whose Retry-After header says when to try again
+RETRY_AFTER_STATUSES = (429, 503)
+
+
+class RetryBudget:
+    """The retries left for the rest of the run, shared by every thread."""
+
+    def __init__(self, retries: int) -> None:
+        self.remaining = retries
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Takes one retry from the budget, False if there are none left."""
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+response_cache = ResponseCache(http_cache_file_trv, config.http_cache_size)
+retry_budget = RetryBudget(config.http_retry_budget)
+rate_limiter = RateLimiter(config.rate_limits)
+concurrency = AdaptiveConcurrency()
+
+
+def _new_session() -> requests.Session:
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=config.http_pool_size)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["User-Agent"] = f"pynamer/{__version__}"
+    return session
+
+
+def session_for(url: str) -> requests.Session:
+    """Returns the shared session for the host of the URL, creating it if needed.
+
+    Args:
+        url:            the URL about to be requested.
+
+    Returns:
+        requests.Session:   the session for the scheme and host of the URL.
+    """
+    parts = urlsplit(url)
+    host = f"{parts.scheme}://{parts.netloc}"
+    session = _sessions.get(host)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(host)
+            if session is None:
+                logger.debug("opening a session for %s", host)
+                session = _sessions[host] = _new_session()
+    return session
+
+
+def backoff(attempt: int) -> float:
+    """Returns how long to wait before a retry, with full jitter.
+
+    Args:
+        attempt:        the number of retries made so far, 0 for the first retry.
+
+    Returns:
+        float:          a random time of up to config.http_backoff doubled for every
+                        earlier retry, capped at config.http_backoff_max seconds.
+    """
+    ceiling = min(config.http_backoff_max, config.http_backoff * 2**attempt)
+    return random.uniform(0, ceiling)
+
+
+def retry_after(response: requests.Response) -> Optional[float]:
+    """Returns the wait in seconds a response asks for in its Retry-After header.
+
+    Args:
+        response:       a '429 Too Many Requests' or '503 Service Unavailable'.
+
+    Returns:
+        float:          the seconds to wait, or None if the header is missing or
+                        cannot be read.
+    """
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        # or an HTTP date to wait until
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def reported_rate_limit(response: requests.Response) -> Optional[tuple[int, float]]:
+    """Returns the rate limit a response reports in its X-RateLimit headers.
+
+    Args:
+        response:       any response, GitHub sends the headers with every one.
+
+    Returns:
+        tuple:          the requests left, and the seconds until the host resets
+                        its count, or None if the headers are missing or cannot be
+                        read.
+    """
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return None
+    try:
+        # the reset is the time in seconds since the epoch
+        return int(remaining), max(0.0, float(reset) - time.time())
+    except ValueError:
+        return None
+
+
+def is_rate_limited(response: requests.Response) -> bool:
+    """Tells whether a response refused the request for the rate limit of its host.
+
+    Args:
+        response:       any response.
+
+    Returns:
+        bool:           True for a 403 or 429 with no requests left in its
+                        X-RateLimit-Remaining header.
+    """
+    return (
+        response.status_code in (403, 429)
+        and response.headers.get("X-RateLimit-Remaining") == "0"
+    )
+
+
+def _send(method: str, url: str, **kwargs: Any) -> requests.Response:
+    parts = urlsplit(url)
+    host = parts.hostname or ""
+    route = parts.path.split("/")[1] if parts.path.count("/") else ""
+    attempt = 0
+    while True:
+        rate_limiter.acquire(host, config.rate_limit_max_wait)
+        try:
+            with concurrency.slot(host, route) as slot:
+                response = getattr(session_for(url), method)(url, **kwargs)
+                slot.status = response.status_code
+            limit = reported_rate_limit(response)
+            if limit is not None:
+                rate_limiter.update(host, *limit)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= config.http_retries or not retry_budget.take():
+                raise
+            delay = backoff(attempt)
+            logger.debug("%s failed (%s), retrying in %.1f s", url, e, delay)
+        else:
+            if (
+                response.status_code not in RETRY_STATUSES
+                or attempt >= config.http_retries
+            ):
+                return response
+            delay = backoff(attempt)
+            if response.status_code in RETRY_AFTER_STATUSES:
+                delay = retry_after(response) or delay
+            if delay > config.http_retry_after_max or not retry_budget.take():
+                return response
+            logger.debug(
+                "%s answered %s, retrying in %.1f s", url, response.status_code, delay
+            )
+            response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url: str, ttl: float = 0, **kwargs: Any) -> requests.Response:
+    """Sends a GET request over the shared session for the host of the URL.
+
+    Args:
+        url:            the URL to request.
+        ttl:            if given, a cached response up to ttl seconds old is used
+                        instead, and the response is cached. Turned off by
+                        config.http_cache_bypass, config.http_cache_refresh only
+                        skips the lookup.
+        **kwargs:       passed on to requests.Session.get, e.g. timeout or params.
+
+    Returns:
+        requests.Response:  the response, which may be an error status once the
+                            retries have run out.
+
+    Raises:
+        requests.RequestException:  if the request could not be made, after any
+                                    retries.
+    """
+    return _cached("get", url, ttl, **kwargs)
+
+
+def head(url: str, ttl: float = 0, **kwargs: Any) -> requests.Response:
+    """Sends a HEAD request over the shared session for the host of the URL.
+
+    Only the status and headers are sent back, which is all it takes to tell
+    whether a URL exists. Cached apart from the GET responses of the same URL.
+
+    Args:
+        url:            the URL to request.
+        ttl:            as for get().
+        **kwargs:       passed on to requests.Session.head, e.g. timeout or
+                        allow_redirects, which is off by default for HEAD.
+
+    Returns:
+        requests.Response:  the response, without a body.
+
+    Raises:
+        requests.RequestException:  if the request could not be made, after any
+                                    retries.
+    """
+    return _cached("head", url, ttl, **kwargs)
+
+
+def _cached(method: str, url: str, ttl: float, **kwargs: Any) -> requests.Response:
+    if ttl <= 0 or config.http_cache_bypass:
+        return _send(method, url, **kwargs)
+    key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+    assert key is not None
+    if method != "get":
+        key = f"{method.upper()} {key}"
+    if config.http_cache_refresh:
+        response_cache.count_miss()
+    else:
+        response = response_cache.get(key, ttl)
+        if response is not None:
+            return response
+    response = _send(method, url, **kwargs)
+    response_cache.put(key, response)
+    return response
+
+
+def close_sessions() -> None:
+    """Closes every shared session and the connections in their pools."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -9,7 +9,7 @@
 from rich.table import Table
 
 # Local modules
-from . import logger, project_count, project_path
+from . import logger, network, project_count, project_path
 from .builder import (
     build_dist,
     cleanup,
@@ -19,6 +19,7 @@
 )
 from .cli import _parse_args
 from .config import config
+from .engine import check_names, run_checks
 from .utils import (
     check_version,
     feedback,
@@ -30,10 +31,9 @@
 from .validators import (
     final_analysis,
     is_valid_package_name,
-    ping_json,
-    ping_project,
-    pypi_search,
-    pypi_search_index,
+    pypi_index_lookup,
+    pypi_search_prefix,
+    pypi_search_similar,
 )
 
 
@@ -47,6 +47,10 @@ def main() -> None:  # pragma: no cover, type: ignore
     if args.version:
         check_version()
 
+    if args.prefix != "None":
+        for project_name in pypi_search_prefix(args.prefix):
+            print(project_name)
+
     if args.projects == "None" and args.f == "None" and args.register:
         feedback("You need to specify a project name to register it", "error")
         raise SystemExit()
@@ -62,6 +66,7 @@ def main() -> None:  # pragma: no cover, type: ignore
         and args.f == "None"
         and args.version is False
         and args.generate is False
+        and args.prefix == "None"
     ):
         parser.print_help()
         raise SystemExit()
@@ -72,6 +77,11 @@ def main() -> None:  # pragma: no cover, type: ignore
     find_pypirc_file()
     if args.nocleanup is True:
         config.no_cleanup = True
+    if args.no_cache is True:
+        config.http_cache_bypass = True
+    # a name about to be registered must be checked against PyPI as it is now
+    if args.refresh_cache is True or args.register is True:
+        config.http_cache_refresh = True
 
     # Gather the projects into one list
     if args.projects != "None":
@@ -84,6 +94,34 @@ def main() -> None:  # pragma: no cover, type: ignore
         logger.debug("project_list = %s", project_list)
     project_list.sort()
 
+    # Test 2 and the existing project of every name, in one pass over the index.
+    # --version, --prefix and -g alone have no names, and leave the index alone
+    index_matches = pypi_index_lookup(project_list) if project_list else {}
+    index_results = {
+        project_name: existing_name is not None
+        for project_name, existing_name in index_matches.items()
+    }
+
+    # PyPI treats names that only differ in case or separators as the same project
+    for project_name, existing_name in index_matches.items():
+        if existing_name is not None and project_name != existing_name:
+            feedback(
+                f"{project_name} is the same name as the existing project "
+                f"{existing_name} once normalized (PEP 503)",
+                "warning",
+            )
+
+    # Tests 1 and 3 for many projects at once, the tables are still shown in order
+    prefetched = (
+        check_names(
+            [name for name in project_list if is_valid_package_name(name)],
+            stats=args.stats,
+            jobs=args.jobs,
+        )
+        if args.jobs > 1
+        else {}
+    )
+
     # Main loop
     for new_project in project_list:
         logger.debug("searching for project name: = %s", new_project)
@@ -113,16 +151,26 @@ def main() -> None:  # pragma: no cover, type: ignore
         others_table.add_column("Released", style="bold yellow")
         others_table.add_column("Description", style="bold cyan")
 
+        similar_table = Table(title="Similar Names in the PyPI Simple Index")
+        similar_table.add_column("Package", style="bold yellow")
+        similar_table.add_column("Edit Distance", style="bold green")
+
         # perform the tests
+        if new_project in prefetched:
+            checks = prefetched[new_project]
+        else:
+            checks = run_checks(new_project, stats=args.stats)
+        if checks.error:
+            # the other names are still checked, this one is reported as unknown
+            feedback(f"{new_project} could not be checked: {checks.error}", "error")
+            aggregated_result[new_project] = [-1, int(index_results[new_project]), -1]
+            continue
+
         # Test 1
-        if ping_project(new_project):
+        if checks.found:
             test_results.append(1)
-            if args.stats is True:
-                json_data = ping_json(new_project, stats=True)
-            else:
-                json_data = ping_json(new_project)
             test_table.add_row(
-                "1", "Check PyPI JSON URL", "[red]FOUND[/red]", json_data
+                "1", "Check PyPI JSON URL", "[red]FOUND[/red]", checks.details
             )
         else:
             test_results.append(0)
@@ -131,7 +179,7 @@ def main() -> None:  # pragma: no cover, type: ignore
             )
 
         # Test 2
-        if pypi_search_index(new_project):
+        if index_results[new_project]:
             test_results.append(1)
             test_table.add_row(
                 "2",
@@ -149,7 +197,7 @@ def main() -> None:  # pragma: no cover, type: ignore
             )
 
         # Test 3
-        match, others, others_total = pypi_search(new_project)
+        match, others, others_total = checks.match, checks.others, checks.others_total
         if match:
             test_results.append(1)
             test_table.add_row(
@@ -169,10 +217,13 @@ def main() -> None:  # pragma: no cover, type: ignore
                 f"Exact match found: 0, Others found: {others_total}",
             )
 
-        # Create Verbose Table
+        # Create Verbose Tables
         if others:
             for items in others:
                 others_table.add_row(items[0], items[1], items[2], items[3])
+        similar = pypi_search_similar(new_project) if args.verbose else []
+        for name, distance in similar:
+            similar_table.add_row(name, str(distance))
 
         # Display the Tables
         console = Console()
@@ -181,6 +232,8 @@ def main() -> None:  # pragma: no cover, type: ignore
             console.print(match_table)
         if args.verbose and others:
             console.print(others_table)
+        if similar:
+            console.print(similar_table)
         final_analysis(test_results)
 
         # build and upload
@@ -215,6 +268,22 @@ def main() -> None:  # pragma: no cover, type: ignore
     if args.o != "None":
         write_output_file(args.o, aggregated_result)
 
+    if project_list and not config.http_cache_bypass:
+        feedback(
+            f"Response cache: {network.response_cache.hits} hits, "
+            f"{network.response_cache.misses} misses",
+            "null",
+        )
+
+    if args.jobs > 1 and config.concurrency_adaptive:
+        for limit in network.concurrency.limits():
+            current, peak = (min(int(n), args.jobs) for n in (limit.limit, limit.peak))
+            feedback(
+                f"Requests in flight to {limit.host}: {current} at the end, "
+                f"peak {peak}, cut {limit.cuts} times",
+                "null",
+            )
+
     if args.register and len(project_list) > 1:
         feedback(
             f"You can only use 'register' for one project at a time. "
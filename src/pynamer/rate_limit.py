@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Token buckets that keep the requests to each host under its rate limit.
+
+A bulk run used to send its requests as fast as the workers could go, until PyPI
+throttled the search pages or GitHub refused the rest of its 60 unauthenticated
+requests an hour, and the retries after throttling cost far more than going a
+little slower. Every request now takes a token from the bucket of its host first:
+
+    capacity    the requests that can be sent at once after a quiet spell.
+    rate        the tokens added back every second, capacity / period.
+
+A worker that finds the bucket empty reserves the next token and sleeps until it is
+due, so concurrent workers queue up in turn and the host sees a steady rate just
+under its limit. The limits are set per host in config.rate_limits, a host with no
+limit is never held back.
+
+A token due later than config.rate_limit_max_wait is not reserved and the request
+is given up with a RateLimited error instead, as once the 55 GitHub requests of an
+hour are used the next is not due for over a minute and the rest of the hour would
+otherwise be spent asleep.
+
+A full bucket at the start of every run does not know about the requests earlier
+runs, or other programs, have made this hour. So the responses of a host that sends
+X-RateLimit-Remaining and X-RateLimit-Reset headers, as GitHub does, update its
+bucket: it holds no more tokens than the host says are left, and gets none back
+until the host resets its count, when the bucket is full again.
+"""
+
+# Core Library modules
+import threading
+import time
+from collections.abc import Mapping
+from typing import Optional
+
+# Local modules
+from . import logger
+from .exceptions import RateLimited
+
+
+class TokenBucket:
+    """A bucket of tokens for one host, shared by every thread.
+
+    Attributes:
+        capacity:       the most tokens the bucket holds.
+        rate:           the tokens added back per second.
+    """
+
+    def __init__(self, capacity: float, period: float) -> None:
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        # when the host resets its count, the refill is held until then
+        self._reset_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if self._reset_at is not None:
+            if now < self._reset_at:
+                self._updated = now
+                return
+            self._tokens = min(self.capacity, self._tokens + self.capacity)
+            self._updated = self._reset_at
+            self._reset_at = None
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def reserve(self, max_wait: Optional[float] = None) -> Optional[float]:
+        """Takes a token, reserving the next one due if the bucket is empty.
+
+        Args:
+            max_wait:       the longest wait to reserve a token for, None for no
+                            limit.
+
+        Returns:
+            float:          the seconds to wait before the token is due, 0 if there
+                            was one in the bucket, or None if it is due later than
+                            max_wait, when no token is taken.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # a negative balance is the queue of workers waiting on tokens
+            if self._tokens >= 1:
+                wait = 0.0
+            elif self._reset_at is not None:
+                wait = self._reset_at - now
+                wait += max(0.0, (1 - self._tokens - self.capacity) / self.rate)
+            else:
+                wait = (1 - self._tokens) / self.rate
+            if max_wait is not None and wait > max_wait:
+                return None
+            self._tokens -= 1
+            return wait
+
+    def update(self, remaining: int, reset_in: float) -> None:
+        """Brings the bucket in line with the requests the host says are left.
+
+        Args:
+            remaining:      the requests the host allows until it resets its count.
+            reset_in:       the seconds until the host resets its count.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, remaining)
+            self._reset_at = now + max(0.0, reset_in)
+
+
+class RateLimiter:
+    """The token buckets of every host with a rate limit.
+
+    Args:
+        limits:         the capacity and period in seconds of each host, e.g.
+                        {"api.github.com": (55, 3600)}.
+    """
+
+    def __init__(self, limits: Mapping[str, tuple[float, float]]) -> None:
+        self.limits = limits
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(host)
+                if bucket is None:
+                    bucket = self._buckets[host] = TokenBucket(*self.limits[host])
+        return bucket
+
+    def acquire(self, host: str, max_wait: Optional[float] = None) -> float:
+        """Waits until a request can be sent to the host within its limit.
+
+        Args:
+            host:           the host name of the request, e.g. "pypi.org".
+            max_wait:       the longest to wait, None to wait as long as it takes.
+
+        Returns:
+            float:          the seconds waited.
+
+        Raises:
+            RateLimited:    if the request could not be sent within max_wait.
+        """
+        if host not in self.limits:
+            return 0.0
+        wait = self._bucket(host).reserve(max_wait)
+        if wait is None:
+            logger.debug("giving up a request to %s, over its rate limit", host)
+            raise RateLimited(
+                f"the rate limit of {host} allows no request within {max_wait:.0f} s"
+            )
+        if wait > 0:
+            logger.debug("holding a request to %s for %.2f s", host, wait)
+            time.sleep(wait)
+        return wait
+
+    def update(self, host: str, remaining: int, reset_in: float) -> None:
+        """Updates the bucket of the host from the rate limit it reports.
+
+        Args:
+            host:           the host name of the response, e.g. "api.github.com".
+            remaining:      the requests the host allows until it resets its count.
+            reset_in:       the seconds until the host resets its count.
+        """
+        if host not in self.limits:
+            return
+        logger.debug("%s allows %d requests for %.0f s", host, remaining, reset_in)
+        self._bucket(host).update(remaining, reset_in)
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Offline search of the local PyPI index for names similar to a project name.
+
+A trigram inverted index is built from the PyPI index the first time it is needed
+and saved next to it:
+
+    header      magic, format version, trigram count and the name count and
+                directory offset of the PyPI index it was built from.
+    lengths     the length of every name, one byte per name in index order.
+    trigrams    every trigram found in the names, sorted, three bytes each.
+    offsets     where the postings of every trigram start and end.
+    postings    for every trigram, the positions in the PyPI index of the names
+                holding it.
+
+A query only reads the postings of its own trigrams. Names that share too few
+trigrams with the query, or differ too much in length, to be within the maximum edit
+distance are discarded before any name is decompressed and compared.
+
+A name short enough to have no more than 3 trigrams per allowed edit can be within
+the maximum edit distance of another without sharing a single trigram, e.g. 'numpx'
+and 'nampy'. Such a query is compared with every name of a near enough length
+instead, the names of each length are decompressed once and kept for later queries.
+"""
+
+# Core Library modules
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from importlib.resources import as_file
+from importlib.resources.abc import Traversable
+from itertools import chain
+from typing import Optional
+
+# Local modules
+from . import logger, pypi_index_trigram_file_trv
+from .index import PyPIIndex, atomic_writer, normalize_name, pypi_index
+
+TRIGRAM_MAGIC = b"PYNAMTRG"
+TRIGRAM_VERSION = 1
+
+# a trigram held by more than 1 in COMMON_TRIGRAM_SHARE names is too common to be
+# worth counting, see TrigramIndex.nearest()
+COMMON_TRIGRAM_SHARE = 20
+
+_TRIGRAM_HEADER = struct.Struct("<8sHIIQ")
+# pads the header so that the offsets and postings arrays are 4-byte aligned
+_TRIGRAM_HEADER_SIZE = 32
+
+
+def trigrams(name: bytes) -> set[bytes]:
+    """Returns the distinct trigrams of a normalized name.
+
+    The name is padded with '^' and '$', which never appear in a normalized name, so
+    the first and last characters count as much as the rest and a name of n
+    characters has n trigrams.
+    """
+    padded = b"".join([b"^", name, b"$"])
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(first: bytes, second: bytes, max_distance: int) -> int:
+    """Returns the Levenshtein distance between two names.
+
+    Uses Myers' bit-parallel algorithm, every column of the dynamic programming
+    table is computed at once with integer bit operations.
+
+    Args:
+        first:          the first name.
+        second:         the second name.
+        max_distance:   the largest distance of interest.
+
+    Returns:
+        int:            the edit distance, or max_distance + 1 if it is larger than
+                        max_distance.
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+    if not first:
+        return len(second)
+    match_masks: dict[int, int] = {}
+    for bit, char in enumerate(first):
+        match_masks[char] = match_masks.get(char, 0) | 1 << bit
+    all_bits = (1 << len(first)) - 1
+    last_bit = 1 << (len(first) - 1)
+    positive, negative = all_bits, 0
+    distance = len(first)
+    remaining = len(second)
+    for char in second:
+        matches = match_masks.get(char, 0)
+        vertical = matches | negative
+        horizontal = (((matches & positive) + positive) ^ positive) | matches
+        positive_horizontal = negative | (~(horizontal | positive) & all_bits)
+        negative_horizontal = positive & horizontal
+        if positive_horizontal & last_bit:
+            distance += 1
+        elif negative_horizontal & last_bit:
+            distance -= 1
+        remaining -= 1
+        if distance - remaining > max_distance:
+            return max_distance + 1
+        positive_horizontal = (positive_horizontal << 1 | 1) & all_bits
+        negative_horizontal = (negative_horizontal << 1) & all_bits
+        positive = negative_horizontal | (~(vertical | positive_horizontal) & all_bits)
+        negative = positive_horizontal & vertical
+    return min(distance, max_distance + 1)
+
+
+def write_trigram_index(
+    trigram_file: Traversable, names: PyPIIndex, index_key: tuple[int, int]
+) -> None:
+    """Builds the trigram index of every name in the PyPI index and writes it.
+
+    Args:
+        trigram_file:   the file to write the trigram index to.
+        names:          the PyPI index to build the trigram index from.
+        index_key:      the name count and directory offset of the PyPI index.
+    """
+    lengths = bytearray()
+    postings: defaultdict[bytes, array] = defaultdict(lambda: array("I"))
+    for position, name in enumerate(names):
+        encoded = name.encode("utf-8")
+        lengths.append(min(len(encoded), 255))
+        for trigram in trigrams(encoded):
+            postings[trigram].append(position)
+
+    keys = sorted(postings)
+    offsets = array("I", [0])
+    for key in keys:
+        offsets.append(offsets[-1] + len(postings[key]))
+    header = _TRIGRAM_HEADER.pack(TRIGRAM_MAGIC, TRIGRAM_VERSION, len(keys), *index_key)
+    sections = [
+        header.ljust(_TRIGRAM_HEADER_SIZE, b"\0"),
+        bytes(lengths),
+        b"".join(keys),
+    ]
+    # keep the arrays that follow aligned
+    padding = -sum(map(len, sections)) % 4
+    with as_file(trigram_file) as file, atomic_writer(file) as f:
+        f.writelines(sections)
+        f.write(bytes(padding))
+        f.write(offsets.tobytes())
+        for key in keys:
+            f.write(postings[key].tobytes())
+
+
+class TrigramIndex:
+    """The trigram index of the local PyPI index, loaded on first use.
+
+    If the trigram file is missing, or was built from a different PyPI index, it is
+    rebuilt from the PyPI index before the first query, which takes a few seconds
+    for the full PyPI index. Later queries memory map the saved file.
+    """
+
+    def __init__(self, trigram_file: Traversable, names: PyPIIndex) -> None:
+        self.trigram_file = trigram_file
+        self.names = names
+        self._buffer: Optional[mmap.mmap] = None
+        self._index_key = (0, 0)
+        self._lengths = b""
+        self._trigrams: dict[bytes, int] = {}
+        self._offsets = array("I")
+        self._postings_offset = 0
+        self._names_by_length: dict[int, list[bytes]] = {}
+
+    def _open(self) -> Optional[mmap.mmap]:
+        if not self.trigram_file.is_file():
+            return None
+        with as_file(self.trigram_file) as trigram_file, trigram_file.open("rb") as f:
+            if os.fstat(f.fileno()).st_size < _TRIGRAM_HEADER_SIZE:
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, *key = _TRIGRAM_HEADER.unpack_from(buffer)
+        if (
+            magic != TRIGRAM_MAGIC
+            or version != TRIGRAM_VERSION
+            or tuple(key[1:]) != self.names.key()
+        ):
+            logger.debug("the trigram index is not for the current PyPI index")
+            buffer.close()
+            return None
+        return buffer
+
+    def _load(self) -> mmap.mmap:
+        if self._buffer is not None and self._index_key != self.names.key():
+            # the PyPI index has been reloaded since the trigram index was
+            self.refresh()
+        if self._buffer is None:
+            buffer = self._open()
+            if buffer is None:
+                logger.debug("building the trigram index of the PyPI index")
+                write_trigram_index(self.trigram_file, self.names, self.names.key())
+                buffer = self._open()
+                assert buffer is not None
+            _, _, trigram_count, name_count, _ = _TRIGRAM_HEADER.unpack_from(buffer)
+            start = _TRIGRAM_HEADER_SIZE
+            self._lengths = buffer[start : start + name_count]
+            start += name_count
+            keys = buffer[start : start + 3 * trigram_count]
+            self._trigrams = {
+                keys[i : i + 3]: number
+                for number, i in enumerate(range(0, len(keys), 3))
+            }
+            start += 3 * trigram_count
+            start += -start % 4
+            self._offsets = array("I")
+            self._offsets.frombytes(buffer[start : start + 4 * (trigram_count + 1)])
+            self._postings_offset = start + 4 * (trigram_count + 1)
+            self._index_key = self.names.key()
+            self._buffer = buffer
+        return self._buffer
+
+    def _postings_range(self, trigram: bytes) -> tuple[int, int]:
+        number = self._trigrams.get(trigram)
+        if number is None:
+            return 0, 0
+        return self._offsets[number], self._offsets[number + 1]
+
+    def _postings(self, trigram: bytes) -> array:
+        buffer = self._load()
+        start, end = self._postings_range(trigram)
+        postings = array("I")
+        postings.frombytes(
+            buffer[self._postings_offset + 4 * start : self._postings_offset + 4 * end]
+        )
+        return postings
+
+    def _postings_length(self, trigram: bytes) -> int:
+        start, end = self._postings_range(trigram)
+        return end - start
+
+    def _names_of_length(self, length: int) -> list[bytes]:
+        names = self._names_by_length.get(length)
+        if names is None:
+            positions = []
+            position = self._lengths.find(length)
+            while position != -1:
+                positions.append(position)
+                position = self._lengths.find(length, position + 1)
+            names = self._names_by_length[length] = list(
+                self.names.names_at(positions).values()
+            )
+        return names
+
+    def refresh(self) -> None:
+        """Releases the current mapping, the next query loads the file again."""
+        if self._buffer is not None:
+            self._buffer.close()
+        self._buffer = None
+        self._names_by_length = {}
+
+    def nearest(
+        self, project_name: str, limit: int = 10, max_distance: int = 2
+    ) -> list[tuple[str, int]]:
+        """Finds the existing projects with names closest to the project name.
+
+        Args:
+            project_name:   the name of the project currently under test.
+            limit:          the most names to return.
+            max_distance:   the largest edit distance to consider a name similar.
+
+        Returns:
+            list:           up to limit (name, edit distance) pairs, closest first,
+                            excluding the project name itself.
+        """
+        target = normalize_name(project_name).encode("utf-8")
+        self._load()
+        target_trigrams = sorted(trigrams(target), key=self._postings_length)
+        # every edit changes at most 3 trigrams, so a name within max_distance
+        # shares at least this many with the target
+        threshold = len(target_trigrams) - 3 * max_distance
+        if threshold <= 0:
+            return self._nearest_by_length(target, limit, max_distance)
+        # trigrams held by a large share of all names are not counted up front, as
+        # long as the rarer trigrams leave a name at least one trigram to share, and
+        # are only looked up for the names the rarer trigrams point to
+        common_length = len(self._lengths) // COMMON_TRIGRAM_SHARE
+        common_trigrams = []
+        while (
+            len(target_trigrams) > 3 * max_distance + 1
+            and self._postings_length(target_trigrams[-1]) > common_length
+        ):
+            common_trigrams.append(target_trigrams.pop())
+        counts = Counter(chain.from_iterable(map(self._postings, target_trigrams)))
+        lengths = self._lengths
+        candidates = [
+            position
+            for position, count in counts.items()
+            if count + len(common_trigrams) >= threshold
+            and abs(lengths[position] - len(target)) <= max_distance
+        ]
+        for trigram in common_trigrams:
+            postings = self._postings(trigram)
+            for position in candidates:
+                index = bisect_left(postings, position)
+                if index < len(postings) and postings[index] == position:
+                    counts[position] += 1
+        trigram_count = len(target_trigrams) + len(common_trigrams)
+        by_count = defaultdict(list)
+        for position in candidates:
+            if counts[position] >= threshold:
+                by_count[counts[position]].append(position)
+
+        similar: list[tuple[int, str]] = []
+        for count in sorted(by_count, reverse=True):
+            # names sharing fewer trigrams can be no closer than this, so once there
+            # are enough names at least as close the rest need not be compared
+            closest_possible = -(-(trigram_count - count) // 3)
+            if len(similar) >= limit and closest_possible >= similar[limit - 1][0]:
+                break
+            for name in self.names.names_at(by_count[count]).values():
+                distance = edit_distance(target, name, max_distance)
+                if 0 < distance <= max_distance:
+                    similar.append((distance, name.decode("utf-8")))
+            similar.sort()
+        return [(name, distance) for distance, name in similar[:limit]]
+
+    def _nearest_by_length(
+        self, target: bytes, limit: int, max_distance: int
+    ) -> list[tuple[str, int]]:
+        # the target shares too few trigrams for them to rule any name out
+        similar: list[tuple[int, str]] = []
+        for length in range(
+            max(1, len(target) - max_distance), len(target) + max_distance + 1
+        ):
+            for name in self._names_of_length(length):
+                distance = edit_distance(target, name, max_distance)
+                if 0 < distance <= max_distance:
+                    similar.append((distance, name.decode("utf-8")))
+        similar.sort()
+        return [(name, distance) for distance, name in similar[:limit]]
+
+
+trigram_index = TrigramIndex(pypi_index_trigram_file_trv, pypi_index)
@@ -6,12 +6,15 @@
 import os
 import pickle
 import re
+import subprocess
+import sys
+import time
 from importlib.resources import as_file
+from itertools import chain
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 # Third party modules
-import requests
 from colorama import Back, Fore, Style
 from packaging import version
 from tqdm import tqdm
@@ -20,9 +23,31 @@
 import pynamer
 
 # Local modules
-from . import logger, project_count_file_trv, pypi_index_file_trv
+from . import (
+    index_meta_file_trv,
+    logger,
+    network,
+    project_count_file_trv,
+    pypi_index_delta_file_trv,
+    pypi_index_file_trv,
+    pypi_index_filter_file_trv,
+    pypi_index_lock_file_trv,
+)
 from .config import config
 from .exceptions import file_exception, request_exception
+from .index import (
+    SIMPLE_ACCEPT,
+    SIMPLE_JSON_CONTENT_TYPE,
+    IndexLock,
+    PyPIIndex,
+    is_index_file,
+    iter_simple_index,
+    iter_simple_index_json,
+    parse_last_serial,
+    pypi_index,
+    write_delta,
+    write_index,
+)
 
 
 def check_integrity() -> None:
@@ -124,37 +149,159 @@ def find_pypirc_file(filename: str = ".pypirc") -> None:
     logger.debug("%s is not present in the system's PATH.", filename)
 
 
+def read_index_meta() -> dict:
+    """Reads the validators saved with the index by the last index generation.
+
+    Returns:
+        dict:           the 'etag', 'last_modified' and 'last_serial' of the simple
+                        index response the current index was built from and the
+                        'built_at' time, an empty dictionary if they have never been
+                        saved.
+    """
+    if not index_meta_file_trv.is_file():
+        return {}
+    return pickle.loads(index_meta_file_trv.read_bytes())
+
+
+def write_index_meta(index_meta: dict) -> None:
+    """Saves the validators of the simple index response next to the project count.
+
+    Args:
+        index_meta:     the 'etag', 'last_modified', 'last_serial' and 'built_at' to
+                        save.
+    """
+    with (
+        as_file(index_meta_file_trv) as index_meta_file,
+        index_meta_file.open("wb") as f,
+    ):
+        pickle.dump(index_meta, f)
+
+
 @request_exception
 def generate_pypi_index() -> None:
     """Generates a list of projects in PyPI's simple index - writes results to a file.
 
     Raises:
-        SystemExit:     if any requests.RequestException occurs.
+        SystemExit:     if any requests.RequestException occurs or another pynamer
+                        process holds the index lock for longer than
+                        config.index_lock_timeout while there is no index to use.
 
     Notes:
+        Only one pynamer process generates the index at a time. A process that finds
+        the index lock taken keeps using the existing index, or, if there is none
+        yet, waits for the other process to finish and uses the index it wrote.
+    """
+    have_snapshot = is_index_file(pypi_index_file_trv)
+    with as_file(pypi_index_lock_file_trv) as pypi_index_lock_file:
+        index_lock = IndexLock(pypi_index_lock_file)
+        timeout = 0 if have_snapshot else config.index_lock_timeout
+        if not index_lock.acquire(timeout):
+            if not have_snapshot:
+                raise SystemExit(
+                    "Timed out waiting for another pynamer process to generate the "
+                    "PyPI index"
+                )
+            logger.debug("the index lock is held by another process")
+            # the holder is refreshing the index, so it is not stale for this run,
+            # or each lookup would try to refresh it again
+            config.index_built_at = time.time()
+            feedback(
+                "The PyPI index is being updated by another process - "
+                "using the current index",
+                "warning",
+            )
+            return
+        try:
+            if not have_snapshot and is_index_file(pypi_index_file_trv):
+                logger.debug("the PyPI index was generated by another process")
+                pypi_index.refresh()
+                return
+            _download_pypi_index()
+        finally:
+            index_lock.release()
+
+
+def _download_pypi_index() -> None:
+    """Downloads PyPI's simple index and writes it to the index file.
+
+    Notes:
+        The index is written PEP 503 normalized and sorted so that it can be
+        searched by bisection (see pynamer.index).
+        The request is conditional on the ETag and Last-Modified of the response
+        the current index was built from. Nothing is rewritten if PyPI answers
+        '304 Not Modified' or reports the same X-PyPI-Last-Serial as last time.
+        The PEP 691 JSON form of the simple index is requested, falling back to the
+        HTML page if the server does not offer JSON. The meta._last-serial of a
+        JSON response is recorded for the next incremental refresh.
+        The response is streamed and parsed in large byte chunks, with progress
+        updated once per chunk.
+        The names added to and removed from PyPI since the previous index are found
+        in one merge of the previous index and the new names, before the previous
+        index is replaced, and written to the delta file, see
+        pynamer.index.write_delta().
         A potentially expensive operation as there are almost 500,000 projects to
-        process. Can take 2-3 seconds. Look to improve performance at a later date:
-        look at asyncio, asyncio.http etc.
-        An improvement is to automatically periodically run this in the background.
+        process. Can take 2-3 seconds. Once the index is older than config.index_ttl
+        it is refreshed in the background, see refresh_index_in_background().
     """
-    new_count = 0
-    pattern = re.compile(r">([\w\W]*?)<")
-    with as_file(pypi_index_file_trv) as pypi_index_file:
-        if pypi_index_file.exists():
-            pypi_index_file.unlink(missing_ok=True)
+    project_names: list[bytes] = []
+    headers = {"Accept": SIMPLE_ACCEPT}
+    index_meta = read_index_meta() if is_index_file(pypi_index_file_trv) else {}
+    if index_meta.get("etag"):
+        headers["If-None-Match"] = index_meta["etag"]
+    if index_meta.get("last_modified"):
+        headers["If-Modified-Since"] = index_meta["last_modified"]
+
+    index_object_raw = network.get(
+        config.pypi_simple_index_url, headers=headers, stream=True, timeout=5
+    )
+    last_serial = index_object_raw.headers.get("X-PyPI-Last-Serial")
+    if index_object_raw.status_code == 304 or (
+        last_serial is not None and last_serial == index_meta.get("last_serial")
+    ):
+        index_object_raw.close()
+        logger.debug("the PyPI simple index has not changed since the last generation")
+        # confirming the index is current is as good as rebuilding it
+        index_meta["built_at"] = config.index_built_at = time.time()
+        write_index_meta(index_meta)
+        feedback("The PyPI index is already up to date", "nominal")
+        return
+
+    chunks = index_object_raw.iter_content(chunk_size=1 << 20)
+    content_type = index_object_raw.headers.get("Content-Type", "")
+    if content_type.startswith(SIMPLE_JSON_CONTENT_TYPE):
+        first_chunk = next(chunks, b"")
+        last_serial = parse_last_serial(first_chunk) or last_serial
+        parsed_chunks = iter_simple_index_json(chain([first_chunk], chunks))
+    else:
+        parsed_chunks = iter_simple_index(chunks)
 
     with tqdm(total=config.project_count) as progress_bar:
-        index_object_raw = requests.get(config.pypi_simple_index_url, timeout=5)
-
-        with pypi_index_file_trv.open("a") as file:  # type: ignore
-            for line in index_object_raw.iter_lines():
-                line = str(line)
-                project_text = re.search(pattern, line)
-                if project_text is not None:
-                    new_count += 1
-                    progress_bar.update(1)
-                    project = "".join([project_text.group(1), " \n"])
-                    file.write(project)
+        for names in parsed_chunks:
+            project_names.extend(names)
+            progress_bar.update(len(names))
+
+    # write_index sorts the names in place too, sorted here for the delta
+    project_names.sort()
+    delta = None
+    if is_index_file(pypi_index_file_trv):
+        previous_index = PyPIIndex(pypi_index_file_trv)
+        try:
+            with as_file(pypi_index_delta_file_trv) as pypi_index_delta_file:
+                # streamed from the previous index before it is replaced
+                delta = write_delta(
+                    pypi_index_delta_file, previous_index.iter_encoded(), project_names
+                )
+        finally:
+            previous_index.refresh()
+        logger.debug("the index delta was written to %s", pypi_index_delta_file_trv)
+
+    # Windows cannot rename the new index over a file this process still maps
+    pypi_index.refresh()
+    with (
+        as_file(pypi_index_file_trv) as pypi_index_file,
+        as_file(pypi_index_filter_file_trv) as pypi_index_filter_file,
+    ):
+        new_count = write_index(pypi_index_file, project_names, pypi_index_filter_file)
 
     with (
         as_file(project_count_file_trv) as project_count_file,
@@ -162,7 +309,25 @@ def generate_pypi_index() -> None:
     ):
         pickle.dump(new_count, f)  # type: ignore[arg-type]
 
-    if config.project_count > 0:
+    write_index_meta(
+        {
+            "etag": index_object_raw.headers.get("ETag"),
+            "last_modified": index_object_raw.headers.get("Last-Modified"),
+            "last_serial": last_serial,
+            "built_at": time.time(),
+        }
+    )
+    config.index_built_at = time.time()
+
+    if delta is not None:
+        added, removed = delta
+        if added or removed:
+            feedback(
+                f"{added} projects added and {removed} projects removed since last "
+                "index generation",
+                "warning",
+            )
+    elif config.project_count > 0:
         diff = new_count - config.project_count
         if diff > 0:  # pragma: no cover
             feedback(
@@ -176,6 +341,50 @@ def generate_pypi_index() -> None:
             )
 
 
+def index_is_stale() -> bool:
+    """Determines if the index is older than its time to live.
+
+    Returns:
+        True:           the index was built more than config.index_ttl seconds ago.
+        False:          the index is fresh, or config.index_ttl is 0 which turns
+                        automatic refreshing off.
+    """
+    if config.index_ttl <= 0:
+        return False
+    return time.time() - config.index_built_at > config.index_ttl
+
+
+_background_refresh: Optional[subprocess.Popen] = None
+
+# only regenerates the index, a full 'pynamer -g' run could find the index stale
+# itself and start yet another refresh
+REFRESH_INDEX_COMMAND = (
+    "from pynamer.utils import generate_pypi_index; generate_pypi_index()"
+)
+
+
+def refresh_index_in_background() -> None:
+    """Starts a detached process that only regenerates a stale index.
+
+    The current index keeps answering queries while the new one is downloaded. It is
+    written to a temporary file and renamed over the old one, and picked up by
+    PyPIIndex.reload_if_changed() on the next lookup. A subprocess rather than a
+    thread is used so the refresh completes even if this run finishes first.
+    Only one refresh is started per process, and the child never starts another.
+    """
+    global _background_refresh
+    if _background_refresh is not None:
+        return
+    logger.debug("the PyPI index is stale, refreshing it in the background")
+    _background_refresh = subprocess.Popen(
+        [sys.executable, "-c", REFRESH_INDEX_COMMAND],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
 @request_exception
 def check_version() -> None:
     """Utility function to compare package version against latest version on PyPI.
@@ -192,7 +401,7 @@ def check_version() -> None:
     url_json = "".join([config.pypi_json_url, "pynamer", "/json"])
     current_version = version.parse(pynamer.__version__)
 
-    project_json_raw = requests.get(url_json, timeout=5)
+    project_json_raw = network.get(url_json, timeout=5)
 
     if project_json_raw.status_code == 200:
         project_json = json.loads(project_json_raw.content)
@@ -234,7 +443,8 @@ def write_output_file(file_name: str, results: dict) -> None:
     Args:
         file_name:      name of file to save as a simple string.
         results:        dictionary containing the test results e.g.
-                        {"pynball": [1, 1, 1]}
+                        {"pynball": [1, 1, 1]}, -1 for a test that could not be
+                        run.
 
     Raises:
         SystemExit:     if there is an error opening the file.
@@ -263,9 +473,14 @@ def write_output_file(file_name: str, results: dict) -> None:
         )
         projects_results = "".join([projects_results, f"{project_name:30}"])
         for test in results[project]:
-            test = "Found" if test == 1 else "Not Found"
+            test = {1: "Found", -1: "Error"}.get(test, "Not Found")
             projects_results = "".join([projects_results, f"{test:12}"])
-        conclusion = "Not Available" if sum(results[project]) > 0 else "Available"
+        if 1 in results[project]:
+            conclusion = "Not Available"
+        elif -1 in results[project]:
+            conclusion = "Unknown"
+        else:
+            conclusion = "Available"
         projects_results = "".join([projects_results, f"{conclusion}"])
         projects_results = "".join([projects_results, "\n", "-" * header_width, "\n"])
 
@@ -5,8 +5,10 @@
 import json
 import re
 import string
+from collections.abc import Iterable, Iterator
 from datetime import datetime
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Optional, Union
 
 # Third party modules
 import requests
@@ -16,10 +18,20 @@
 from rich.table import Table
 
 # Local modules
-from . import logger, pypi_index_file_trv
+from . import logger, network
 from .config import config
-from .exceptions import request_exception
-from .utils import generate_pypi_index, search_json
+from .exceptions import RateLimited, request_exception
+from .hashed_index import HashedIndex, hashed_index
+from .index import PyPIIndex, pypi_index
+from .similarity import trigram_index
+from .utils import (
+    generate_pypi_index,
+    index_is_stale,
+    refresh_index_in_background,
+    search_json,
+)
+
+PROJECT_JSON_CACHE_SIZE = 16
 
 
 def is_valid_package_name(project_name: str) -> bool:
@@ -92,10 +104,16 @@ def github_meta(url: str) -> str:
         [config.github_api_url, url.replace(r"https://github.com/", "")]
     )
     try:
-        json_raw = requests.get(repo_api_url, timeout=5)
+        json_raw = network.get(repo_api_url, ttl=config.cache_ttl_github, timeout=5)
+    except RateLimited:
+        logger.debug("skipped the GitHub stats of %s, over the rate limit", url)
+        return "".join([return_text, "Skipped, the GitHub rate limit is used up"])
     except requests.RequestException:
         return "".join([return_text, "GitHub can not be contacted"])
 
+    if network.is_rate_limited(json_raw):
+        logger.debug("skipped the GitHub stats of %s, GitHub refused them", url)
+        return "".join([return_text, "Skipped, the GitHub rate limit is used up"])
     if json_raw.status_code == 200:
         repo_json = json_raw.json()
 
@@ -132,25 +150,87 @@ def github_meta(url: str) -> str:
     return ""
 
 
+class _NotKept(Exception):
+    # carries a response out of _fetch_project_json, as lru_cache only skips
+    # keeping the result of a call that raises
+    def __init__(self, response: requests.Response) -> None:
+        super().__init__(response.status_code)
+        self.response = response
+
+
+@lru_cache(maxsize=PROJECT_JSON_CACHE_SIZE)
+def _fetch_project_json(project_name: str) -> requests.Response:
+    url_json = "".join([config.pypi_json_url, project_name, "/json"])
+    logger.debug("attempting to get url %s", url_json)
+    response = network.get(url_json, ttl=config.cache_ttl_json, timeout=5)
+    if response.status_code in network.RETRY_STATUSES:
+        raise _NotKept(response)
+    return response
+
+
+def fetch_project_json(project_name: str) -> requests.Response:
+    """Gets the PyPI JSON API document of a project, at most once per run.
+
+    The details of a taken project, and test 1 when they are wanted or
+    config.project_probe is "json", come from the same document, so the response
+    is kept and both are answered from one download. Only the most recent
+    PROJECT_JSON_CACHE_SIZE responses are kept, as the documents of large projects
+    run to megabytes. A request that raises, or is still answered '429 Too Many
+    Requests' or a 5xx after its retries, is not kept, so the next call asks again.
+
+    Args:
+        project_name:   the name of the project to get.
+
+    Returns:
+        requests.Response:  the response of the JSON API URL of the project.
+    """
+    try:
+        return _fetch_project_json(project_name)
+    except _NotKept as e:
+        return e.response
+
+
+def _probe_project(project_name: str, details: bool) -> requests.Response:
+    if config.project_probe == "head" and not details:
+        url_json = "".join([config.pypi_json_url, project_name, "/json"])
+        logger.debug("probing url %s", url_json)
+        response = network.head(
+            url_json, ttl=config.cache_ttl_json, timeout=5, allow_redirects=True
+        )
+        if response.status_code != 405:
+            return response
+        logger.debug("HEAD is not allowed, getting the JSON document instead")
+    return fetch_project_json(project_name)
+
+
 @request_exception
-def ping_project(project_name: str) -> bool:
+def ping_project(project_name: str, details: bool = False) -> bool:
     """Determines if the URL to the project exists in PyPIs project area.
 
+    Only the status of the JSON API URL is needed, so unless the details will be
+    wanted it is asked for with a HEAD request, and the document, megabytes for a
+    project with many releases, is not downloaded. When the details will be wanted
+    the document is downloaded here instead, and kept for ping_json, so a taken
+    name costs one request rather than two. With config.project_probe = "json" the
+    document is always downloaded, for servers that do not answer HEAD.
+
     Args:
         project_name:   the name of the project to test.
+        details:        True if ping_json will be asked for the details of the
+                        project if it is taken.
 
     Returns:
         True:           if the URLs response code is 200.
         False:          if the URLs response code is not 200.
 
     Raises:
-        SystemExit:     if any requests.RequestException occurs.
+        SystemExit:     if any requests.RequestException occurs, or the response is
+                        still '429 Too Many Requests' or a 5xx after the retries.
     """
-    # url_project = "".join([config.pypi_project_url, project_name, "/"])
-    url_project = "".join([config.pypi_json_url, project_name, "/json/"])
-
-    logger.debug("attempting to get url %s", url_project)
-    project_ping = requests.get(url_project, timeout=5)
+    project_ping = _probe_project(project_name, details)
+    if project_ping.status_code in network.RETRY_STATUSES:
+        # still throttled or failing after the retries, which says nothing either way
+        project_ping.raise_for_status()
 
     if project_ping.status_code == 200:
         logger.debug("%s FOUND in the project area of PyPI", project_name)
@@ -160,20 +240,20 @@ def ping_project(project_name: str) -> bool:
 
 
 @request_exception
-def ping_json(project_name: str, stats: bool = False) -> str:
-    """Collects some PyPI details about the project if it exists.
+def project_details(project_name: str) -> tuple[str, str]:
+    """Collects some PyPI details about the project if it exists, without stats.
 
     Args:
         project_name:   the name of the project to test.
-        stats:          display stats from github json url.
+
+    Returns:
+        tuple:          the details, and the GitHub homepage to get the stats of
+                        with github_meta(), empty if there is none.
 
     Raises:
         SystemExit:     if any requests.RequestException occurs.
     """
-    url_json = "".join([config.pypi_json_url, project_name, "/json"])
-    logger.debug("attempting to get url %s", url_json)
-
-    project_json_raw = requests.get(url_json, timeout=5)
+    project_json_raw = fetch_project_json(project_name)
 
     if project_json_raw.status_code == 200:
         project_json = json.loads(project_json_raw.content)
@@ -205,16 +285,42 @@ def ping_json(project_name: str, stats: bool = False) -> str:
         result = "".join(
             [summary, "\n", author, "\n", email, "\n", version, "\n", homepage_text]
         )
-
-        if "github" in homepage_url and stats is True:
-            result = "".join([result, github_meta(homepage_url)])
-        return result
+        return result, homepage_url if "github" in homepage_url else ""
     logger.debug("No response from JSON URL")
-    return ""
+    return "", ""
+
+
+@request_exception
+def ping_json(project_name: str, stats: bool = False) -> str:
+    """Collects some PyPI details about the project if it exists.
+
+    Args:
+        project_name:   the name of the project to test.
+        stats:          display stats from github json url.
+
+    Raises:
+        SystemExit:     if any requests.RequestException occurs.
+    """
+    result, github_url = project_details(project_name)
+    if github_url and stats is True:
+        result = "".join([result, github_meta(github_url)])
+    return result
+
+
+def _index_backend() -> Union[PyPIIndex, HashedIndex]:
+    if config.index_backend == "numpy":
+        return hashed_index
+    return pypi_index
 
 
 def pypi_search_index(project_name: str) -> bool:
-    """Open the generated index file and search for the project name.
+    """Search the generated index file for the project name.
+
+    The index is loaded once per process (see pynamer.index.PyPIIndex) and searched
+    by bisection, or by hash with the numpy backend (see config.index_backend), only
+    an exact match of the PEP 503 normalized name counts as found.
+    A missing index has to be generated first, a stale one keeps being used while
+    it is refreshed in the background.
 
     Args:
         project_name:   the name of the project currently under test.
@@ -223,17 +329,131 @@ def pypi_search_index(project_name: str) -> bool:
         True:           a match was found.
         False:          a match was not found.
     """
-    if not pypi_index_file_trv.is_file():
+    if not pypi_index.exists():
         generate_pypi_index()
+    elif index_is_stale():
+        refresh_index_in_background()
+    pypi_index.reload_if_changed()
 
-    projects = pypi_index_file_trv.read_text(encoding="utf-8")
-    if project_name in projects:
+    if project_name in _index_backend():
         logger.debug("%s FOUND in the PyPI simple index", project_name)
         return True
     logger.debug("%s NOT FOUND in the PyPI simple index", project_name)
     return False
 
 
+def pypi_search_index_batch(project_names: Iterable[str]) -> Iterator[tuple[str, bool]]:
+    """Search the generated index file for a batch of project names in one pass.
+
+    Gives the same answers as pypi_search_index() for every name, but the names are
+    sorted once and merged against the index (see PyPIIndex.contains_many), which is
+    much quicker for the long lists of names read from an input file.
+
+    Args:
+        project_names:  the names of the projects under test.
+
+    Yields:
+        tuple:          each project name and True if a match was found, as soon
+                        as the merge reaches it. No names leave the index as it is,
+                        however missing or stale.
+    """
+    project_names = list(project_names)
+    if not project_names:
+        return
+    if not pypi_index.exists():
+        generate_pypi_index()
+    elif index_is_stale():
+        refresh_index_in_background()
+    pypi_index.reload_if_changed()
+    yield from _index_backend().contains_many(project_names)
+
+
+def pypi_index_lookup(project_names: Iterable[str]) -> dict[str, Optional[str]]:
+    """Search the generated index file for a batch of names and their collisions.
+
+    Test 2 and the PEP 503 collisions of every name are answered by the same single
+    pass over the index (see PyPIIndex.lookup_many), rather than one pass for
+    each as with pypi_search_index_batch() and pypi_index_collisions().
+
+    Args:
+        project_names:  the names of the projects under test.
+
+    Returns:
+        dict:           the normalized name of the existing project for each project
+                        name, or None if the name is not taken. No names leave the
+                        index as it is, however missing or stale.
+    """
+    project_names = list(project_names)
+    if not project_names:
+        return {}
+    if not pypi_index.exists():
+        generate_pypi_index()
+    elif index_is_stale():
+        refresh_index_in_background()
+    pypi_index.reload_if_changed()
+    return dict(_index_backend().lookup_many(project_names))
+
+
+def pypi_search_prefix(prefix: str) -> Iterator[str]:
+    """Search the generated index file for project names starting with a prefix.
+
+    Args:
+        prefix:         the start of the project names to find, e.g. 'django-'.
+
+    Yields:
+        str:            the normalized project names starting with the prefix.
+    """
+    if not pypi_index.exists():
+        generate_pypi_index()
+    pypi_index.reload_if_changed()
+    yield from pypi_index.startswith(prefix)
+
+
+def pypi_index_collisions(project_names: list[str]) -> dict[str, str]:
+    """Search the generated index file for names that collide with existing projects.
+
+    PyPI treats names that are the same after PEP 503 normalization as the same
+    project, so 'Foo_Bar' and 'foo.bar' are both taken if 'foo-bar' exists. All of
+    the names are checked in one pass over the index (see PyPIIndex.collisions).
+
+    Args:
+        project_names:  the names of the projects under test.
+
+    Returns:
+        dict:           the normalized name of the existing project for each project
+                        name that is taken. No names leave the index as it is.
+    """
+    if not project_names:
+        return {}
+    if not pypi_index.exists():
+        generate_pypi_index()
+    pypi_index.reload_if_changed()
+    collisions = dict(pypi_index.collisions(project_names))
+    logger.debug("%s names collide with existing projects", len(collisions))
+    return collisions
+
+
+def pypi_search_similar(project_name: str, limit: int = 10) -> list[tuple[str, int]]:
+    """Search the generated index file for projects with similar names.
+
+    Uses the trigram index of the local index (see pynamer.similarity), so no network
+    access is needed once the index has been generated.
+
+    Args:
+        project_name:   the name of the project currently under test.
+        limit:          the most similar names to return.
+
+    Returns:
+        list:           (project name, edit distance) pairs, closest first.
+    """
+    if not pypi_index.exists():
+        generate_pypi_index()
+    pypi_index.reload_if_changed()
+    similar = trigram_index.nearest(project_name, limit)
+    logger.debug("%s similar names found in the PyPI simple index", len(similar))
+    return similar
+
+
 def pypi_search(
     search_project: str,
 ) -> tuple[list[list[Union[str, Any]]], list[list[Union[str, Any]]], str]:
@@ -248,14 +468,21 @@ def pypi_search(
         others:         a list of projects not matching but PyPI thinks are relevant.
                             [project_name, version, released, description]
         others_total:   a str representation of total projects found (minus matches).
+
+    Raises:
+        requests.HTTPError: if the response is still '429 Too Many Requests' or a 5xx
+                            after the retries.
     """
     pattern = re.compile(r">([\d,+]*?)<")
-    s = requests.Session()
     projects_raw: list = []
     match: list[list[str]] = []
     others: list[list[str]] = []
     params = {"q": {search_project}, "page": 1}
-    r = s.get(config.pypi_search_url, params=params)  # type: ignore
+    r = network.get(
+        config.pypi_search_url, ttl=config.cache_ttl_search, params=params, timeout=5
+    )
+    if r.status_code in network.RETRY_STATUSES:
+        r.raise_for_status()
     soup = BeautifulSoup(r.text, "html.parser")
     projects_raw.extend(soup.select('a[class*="package-snippet"]'))
     for project_raw in projects_raw:
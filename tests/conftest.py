@@ -7,7 +7,11 @@
 import pytest
 
 # First party modules
-from pynamer import pynamer
+from pynamer import index, network, pynamer, validators
+from pynamer.concurrency import AdaptiveConcurrency
+from pynamer.config import config
+from pynamer.http_cache import ResponseCache
+from pynamer.rate_limit import RateLimiter
 
 BASE_DIR = Path(__file__).parents[0]
 SRC_DIR = Path(__file__).parents[1] / "src" / "pynamer"
@@ -30,14 +34,65 @@
       zip_safe=False)"""
 
 
+@pytest.fixture(autouse=True)
+def no_background_refresh(monkeypatch):
+    monkeypatch.setattr(config, "index_ttl", 0)
+
+
+@pytest.fixture(autouse=True)
+def no_cached_responses(monkeypatch, tmp_path):
+    validators._fetch_project_json.cache_clear()
+    response_cache = ResponseCache(tmp_path / "http_cache.sqlite3", 1 << 20)
+    monkeypatch.setattr(network, "response_cache", response_cache)
+    yield
+    response_cache.close()
+
+
+@pytest.fixture(autouse=True)
+def no_retry_waits(monkeypatch):
+    monkeypatch.setattr(config, "http_backoff", 0)
+    monkeypatch.setattr(network, "retry_budget", network.RetryBudget(100))
+    monkeypatch.setattr(network, "rate_limiter", RateLimiter({}))
+    monkeypatch.setattr(network, "concurrency", AdaptiveConcurrency())
+
+
+@pytest.fixture()
+def resource_index(monkeypatch):
+    resource_index = index.PyPIIndex(BASE_DIR / "resources" / "pypi_index")
+    monkeypatch.setattr(validators, "pypi_index", resource_index)
+    yield resource_index
+    resource_index.refresh()
+
+
 @pytest.fixture()
 def src_reset():
     meta = SRC_DIR / "meta.pickle"
+    http_cache = SRC_DIR / "http_cache.sqlite3"
     count = SRC_DIR / "project_count.pickle"
+    index_meta = SRC_DIR / "index_meta.pickle"
     index = SRC_DIR / "pypi_index"
+    index_filter = SRC_DIR / "pypi_index.filter"
+    index_lock = SRC_DIR / "pypi_index.lock"
+    index_delta = SRC_DIR / "pypi_index.delta"
+    index_trigrams = SRC_DIR / "pypi_index.trigrams"
+    index_hashes = SRC_DIR / "pypi_index.hashes.npy"
+    index_hash_names = SRC_DIR / "pypi_index.names.npy"
     setup = SRC_DIR / "setup.txt"
     base_setup = SRC_DIR / "setup_base.txt"
-    for file in (meta, count, index, setup):
+    for file in (
+        meta,
+        http_cache,
+        count,
+        index_meta,
+        index,
+        index_filter,
+        index_lock,
+        index_delta,
+        index_trigrams,
+        index_hashes,
+        index_hash_names,
+        setup,
+    ):
         if file.exists():
             file.unlink()
     shutil.copy(base_setup, setup)
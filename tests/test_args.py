@@ -18,6 +18,10 @@ def test_default_args():
     assert args.nocleanup is False
     assert args.verbose is False
     assert args.generate is False
+    assert args.prefix == "None"
+    assert args.jobs == 1
+    assert args.no_cache is False
+    assert args.refresh_cache is False
 
 
 def test_args_project():
@@ -110,3 +114,29 @@ def test_args_stats():
         ]
     )
     assert args.stats is True
+
+
+def test_args_prefix():
+    args, parser = pynamer._parse_args(
+        [
+            "--prefix",
+            "django-",
+        ]
+    )
+    assert args.prefix == "django-"
+
+
+def test_args_jobs():
+    args, parser = pynamer._parse_args(
+        [
+            "--jobs",
+            "16",
+        ]
+    )
+    assert args.jobs == 16
+
+
+def test_args_cache():
+    args, parser = pynamer._parse_args(["--no-cache", "--refresh-cache"])
+    assert args.no_cache is True
+    assert args.refresh_cache is True
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# Core Library modules
+import io
+import threading
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from pynamer import concurrency, engine, network
+from pynamer.concurrency import AdaptiveLimit
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(concurrency.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def answer(limit, status=200, elapsed=0.1, route="pypi"):
+    saturated = limit.acquire()
+    limit.release(status, elapsed, saturated, route)
+
+
+def test_increases_while_saturated(clock):
+    limit = AdaptiveLimit("pypi.org", initial=1, maximum=4)
+    answer(limit)
+    assert limit.limit == 2
+    # one more slot for every full round of answers
+    saturated = [limit.acquire(), limit.acquire()]
+    assert saturated == [False, True]
+    for full in saturated:
+        limit.release(200, 0.1, full)
+    assert limit.limit == pytest.approx(2.5)
+    assert limit.increases == 2
+
+
+def test_no_increase_below_limit(clock):
+    limit = AdaptiveLimit("pypi.org", initial=4, maximum=8)
+    for _ in range(10):
+        answer(limit)
+    assert limit.limit == 4
+    assert limit.increases == 0
+
+
+def test_capped_at_maximum(clock):
+    limit = AdaptiveLimit("pypi.org", initial=1, maximum=2)
+    for _ in range(10):
+        answer(limit)
+    assert limit.limit == limit.peak == 2
+
+
+@pytest.mark.parametrize("status", [429, 503, 0])
+def test_cut_on_congestion(clock, status):
+    limit = AdaptiveLimit("pypi.org", initial=8, maximum=8)
+    answer(limit, status=status)
+    assert limit.limit == 4
+    assert limit.cuts == 1
+
+
+def test_cut_once_per_round_trip(clock):
+    limit = AdaptiveLimit("pypi.org", initial=8, maximum=8)
+    answer(limit, status=429)
+    answer(limit, status=429)
+    assert limit.limit == 4
+    clock.now += 1
+    answer(limit, status=429)
+    assert limit.limit == 2
+    for _ in range(5):
+        clock.now += 1
+        answer(limit, status=429)
+    assert limit.limit == 1
+    assert limit.cuts == 7
+
+
+def test_cut_on_latency_spike(clock):
+    limit = AdaptiveLimit("pypi.org", initial=8, maximum=8, latency_factor=4.0)
+    answer(limit, elapsed=0.1)
+    answer(limit, elapsed=0.3)
+    assert limit.cuts == 0
+    answer(limit, elapsed=2.0)
+    assert limit.limit == 4
+
+
+def test_latency_kept_per_route(clock):
+    limit = AdaptiveLimit("pypi.org", initial=8, maximum=8, latency_factor=4.0)
+    answer(limit, elapsed=0.05, route="pypi")
+    answer(limit, elapsed=0.8, route="search")
+    assert limit.cuts == 0
+    assert set(limit.latencies) == {"pypi", "search"}
+
+
+def test_acquire_waits_for_free_slot():
+    limit = AdaptiveLimit("pypi.org", initial=1, maximum=1)
+    limit.acquire()
+    acquired = threading.Event()
+    waiter = threading.Thread(target=lambda: (limit.acquire(), acquired.set()))
+    waiter.start()
+    assert not acquired.wait(0.05)
+    limit.release(200, 0.1, True)
+    assert acquired.wait(1)
+    waiter.join()
+    assert limit.in_flight == 1
+
+
+def test_get_records_answers(monkeypatch):
+    statuses = [503, 200]
+
+    def session_get(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = statuses.pop(0)
+        response.raw = io.BytesIO(b"")
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    monkeypatch.setattr(network.config, "concurrency_initial", 4)
+    assert network.get("https://pypi.org/pypi/pynamer/json").status_code == 200
+    limit = network.concurrency.limit_for("pypi.org")
+    assert limit.cuts == 1
+    assert limit.in_flight == 0
+    assert network.concurrency.current("pypi.org") == 2
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(network.config, "concurrency_adaptive", False)
+    with network.concurrency.slot("pypi.org") as slot:
+        slot.status = 429
+    assert network.concurrency.limits() == []
+
+
+def test_check_names_starts_afresh(monkeypatch):
+    monkeypatch.setattr(engine, "ping_project", lambda name, details=False: False)
+    monkeypatch.setattr(engine, "pypi_search", lambda name: ([], [], "0"))
+    network.concurrency.limit_for("pypi.org").limit = 1
+    engine.check_names(["pynamer", "pynball"], jobs=2)
+    assert network.concurrency.current("pypi.org") is None
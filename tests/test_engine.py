@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# Core Library modules
+import pickle
+import threading
+import time
+from pathlib import Path
+
+# Third party modules
+import pytest
+import requests
+from requests.exceptions import ConnectTimeout
+
+# First party modules
+from pynamer import engine, network
+from pynamer.config import config
+
+BASE_DIR = Path(__file__).parents[0]
+
+project_names = ["pynball", "zeedonk", "pynamer-free", "zeedonk-two"]
+
+
+def fake_get(url, params=None, **kwargs):
+    if "/search/" in url and params["q"] != {"pynball"}:
+        # parsing the full search page is slow, only pynball gets one
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"<html><body></body></html>"
+        return response
+    if "/search/" in url:
+        resource = "requests_get_search_pynball.pickle"
+    elif "/pynball/" in url:
+        resource = "requests_get_json_pynball.pickle"
+    else:
+        resource = "requests_get_json_zeedonk.pickle"
+    return pickle.loads((BASE_DIR / "resources" / resource).read_bytes())
+
+
+@pytest.fixture()
+def http_pool_size(monkeypatch):
+    monkeypatch.setattr(config, "http_pool_size", config.http_pool_size)
+    yield
+    network.close_sessions()
+
+
+def test_check_names_same_as_sequential(monkeypatch, http_pool_size):
+    monkeypatch.setattr(network, "get", fake_get)
+    monkeypatch.setattr(network, "head", fake_get)
+    sequential = {name: engine.run_checks(name) for name in project_names}
+    assert engine.check_names(project_names, jobs=4) == sequential
+    assert sequential["pynball"].found is True
+    assert sequential["pynball"].details.startswith("Summary:  Utility")
+    assert sequential["zeedonk"].found is False
+
+
+def test_check_names_one_request_for_test_1(monkeypatch, http_pool_size):
+    requested = []
+
+    def counted_get(url, **kwargs):
+        requested.append(("GET", url))
+        return fake_get(url, **kwargs)
+
+    def counted_head(url, **kwargs):
+        requested.append(("HEAD", url))
+        return fake_get(url, **kwargs)
+
+    monkeypatch.setattr(network, "get", counted_get)
+    monkeypatch.setattr(network, "head", counted_head)
+    engine.check_names(["pynball", "zeedonk"], jobs=2)
+    # the details of a taken name are read from the document test 1 downloads
+    assert sorted(request for request in requested if "/json" in request[1]) == [
+        ("GET", "https://pypi.org/pypi/pynball/json"),
+        ("GET", "https://pypi.org/pypi/zeedonk/json"),
+    ]
+
+
+def test_check_names_bounded_per_host(monkeypatch, http_pool_size):
+    lock = threading.Lock()
+    in_flight = {"now": 0, "most": 0}
+
+    def slow_get(url, **kwargs):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["most"] = max(in_flight["most"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return fake_get(url, **kwargs)
+
+    monkeypatch.setattr(network, "get", slow_get)
+    monkeypatch.setattr(network, "head", slow_get)
+    names = [f"zeedonk-{i}" for i in range(12)]
+    results = engine.check_names(names, jobs=3)
+    assert list(results) == names
+    assert 1 < in_flight["most"] <= 3
+
+
+def test_run_checks_side_by_side(monkeypatch):
+    def slow_get(url, **kwargs):
+        time.sleep(0.2)
+        return fake_get(url, **kwargs)
+
+    monkeypatch.setattr(network, "get", slow_get)
+    monkeypatch.setattr(network, "head", slow_get)
+    start = time.perf_counter()
+    checks = engine.run_checks("zeedonk")
+    # the JSON URL and the search are requested at the same time
+    assert time.perf_counter() - start < 0.35
+    assert checks == engine.ProjectChecks(False, "", [], [], "0")
+
+
+def test_check_names_grows_pool(monkeypatch, http_pool_size):
+    monkeypatch.setattr(network, "get", fake_get)
+    monkeypatch.setattr(network, "head", fake_get)
+    engine.check_names(["zeedonk"], jobs=config.http_pool_size + 5)
+    assert config.http_pool_size >= 15
+
+
+def test_check_names_error(monkeypatch, http_pool_size):
+    def mock_requests_error(*args, **kwargs):
+        raise ConnectTimeout("Connection timed out")
+
+    monkeypatch.setattr(network, "get", mock_requests_error)
+    monkeypatch.setattr(network, "head", mock_requests_error)
+    results = engine.check_names(project_names, jobs=2)
+    assert list(results) == project_names
+    assert all(checks.error for checks in results.values())
+
+
+def test_check_names_stats_outside_pypi_limit(monkeypatch, http_pool_size):
+    names = ["pynball", "pynamer"]
+    github_asked = threading.Event()
+
+    def project_details(project_name):
+        if project_name == names[-1]:
+            # holds the one slot of PyPI until the first name asks GitHub
+            assert github_asked.wait(timeout=2)
+        return "details", f"https://github.com/owner/{project_name}"
+
+    def github_meta(url):
+        github_asked.set()
+        return "\nstats"
+
+    monkeypatch.setattr(
+        engine, "ping_project", lambda project_name, details=False: True
+    )
+    monkeypatch.setattr(engine, "project_details", project_details)
+    monkeypatch.setattr(engine, "pypi_search", lambda project_name: ([], [], "0"))
+    monkeypatch.setattr(engine, "github_meta", github_meta)
+    results = engine.check_names(names, stats=True, jobs=1)
+    assert [checks.details for checks in results.values()] == ["details\nstats"] * 2
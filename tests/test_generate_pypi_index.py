@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # Core Library modules
 import pickle
+import time
 from pathlib import Path
 
 # Third party modules
@@ -9,7 +10,8 @@
 from requests.exceptions import ConnectTimeout
 
 # First party modules
-from pynamer import pynamer, utils
+from pynamer import index, network, pynamer, utils
+from pynamer.config import config
 
 BASE_DIR = Path(__file__).parents[0]
 
@@ -21,26 +23,190 @@ def my_custom_get(url, **kwargs):
     return pickle_content
 
 
-def test_generate_pypi_index(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get)
-    monkeypatch.setattr(utils, "pypi_index_file_trv", BASE_DIR / "pypi_index")
-    monkeypatch.setattr(
-        utils, "project_count_file_trv", BASE_DIR / "project_count.pickle"
+def my_custom_get_json(url, **kwargs):
+    _pickle_file = BASE_DIR / "resources" / "simple_index_json.pickle"
+    _pickle_bytes = _pickle_file.read_bytes()
+    pickle_content = pickle.loads(_pickle_bytes)
+    return pickle_content
+
+
+@pytest.fixture()
+def index_files(monkeypatch):
+    index_file = BASE_DIR / "pypi_index"
+    count_file = BASE_DIR / "project_count.pickle"
+    meta_file = BASE_DIR / "index_meta.pickle"
+    filter_file = BASE_DIR / "pypi_index.filter"
+    lock_file = BASE_DIR / "pypi_index.lock"
+    delta_file = BASE_DIR / "pypi_index.delta"
+    monkeypatch.setattr(utils, "pypi_index_file_trv", index_file)
+    monkeypatch.setattr(utils, "pypi_index_filter_file_trv", filter_file)
+    monkeypatch.setattr(utils, "pypi_index_lock_file_trv", lock_file)
+    monkeypatch.setattr(utils, "pypi_index_delta_file_trv", delta_file)
+    monkeypatch.setattr(utils, "project_count_file_trv", count_file)
+    monkeypatch.setattr(utils, "index_meta_file_trv", meta_file)
+
+    yield index_file, count_file, meta_file
+
+    for file in (index_file, count_file, meta_file, filter_file, lock_file, delta_file):
+        file.unlink(missing_ok=True)
+
+
+def test_generate_pypi_index(monkeypatch, index_files):
+    index_file, count_file, meta_file = index_files
+    monkeypatch.setattr(network, "get", my_custom_get)
+    utils.generate_pypi_index()
+
+    assert index_file.exists()
+    assert count_file.exists()
+    assert meta_file.exists()
+    assert (BASE_DIR / "pypi_index.filter").exists()
+    index_names = list(index.PyPIIndex(index_file))
+    assert index_names == sorted(index_names)
+    assert "pynavis" in index_names
+    assert "pyNAVIS" not in index_names
+    assert "simple index" not in index_names
+    assert len(index_names) == 15
+
+
+def test_generate_pypi_index_delta(monkeypatch, capsys, index_files):
+    index_file, count_file, meta_file = index_files
+    delta_file = BASE_DIR / "pypi_index.delta"
+    monkeypatch.setattr(network, "get", my_custom_get)
+    utils.generate_pypi_index()
+    assert not delta_file.exists()
+
+    # the same number of projects, one removed from PyPI and one added
+    previous_names = [name.encode() for name in index.PyPIIndex(index_file)]
+    previous_names[previous_names.index(b"pynavis")] = b"pynamer-removed"
+    index.write_index(index_file, previous_names)
+    utils.generate_pypi_index()
+
+    assert delta_file.read_bytes() == b"-pynamer-removed\n+pynavis\n"
+    assert "1 projects added and 1 projects removed" in capsys.readouterr().out
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/maps").exists(), reason="needs /proc/self/maps"
+)
+def test_generate_pypi_index_unmaps_before_replacing(monkeypatch, index_files):
+    index_file, count_file, meta_file = index_files
+    monkeypatch.setattr(network, "get", my_custom_get)
+    utils.generate_pypi_index()
+    shared_index = index.PyPIIndex(index_file)
+    monkeypatch.setattr(utils, "pypi_index", shared_index)
+    # both the previous index of the delta and the shared index map the file
+    assert "pynavis" in shared_index
+    mapped_when_written = []
+
+    def checked_write_index(index_file, *args):
+        maps = Path("/proc/self/maps").read_text()
+        mapped_when_written.append(str(index_file.resolve()) in maps)
+        return index.write_index(index_file, *args)
+
+    monkeypatch.setattr(utils, "write_index", checked_write_index)
+    utils.generate_pypi_index()
+    # Windows cannot rename the new index over a mapped one
+    assert mapped_when_written == [False]
+    assert "pynavis" in shared_index
+    shared_index.refresh()
+
+
+def test_generate_pypi_index_json(monkeypatch, index_files):
+    index_file, count_file, meta_file = index_files
+    sent_headers = {}
+
+    def get_json(url, headers=None, **kwargs):
+        sent_headers.update(headers)
+        return my_custom_get_json(url, **kwargs)
+
+    monkeypatch.setattr(network, "get", get_json)
+    utils.generate_pypi_index()
+
+    assert sent_headers["Accept"].startswith("application/vnd.pypi.simple.v1+json")
+    index_names = list(index.PyPIIndex(index_file))
+    assert index_names == sorted(index_names)
+    assert "pynavis" in index_names
+    assert len(index_names) == 15
+    assert utils.read_index_meta()["last_serial"] == "31000000"
+
+
+def test_generate_pypi_index_saves_validators(monkeypatch, index_files):
+    index_file, count_file, meta_file = index_files
+
+    def get_with_validators(url, **kwargs):
+        response = my_custom_get(url, **kwargs)
+        response.headers = requests.structures.CaseInsensitiveDict(
+            {
+                "ETag": '"abc123"',
+                "Last-Modified": "Sat, 17 Oct 2026 10:00:00 GMT",
+                "X-PyPI-Last-Serial": "31000000",
+            }
+        )
+        return response
+
+    monkeypatch.setattr(network, "get", get_with_validators)
+    utils.generate_pypi_index()
+
+    index_meta = utils.read_index_meta()
+    assert index_meta["etag"] == '"abc123"'
+    assert index_meta["last_modified"] == "Sat, 17 Oct 2026 10:00:00 GMT"
+    assert index_meta["last_serial"] == "31000000"
+    assert time.time() - index_meta["built_at"] < 60
+
+
+def test_generate_pypi_index_not_modified(monkeypatch, index_files):
+    index_file, count_file, meta_file = index_files
+    index.write_index(index_file, [b"pynball"])
+    index_bytes = index_file.read_bytes()
+    utils.write_index_meta(
+        {
+            "etag": '"abc123"',
+            "last_modified": "Sat, 17 Oct 2026 10:00:00 GMT",
+            "last_serial": "31000000",
+        }
     )
+    sent_headers = {}
+
+    def get_not_modified(url, headers=None, **kwargs):
+        sent_headers.update(headers)
+        response = requests.Response()
+        response.status_code = 304
+        response._content = b""
+        response._content_consumed = True
+        return response
+
+    monkeypatch.setattr(network, "get", get_not_modified)
+    utils.generate_pypi_index()
+
+    assert sent_headers["If-None-Match"] == '"abc123"'
+    assert sent_headers["If-Modified-Since"] == "Sat, 17 Oct 2026 10:00:00 GMT"
+    assert index_file.read_bytes() == index_bytes
+    assert not count_file.exists()
+    assert time.time() - utils.read_index_meta()["built_at"] < 60
+
+
+def test_generate_pypi_index_same_serial(monkeypatch, index_files):
+    index_file, count_file, meta_file = index_files
+    index.write_index(index_file, [b"pynball"])
+    index_bytes = index_file.read_bytes()
+    utils.write_index_meta({"last_serial": "31000000"})
+
+    def get_same_serial(url, **kwargs):
+        response = my_custom_get(url, **kwargs)
+        response.headers = {"X-PyPI-Last-Serial": "31000000"}
+        return response
+
+    monkeypatch.setattr(network, "get", get_same_serial)
     utils.generate_pypi_index()
 
-    assert (BASE_DIR / "pypi_index").exists()
-    assert (BASE_DIR / "project_count.pickle").exists()
-    (BASE_DIR / "pypi_index").unlink()
-    (BASE_DIR / "project_count.pickle").unlink()
+    assert index_file.read_bytes() == index_bytes
 
 
-def test_generate_pypi_index_error(monkeypatch, project_path_mock):
+def test_generate_pypi_index_error(monkeypatch, project_path_mock, index_files):
     def mock_requests_error(*args, **kwargs):
         raise ConnectTimeout("Connection timed out")
 
-    monkeypatch.setattr(requests, "get", mock_requests_error)
-    monkeypatch.setattr(utils, "pypi_index_file_trv", BASE_DIR / "pypi_index")
+    monkeypatch.setattr(network, "get", mock_requests_error)
 
     with pytest.raises(SystemExit) as excinfo:
         utils.generate_pypi_index()
@@ -5,11 +5,11 @@
 
 # Third party modules
 import pytest
-import requests
 from requests.exceptions import ConnectTimeout
 
 # First party modules
 import pynamer
+from pynamer import network
 
 BASE_DIR = Path(__file__).parents[0]
 
@@ -53,7 +53,7 @@ def json(self):
 
         return MockResponse()
 
-    monkeypatch.setattr(requests, "get", mock_get)
+    monkeypatch.setattr(network, "get", mock_get)
 
 
 def my_custom_get_found(url, **kwargs):
@@ -64,7 +64,7 @@ def my_custom_get_found(url, **kwargs):
 
 
 def test_github_meta_black(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get_found)
+    monkeypatch.setattr(network, "get", my_custom_get_found)
     result = pynamer.validators.github_meta("https://github.com/psf/black")
     assert result == expected_response_found
 
@@ -73,7 +73,7 @@ def test_ping_json_error(monkeypatch):
     def mock_requests_error(*args, **kwargs):
         raise ConnectTimeout("Connection timed out")
 
-    monkeypatch.setattr(requests, "get", mock_requests_error)
+    monkeypatch.setattr(network, "get", mock_requests_error)
 
     result = pynamer.validators.github_meta("https://github.com/psf/black")
     assert result == expected_response_http_error
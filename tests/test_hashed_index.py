@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Core Library modules
+from pathlib import Path
+
+# Third party modules
+import pytest
+
+# First party modules
+from pynamer import hashed_index, index, validators
+from pynamer.config import config
+
+np = pytest.importorskip("numpy")
+
+BASE_DIR = Path(__file__).parents[0]
+
+
+@pytest.fixture()
+def numpy_backend(monkeypatch, tmp_path):
+    resource_index = index.PyPIIndex(BASE_DIR / "resources" / "pypi_index")
+    tmp_hashed = hashed_index.HashedIndex(
+        tmp_path / "pypi_index.hashes.npy",
+        tmp_path / "pypi_index.names.npy",
+        resource_index,
+    )
+    monkeypatch.setattr(validators, "pypi_index", resource_index)
+    monkeypatch.setattr(validators, "hashed_index", tmp_hashed)
+    monkeypatch.setattr(config, "index_backend", "numpy")
+    yield tmp_hashed
+    tmp_hashed.refresh()
+    resource_index.refresh()
+
+
+def test_pypi_search_index_numpy(numpy_backend):
+    assert validators.pypi_search_index("pynball") is True
+    assert validators.pypi_search_index("PyAMI_core") is True
+    assert validators.pypi_search_index("pyama") is False
+    assert validators.pypi_search_index("zeedonk") is False
+    assert numpy_backend.hash_file.exists()
+
+
+def test_pypi_search_index_batch_numpy(numpy_backend):
+    project_names = ["zeedonk", "PynBall", "pyama", "pyamaha", "pyAMI_core"]
+    assert list(validators.pypi_search_index_batch(project_names)) == [
+        ("zeedonk", False),
+        ("PynBall", True),
+        ("pyama", False),
+        ("pyamaha", True),
+        ("pyAMI_core", True),
+    ]
+
+
+def test_pypi_index_lookup_numpy(numpy_backend):
+    assert validators.pypi_index_lookup(["PynBall", "pyAMI_core", "zeedonk"]) == {
+        "PynBall": "pynball",
+        "pyAMI_core": "pyami-core",
+        "zeedonk": None,
+    }
+
+
+def test_hashed_index_saved_as_npy(numpy_backend):
+    assert "pynball" in numpy_backend
+    table = np.load(numpy_backend.hash_file, mmap_mode="r")
+    assert tuple(table[0, :2].tolist()) == numpy_backend.names.key()
+    assert table.shape == (2, len(numpy_backend.names) + 2)
+    assert np.all(table[0, 3:] >= table[0, 2:-1])
+    blob = np.load(numpy_backend.names_file, mmap_mode="r")
+    assert len(blob) == table[1, -1]
+
+
+def test_hashed_index_hash_collision(monkeypatch, tmp_path):
+    def colliding_hashes(names):
+        return np.zeros(len(list(names)), dtype="<u8")
+
+    index_file = tmp_path / "pypi_index"
+    index.write_index(index_file, [b"pynball", b"zeedonk"])
+    tmp_index = index.PyPIIndex(index_file)
+    tmp_hashed = hashed_index.HashedIndex(
+        tmp_path / "pypi_index.hashes.npy", tmp_path / "pypi_index.names.npy", tmp_index
+    )
+    monkeypatch.setattr(hashed_index, "hash_names", colliding_hashes)
+    assert dict(tmp_hashed.contains_many(["pynball", "pyamaha", "zeedonk"])) == {
+        "pynball": True,
+        "pyamaha": False,
+        "zeedonk": True,
+    }
+    tmp_hashed.refresh()
+    tmp_index.refresh()
+
+
+@pytest.mark.parametrize("map_index_file", [True, False])
+def test_hashed_index_rebuilt_for_new_index(monkeypatch, tmp_path, map_index_file):
+    monkeypatch.setattr(hashed_index, "MAP_INDEX_FILE", map_index_file)
+    index_file = tmp_path / "pypi_index"
+    index.write_index(index_file, [b"pynball"])
+    tmp_index = index.PyPIIndex(index_file)
+    tmp_hashed = hashed_index.HashedIndex(
+        tmp_path / "pypi_index.hashes.npy", tmp_path / "pypi_index.names.npy", tmp_index
+    )
+    assert "zeedonk" not in tmp_hashed
+    assert isinstance(tmp_hashed._blob.base, np.memmap) is map_index_file
+
+    tmp_index.refresh()
+    index.write_index(index_file, [b"pynball", b"zeedonk"])
+    assert "zeedonk" in tmp_hashed
+    tmp_hashed.refresh()
+    tmp_index.refresh()
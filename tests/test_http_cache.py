@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Core Library modules
+import pickle
+import time
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from pynamer import network
+from pynamer.config import config
+from pynamer.http_cache import ResponseCache
+
+
+def make_response(status_code=200, content=b"{}"):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
+
+
+@pytest.fixture()
+def response_cache(tmp_path):
+    response_cache = ResponseCache(tmp_path / "http_cache.sqlite3", 1 << 20)
+    yield response_cache
+    response_cache.close()
+
+
+@pytest.fixture()
+def counted_get(monkeypatch):
+    sent = []
+
+    def session_get(self, url, **kwargs):
+        sent.append((url, kwargs.get("params")))
+        return make_response(content=f"body {len(sent)}".encode())
+
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    yield sent
+    network.close_sessions()
+
+
+def test_response_cache_round_trip(response_cache):
+    response_cache.put("https://pypi.org/pypi/pynball/json", make_response())
+    cached = response_cache.get("https://pypi.org/pypi/pynball/json", 60)
+    assert cached.status_code == 200
+    assert cached.content == b"{}"
+    assert response_cache.get("https://pypi.org/pypi/zeedonk/json", 60) is None
+    assert (response_cache.hits, response_cache.misses) == (1, 1)
+
+
+def test_response_cache_ttl(response_cache, monkeypatch):
+    response_cache.put("https://pypi.org/search/?q=pynball", make_response())
+    later = time.time() + 120
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert response_cache.get("https://pypi.org/search/?q=pynball", 60) is None
+    assert response_cache.get("https://pypi.org/search/?q=pynball", 600) is not None
+
+
+def test_response_cache_statuses(response_cache):
+    response_cache.put("https://pypi.org/pypi/zeedonk/json", make_response(404))
+    response_cache.put("https://pypi.org/pypi/pynball/json", make_response(503))
+    assert response_cache.get("https://pypi.org/pypi/zeedonk/json", 60) is not None
+    assert response_cache.get("https://pypi.org/pypi/pynball/json", 60) is None
+
+
+def test_response_cache_lru_eviction(tmp_path, monkeypatch):
+    body = bytes(700)
+    size = len(pickle.dumps(make_response(content=body)))
+    # room for three responses
+    response_cache = ResponseCache(tmp_path / "http_cache.sqlite3", 3 * size + 10)
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(time, "time", lambda: next(clock))
+    for name in ("a", "b", "c"):
+        response_cache.put(f"https://pypi.org/{name}", make_response(content=body))
+    # using 'a' makes 'b' the least recently used
+    assert response_cache.get("https://pypi.org/a", 60) is not None
+    response_cache.put("https://pypi.org/d", make_response(content=body))
+    assert response_cache.get("https://pypi.org/b", 60) is None
+    assert response_cache.get("https://pypi.org/a", 60) is not None
+    assert response_cache.get("https://pypi.org/d", 60) is not None
+    response_cache.close()
+
+
+def test_get_cached_by_url_and_params(counted_get):
+    url = "https://pypi.org/search/"
+    first = network.get(url, ttl=60, params={"q": "pynball", "page": 1})
+    again = network.get(url, ttl=60, params={"q": "pynball", "page": 1})
+    other = network.get(url, ttl=60, params={"q": "pynamer", "page": 1})
+    assert first.content == again.content == b"body 1"
+    assert other.content == b"body 2"
+    assert len(counted_get) == 2
+    assert (network.response_cache.hits, network.response_cache.misses) == (1, 2)
+
+
+def test_get_bypass_and_refresh(monkeypatch, counted_get):
+    url = "https://pypi.org/pypi/pynball/json"
+    network.get(url, ttl=60)
+    monkeypatch.setattr(config, "http_cache_bypass", True)
+    assert network.get(url, ttl=60).content == b"body 2"
+    assert network.get(url, ttl=60).content == b"body 3"
+    monkeypatch.setattr(config, "http_cache_bypass", False)
+    # the bypassed responses were not stored
+    assert network.get(url, ttl=60).content == b"body 1"
+    monkeypatch.setattr(config, "http_cache_refresh", True)
+    assert network.get(url, ttl=60).content == b"body 4"
+    monkeypatch.setattr(config, "http_cache_refresh", False)
+    assert network.get(url, ttl=60).content == b"body 4"
+    assert len(counted_get) == 4
+    assert (network.response_cache.hits, network.response_cache.misses) == (2, 2)
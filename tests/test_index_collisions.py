@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# First party modules
+from pynamer import index, validators
+
+
+def test_pypi_index_collisions(resource_index):
+    collisions = validators.pypi_index_collisions(
+        ["PyNBall", "pyAMI_core", "pyami.core", "pynball", "zeedonk", "Zee_Donk"]
+    )
+    assert collisions == {
+        "PyNBall": "pynball",
+        "pyAMI_core": "pyami-core",
+        "pyami.core": "pyami-core",
+        "pynball": "pynball",
+    }
+
+
+def test_pypi_index_collisions_empty(resource_index):
+    assert validators.pypi_index_collisions([]) == {}
+
+
+def test_pypi_index_collisions_no_names_no_index(mocker, tmp_path, monkeypatch):
+    generate = mocker.patch.object(validators, "generate_pypi_index")
+    monkeypatch.setattr(validators, "pypi_index", index.PyPIIndex(tmp_path / "none"))
+    assert validators.pypi_index_collisions([]) == {}
+    generate.assert_not_called()
+
+
+def test_pypi_index_lookup_one_pass(mocker, resource_index):
+    merge_spy = mocker.spy(resource_index, "_merge")
+    matches = validators.pypi_index_lookup(["PyNBall", "pyami.core", "zeedonk"])
+    assert matches == {
+        "PyNBall": "pynball",
+        "pyami.core": "pyami-core",
+        "zeedonk": None,
+    }
+    assert merge_spy.call_count == 1
+
+
+def test_index_collisions_single_pass(mocker, tmp_path):
+    index_file = tmp_path / "pypi_index"
+    filter_file = tmp_path / "pypi_index.filter"
+    names = [f"project-{i:05d}".encode() for i in range(1000)]
+    index.write_index(index_file, names, filter_file)
+    tmp_index = index.PyPIIndex(index_file, filter_file)
+    block_spy = mocker.spy(tmp_index, "_block")
+    candidates = [f"Project_{i:05d}" for i in range(0, 2000, 3)]
+    collisions = list(tmp_index.collisions(reversed(candidates)))
+
+    assert collisions == [
+        (f"Project_{i:05d}", f"project-{i:05d}") for i in range(0, 1000, 3)
+    ]
+    block_numbers = [call.args[0] for call in block_spy.call_args_list]
+    assert block_numbers == sorted(set(block_numbers))
+    tmp_index.refresh()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# First party modules
+from pynamer import index
+
+
+def test_diff_names():
+    previous = [b"alpha", b"beta", b"delta", b"omega"]
+    current = [b"alpha", b"gamma", b"delta", b"zeta"]
+    assert list(index.diff_names(previous, sorted(current))) == [
+        (b"-", b"beta"),
+        (b"+", b"gamma"),
+        (b"-", b"omega"),
+        (b"+", b"zeta"),
+    ]
+
+
+def test_diff_names_repeated_and_empty():
+    names = [b"alpha", b"alpha", b"beta"]
+    assert list(index.diff_names(names, [b"alpha", b"beta", b"beta"])) == []
+    assert list(index.diff_names([], names)) == [(b"+", b"alpha"), (b"+", b"beta")]
+    assert list(index.diff_names(names, [])) == [(b"-", b"alpha"), (b"-", b"beta")]
+
+
+def test_write_delta(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    delta_file = tmp_path / "pypi_index.delta"
+    previous = [f"project{i:05d}".encode() for i in range(0, 1000, 2)]
+    current = [f"project{i:05d}".encode() for i in range(0, 1000, 3)]
+    index.write_index(index_file, previous.copy())
+    previous_index = index.PyPIIndex(index_file)
+
+    added, removed = index.write_delta(
+        delta_file, previous_index.iter_encoded(), current
+    )
+
+    assert added == len(set(current) - set(previous))
+    assert removed == len(set(previous) - set(current))
+    lines = delta_file.read_bytes().splitlines()
+    assert len(lines) == added + removed
+    assert b"+project00003" in lines
+    assert b"-project00002" in lines
+    assert [line[1:] for line in lines] == sorted(line[1:] for line in lines)
+    previous_index.refresh()
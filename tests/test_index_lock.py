@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Core Library modules
+import threading
+import time
+
+# Third party modules
+import pytest
+
+# First party modules
+from pynamer import index, network, utils
+from pynamer.config import config
+
+
+def no_get(url, **kwargs):
+    raise AssertionError("the simple index should not be downloaded")
+
+
+@pytest.fixture()
+def index_files(monkeypatch, tmp_path):
+    index_file = tmp_path / "pypi_index"
+    lock_file = tmp_path / "pypi_index.lock"
+    tmp_index = index.PyPIIndex(index_file)
+    monkeypatch.setattr(utils, "pypi_index_file_trv", index_file)
+    monkeypatch.setattr(utils, "pypi_index_lock_file_trv", lock_file)
+    monkeypatch.setattr(utils, "pypi_index", tmp_index)
+    monkeypatch.setattr(network, "get", no_get)
+    return index_file, lock_file, tmp_index
+
+
+def test_index_lock_is_exclusive(tmp_path):
+    lock_file = tmp_path / "pypi_index.lock"
+    first_lock = index.IndexLock(lock_file)
+    second_lock = index.IndexLock(lock_file)
+    assert first_lock.acquire() is True
+    assert second_lock.acquire() is False
+    first_lock.release()
+    assert second_lock.acquire() is True
+    second_lock.release()
+
+
+def test_generate_pypi_index_lock_held_uses_snapshot(index_files, capsys):
+    index_file, lock_file, tmp_index = index_files
+    index.write_index(index_file, [b"pynball"])
+    other_process = index.IndexLock(lock_file)
+    other_process.acquire()
+    try:
+        utils.generate_pypi_index()
+    finally:
+        other_process.release()
+    assert "being updated by another process" in capsys.readouterr().out
+    assert "pynball" in tmp_index
+
+
+def test_generate_pypi_index_lock_held_not_stale(monkeypatch, index_files):
+    index_file, lock_file, tmp_index = index_files
+    index.write_index(index_file, [b"pynball"])
+    monkeypatch.setattr(config, "index_ttl", 3600)
+    monkeypatch.setattr(config, "index_built_at", 0.0)
+    other_process = index.IndexLock(lock_file)
+    other_process.acquire()
+    try:
+        utils.generate_pypi_index()
+    finally:
+        other_process.release()
+    assert utils.index_is_stale() is False
+
+
+def test_generate_pypi_index_waits_for_other_process(monkeypatch, index_files):
+    index_file, lock_file, tmp_index = index_files
+    monkeypatch.setattr(config, "index_lock_timeout", 10)
+    other_process = index.IndexLock(lock_file)
+    other_process.acquire()
+
+    def build_index():
+        time.sleep(0.2)
+        index.write_index(index_file, [b"pynball"])
+        other_process.release()
+
+    builder = threading.Thread(target=build_index)
+    builder.start()
+    utils.generate_pypi_index()
+    builder.join()
+    assert "pynball" in tmp_index
+
+
+def test_generate_pypi_index_lock_timeout(monkeypatch, index_files):
+    index_file, lock_file, tmp_index = index_files
+    monkeypatch.setattr(config, "index_lock_timeout", 0)
+    other_process = index.IndexLock(lock_file)
+    other_process.acquire()
+    try:
+        with pytest.raises(SystemExit) as e:
+            utils.generate_pypi_index()
+    finally:
+        other_process.release()
+    assert "Timed out waiting" in str(e.value)
+    assert not index_file.exists()
+
+
+def test_write_index_failure_keeps_old_index(monkeypatch, tmp_path):
+    index_file = tmp_path / "pypi_index"
+    index.write_index(index_file, [b"pynball"])
+    old_bytes = index_file.read_bytes()
+
+    def broken_encode_block(names):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(index, "_encode_block", broken_encode_block)
+    with pytest.raises(OSError):
+        index.write_index(index_file, [b"pynamer"])
+    assert index_file.read_bytes() == old_bytes
+    assert list(tmp_path.iterdir()) == [index_file]
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# First party modules
+from pynamer import index, pynamer
+
+
+def test_pypi_search_prefix(resource_index):
+    expected = [name for name in resource_index if name.startswith("pyam")]
+    assert "pyamaha" in expected
+    assert list(pynamer.pypi_search_prefix("pyam")) == expected
+
+
+def test_pypi_search_prefix_normalized(resource_index):
+    assert list(pynamer.pypi_search_prefix("PyAMI_c")) == list(
+        pynamer.pypi_search_prefix("pyami-c")
+    )
+    assert "pyami-core" in pynamer.pypi_search_prefix("PyAMI_c")
+
+
+def test_pypi_search_prefix_no_match(resource_index):
+    assert list(pynamer.pypi_search_prefix("zeedonk")) == []
+    assert list(pynamer.pypi_search_prefix("0000")) == []
+
+
+def test_index_startswith_block_boundaries(mocker, tmp_path):
+    index_file = tmp_path / "pypi_index"
+    names = [f"project{i:05d}".encode() for i in range(1000)]
+    index.write_index(index_file, names.copy())
+    tmp_index = index.PyPIIndex(index_file)
+    assert list(tmp_index.startswith("project001")) == [
+        f"project{i:05d}" for i in range(100, 200)
+    ]
+    assert len(list(tmp_index.startswith("project"))) == 1000
+    assert list(tmp_index.startswith("project00999")) == ["project00999"]
+
+    block_spy = mocker.spy(tmp_index, "_block")
+    matches = tmp_index.startswith("project0050")
+    assert next(matches) == "project00500"
+    assert len(block_spy.call_args_list) == 1
+    tmp_index.refresh()
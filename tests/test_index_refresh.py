@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Core Library modules
+import time
+from pathlib import Path
+
+# Third party modules
+import pytest
+
+# First party modules
+from pynamer import index, utils, validators
+from pynamer.config import config
+
+BASE_DIR = Path(__file__).parents[0]
+
+
+@pytest.fixture()
+def tmp_index(monkeypatch, tmp_path):
+    index_file = tmp_path / "pypi_index"
+    index.write_index(index_file, [b"pynball"])
+    tmp_index = index.PyPIIndex(index_file)
+    monkeypatch.setattr(validators, "pypi_index", tmp_index)
+    yield tmp_index
+    tmp_index.refresh()
+
+
+@pytest.fixture()
+def popen_calls(monkeypatch):
+    calls = []
+
+    def mock_popen(args, **kwargs):
+        calls.append(args)
+        return "_popen was called"
+
+    monkeypatch.setattr(utils.subprocess, "Popen", mock_popen)
+    monkeypatch.setattr(utils, "_background_refresh", None)
+    return calls
+
+
+def test_index_is_stale(monkeypatch):
+    monkeypatch.setattr(config, "index_ttl", 3600)
+    monkeypatch.setattr(config, "index_built_at", time.time() - 7200)
+    assert utils.index_is_stale() is True
+    monkeypatch.setattr(config, "index_built_at", time.time() - 60)
+    assert utils.index_is_stale() is False
+    monkeypatch.setattr(config, "index_ttl", 0)
+    monkeypatch.setattr(config, "index_built_at", 0.0)
+    assert utils.index_is_stale() is False
+
+
+def test_stale_index_refreshed_in_background(monkeypatch, tmp_index, popen_calls):
+    monkeypatch.setattr(config, "index_ttl", 3600)
+    monkeypatch.setattr(config, "index_built_at", time.time() - 7200)
+
+    assert validators.pypi_search_index("pynball") is True
+    assert validators.pypi_search_index("zeedonk") is False
+    assert len(popen_calls) == 1
+    assert popen_calls[0][1:] == ["-c", utils.REFRESH_INDEX_COMMAND]
+
+
+def test_fresh_index_not_refreshed(monkeypatch, tmp_index, popen_calls):
+    monkeypatch.setattr(config, "index_ttl", 3600)
+    monkeypatch.setattr(config, "index_built_at", time.time())
+
+    assert validators.pypi_search_index("pynball") is True
+    assert popen_calls == []
+
+
+@pytest.mark.parametrize("map_index_file", [True, False])
+def test_replaced_index_swapped_in(monkeypatch, tmp_index, map_index_file):
+    monkeypatch.setattr(index, "MAP_INDEX_FILE", map_index_file)
+    assert validators.pypi_search_index("zeedonk") is False
+    # on Windows the file is read, not mapped, so it can be renamed over
+    assert isinstance(tmp_index._buffer, bytes) is not map_index_file
+    index.write_index(tmp_index.index_file, [b"pynball", b"zeedonk"])
+    assert validators.pypi_search_index("zeedonk") is True
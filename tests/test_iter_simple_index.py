@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# Core Library modules
+import pickle
+from pathlib import Path
+
+# First party modules
+from pynamer import index
+
+BASE_DIR = Path(__file__).parents[0]
+
+expected_names = [
+    b"pynavigator",
+    b"pynavio",
+    b"pynavis",
+    b"pynavmesh",
+    b"pynavt",
+    b"pynb",
+    b"pynb2docker",
+    b"pynba",
+    b"pynbaapi",
+    b"pynball",
+    b"py-nba-stats",
+    b"pynbcache",
+    b"pynb-dag-runner",
+    b"pynb-dag-runner-snapshot",
+    b"pynb-dag-runner-webui",
+]
+
+
+def simple_index_content(file_name="simple_index.pickle"):
+    _pickle_file = BASE_DIR / "resources" / file_name
+    return pickle.loads(_pickle_file.read_bytes()).content
+
+
+def test_iter_simple_index():
+    content = simple_index_content()
+    names = [name for names in index.iter_simple_index([content]) for name in names]
+    assert names == expected_names
+
+
+def test_iter_simple_index_split_chunks():
+    content = simple_index_content()
+    for chunk_size in (1, 7, 64, 100):
+        chunks = [
+            content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+        ]
+        names = [name for names in index.iter_simple_index(chunks) for name in names]
+        assert names == expected_names
+
+
+def test_iter_simple_index_json_split_chunks():
+    content = simple_index_content("simple_index_json.pickle")
+    for chunk_size in (1, 7, 64, len(content)):
+        chunks = [
+            content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+        ]
+        names = [
+            name for names in index.iter_simple_index_json(chunks) for name in names
+        ]
+        assert names == expected_names
+
+
+def test_parse_last_serial():
+    content = simple_index_content("simple_index_json.pickle")
+    assert index.parse_last_serial(content[:100]) == "31000000"
+    assert index.parse_last_serial(simple_index_content()) is None
+
+
+def test_normalize_block():
+    block = b"Foo_Bar\nfoo.bar\npyNAVIS\na--b__c\nA-_.B"
+    assert index.normalize_block(block) == b"foo-bar\nfoo-bar\npynavis\na-b-c\na-b"
+
+
+def test_write_index(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    count = index.write_index(index_file, [b"pynball", b"foo-bar", b"a", b"foo-bar"])
+    assert count == 3
+    assert list(index.PyPIIndex(index_file)) == ["a", "foo-bar", "pynball"]
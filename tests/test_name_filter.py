@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Core Library modules
+from pathlib import Path
+
+# Third party modules
+import pytest
+
+# First party modules
+from pynamer import index
+
+BASE_DIR = Path(__file__).parents[0]
+
+names = [f"project{i:05d}".encode() for i in range(5000)]
+
+
+@pytest.fixture()
+def filtered_index(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    filter_file = tmp_path / "pypi_index.filter"
+    index.write_index(index_file, names.copy(), filter_file)
+    filtered_index = index.PyPIIndex(index_file, filter_file)
+    yield filtered_index
+    filtered_index.refresh()
+
+
+def test_name_filter_no_false_negatives():
+    name_filter = index.NameFilter.build(names, (len(names), 0))
+    assert all(name in name_filter for name in names)
+
+
+def test_name_filter_false_positive_rate():
+    name_filter = index.NameFilter.build(names, (len(names), 0))
+    absent = [b"".join([name, b"-absent"]) for name in names]
+    false_positives = sum(name in name_filter for name in absent)
+    assert false_positives / len(absent) < 0.03
+
+
+def test_name_filter_round_trip():
+    name_filter = index.NameFilter.build(names, (5000, 1234))
+    loaded = index.NameFilter.from_bytes(name_filter.to_bytes())
+    assert loaded.matches(5000, 1234)
+    assert not loaded.matches(5000, 1235)
+    assert loaded.words == name_filter.words
+    assert index.NameFilter.from_bytes(b"not a filter") is None
+
+
+def test_pypi_index_filter_negative_skips_index(monkeypatch, filtered_index):
+    assert "project00042" in filtered_index
+    assert filtered_index._filter is not None
+
+    def block_not_expected(*args, **kwargs):
+        raise AssertionError("the index should not be searched")
+
+    monkeypatch.setattr(filtered_index, "_block", block_not_expected)
+    definite_negatives = [
+        name
+        for name in (f"absent{i}" for i in range(100))
+        if name.encode() not in filtered_index._filter
+    ]
+    assert definite_negatives
+    assert not any(name in filtered_index for name in definite_negatives)
+
+
+def test_pypi_index_stale_filter_ignored(tmp_path, filtered_index):
+    filtered_index.refresh()
+    index.write_index(filtered_index.index_file, [b"zeedonk"])
+    assert "zeedonk" in filtered_index
+    assert filtered_index._filter is None
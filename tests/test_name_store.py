@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# Third party modules
+import pytest
+
+# First party modules
+from pynamer import index
+
+names = sorted([b"ab", b"abc", b"abd", b"b", b"ba", b"pynamer", b"pynamer-ng"])
+
+
+def test_name_store_sequence():
+    store = index.NameStore.from_names(names)
+    assert len(store) == len(names)
+    assert list(store) == names
+    assert store[0] == b"ab"
+    assert store[-1] == b"pynamer-ng"
+    with pytest.raises(IndexError):
+        store[len(names)]
+    assert len(store.blob) == sum(map(len, names))
+
+
+def test_name_store_contains():
+    store = index.NameStore.from_names(names)
+    assert all(name in store for name in names)
+    assert b"a" not in store
+    assert b"abcd" not in store
+    assert b"zzz" not in store
+    assert "ab" not in store
+    assert b"ab" not in index.NameStore.from_names([])
+
+
+def test_name_store_startswith():
+    store = index.NameStore.from_names(names)
+    assert list(store.startswith(b"ab")) == [b"ab", b"abc", b"abd"]
+    assert list(store.startswith(b"abc")) == [b"abc"]
+    # the prefix must not run on into the next name in the blob
+    assert list(store.startswith(b"abb")) == []
+    assert list(store.startswith(b"pynamer-")) == [b"pynamer-ng"]
+    assert list(store.startswith(b"")) == names
+
+
+def test_name_store_bisect():
+    store = index.NameStore.from_names(names)
+    assert store.bisect_left(b"abc") == 1
+    assert store.bisect_right(b"abc") == 2
+    assert store.bisect_left(b"a") == 0
+    assert store.bisect_right(b"zzz") == len(names)
+
+
+def test_name_store_slots():
+    store = index.NameStore.from_names(names)
+    with pytest.raises(AttributeError):
+        store.names = names
+
+
+def test_index_load_names(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    block_names = [f"project{i:05d}".encode() for i in range(1000)]
+    index.write_index(index_file, block_names.copy())
+    tmp_index = index.PyPIIndex(index_file)
+    store = tmp_index.load_names()
+    assert list(store) == block_names
+    assert b"project00500" in store
+    assert b"project01000" not in store
+    tmp_index.refresh()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from pynamer import network
+from pynamer.config import config
+
+
+@pytest.fixture()
+def sessions():
+    network.close_sessions()
+    yield network._sessions
+    network.close_sessions()
+
+
+def test_session_per_host(sessions):
+    pypi = network.session_for("https://pypi.org/pypi/pynamer/json")
+    assert network.session_for("https://pypi.org/simple/") is pypi
+    github = network.session_for("https://api.github.com/repos/psf/black")
+    assert github is not pypi
+    assert len(sessions) == 2
+
+
+def test_session_pool(monkeypatch, sessions):
+    monkeypatch.setattr(config, "http_pool_size", 4)
+    session = network.session_for("https://pypi.org/")
+    adapter = session.get_adapter("https://pypi.org/")
+    assert adapter._pool_maxsize == 4
+    # retries are made by network.get, not by urllib3
+    assert adapter.max_retries.total == 0
+    assert session.headers["User-Agent"].startswith("pynamer/")
+
+
+def test_get_uses_shared_session(monkeypatch, sessions):
+    used = []
+
+    def session_get(self, url, **kwargs):
+        used.append(self)
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    network.get("https://pypi.org/pypi/pynamer/json", timeout=5)
+    network.get("https://pypi.org/pypi/pynball/json", timeout=5)
+    assert len(used) == 2
+    assert used[0] is used[1] is network.session_for("https://pypi.org/")
+
+
+def test_close_sessions(sessions):
+    network.session_for("https://pypi.org/")
+    network.close_sessions()
+    assert sessions == {}
+
+
+def test_head_cached_apart_from_get(monkeypatch, sessions):
+    sent = []
+
+    def answer(method):
+        def send(self, url, **kwargs):
+            sent.append(method)
+            response = requests.Response()
+            response.status_code = 200
+            response._content = b"" if method == "HEAD" else b"{}"
+            return response
+
+        return send
+
+    monkeypatch.setattr(requests.Session, "get", answer("GET"))
+    monkeypatch.setattr(requests.Session, "head", answer("HEAD"))
+    url = "https://pypi.org/pypi/pynamer/json"
+    assert network.head(url, ttl=60).content == b""
+    assert network.get(url, ttl=60).content == b"{}"
+    assert network.head(url, ttl=60).content == b""
+    assert sent == ["HEAD", "GET"]
@@ -5,11 +5,10 @@
 
 # Third party modules
 import pytest
-import requests
 from requests.exceptions import ConnectTimeout
 
 # First party modules
-from pynamer import pynamer, validators
+from pynamer import network, validators
 
 BASE_DIR = Path(__file__).parents[0]
 
@@ -65,14 +64,14 @@ def my_custom_get_not_found(url, **kwargs):
 
 
 def test_ping_json_found(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get_found)
-    result = pynamer.ping_json("pynball")
+    monkeypatch.setattr(network, "get", my_custom_get_found)
+    result = validators.ping_json("pynball")
     assert result == expected_response_found
 
 
 def test_ping_json_not_found(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get_not_found)
-    result = pynamer.ping_json("zeedonk")
+    monkeypatch.setattr(network, "get", my_custom_get_not_found)
+    result = validators.ping_json("zeedonk")
     assert result == ""
 
 
@@ -80,15 +79,15 @@ def test_ping_json_error(monkeypatch):
     def mock_requests_error(*args, **kwargs):
         raise ConnectTimeout("Connection timed out")
 
-    monkeypatch.setattr(requests, "get", mock_requests_error)
+    monkeypatch.setattr(network, "get", mock_requests_error)
 
     with pytest.raises(SystemExit) as excinfo:
-        pynamer.ping_json("pynball")
+        validators.ping_json("pynball")
     assert str(excinfo.value) == "A connection error occurred"
 
 
 def test_ping_json_found_stats1(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get_found)
+    monkeypatch.setattr(network, "get", my_custom_get_found)
     monkeypatch.setattr(validators, "github_meta", return_stats)
-    result = pynamer.ping_json("pynball", stats=True)
+    result = validators.ping_json("pynball", stats=True)
     assert result == expected_response_found_stats
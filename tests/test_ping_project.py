@@ -9,7 +9,8 @@
 from requests.exceptions import ConnectTimeout
 
 # First party modules
-from pynamer import pynamer
+from pynamer import network, validators
+from pynamer.config import config
 
 BASE_DIR = Path(__file__).parents[0]
 
@@ -29,14 +30,16 @@ def my_custom_get_not_found(url, **kwargs):
 
 
 def test_ping_project_found(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get_found)
-    result = pynamer.ping_project("pynball")
+    monkeypatch.setattr(network, "get", my_custom_get_found)
+    monkeypatch.setattr(network, "head", my_custom_get_found)
+    result = validators.ping_project("pynball")
     assert result is True
 
 
 def test_ping_project_not_found(monkeypatch):
-    monkeypatch.setattr(requests, "get", my_custom_get_not_found)
-    result = pynamer.ping_project("zeedonk")
+    monkeypatch.setattr(network, "get", my_custom_get_not_found)
+    monkeypatch.setattr(network, "head", my_custom_get_not_found)
+    result = validators.ping_project("zeedonk")
     assert result is False
 
 
@@ -44,8 +47,94 @@ def test_ping_project_error(monkeypatch):
     def mock_requests_error(*args, **kwargs):
         raise ConnectTimeout("Connection timed out")
 
-    monkeypatch.setattr(requests, "get", mock_requests_error)
+    monkeypatch.setattr(network, "get", mock_requests_error)
+    monkeypatch.setattr(network, "head", mock_requests_error)
 
     with pytest.raises(SystemExit) as excinfo:
-        pynamer.ping_project("pynball")
+        validators.ping_project("pynball")
     assert str(excinfo.value) == "A connection error occurred"
+
+
+def json_found(requested, method):
+    def request(url, **kwargs):
+        requested.append((method, url))
+        _pickle_file = BASE_DIR / "resources" / "requests_get_json_pynball.pickle"
+        return pickle.loads(_pickle_file.read_bytes())
+
+    return request
+
+
+def test_ping_project_probes_then_json(monkeypatch):
+    requested = []
+    monkeypatch.setattr(network, "get", json_found(requested, "GET"))
+    monkeypatch.setattr(network, "head", json_found(requested, "HEAD"))
+    assert validators.ping_project("pynball") is True
+    # the document is only downloaded for the details
+    assert requested == [("HEAD", "https://pypi.org/pypi/pynball/json")]
+    assert validators.ping_json("pynball").startswith("Summary:  Utility")
+    assert requested[1:] == [("GET", "https://pypi.org/pypi/pynball/json")]
+
+
+def test_ping_project_with_details_fetch_once(monkeypatch):
+    requested = []
+    monkeypatch.setattr(network, "get", json_found(requested, "GET"))
+    monkeypatch.setattr(network, "head", json_found(requested, "HEAD"))
+    assert validators.ping_project("pynball", details=True) is True
+    assert validators.ping_json("pynball").startswith("Summary:  Utility")
+    # a name whose details are wanted is not probed first
+    assert requested == [("GET", "https://pypi.org/pypi/pynball/json")]
+
+
+def test_ping_project_then_json_fetch_once(monkeypatch):
+    requested = []
+    monkeypatch.setattr(config, "project_probe", "json")
+    monkeypatch.setattr(network, "get", json_found(requested, "GET"))
+    assert validators.ping_project("pynball") is True
+    assert validators.ping_json("pynball").startswith("Summary:  Utility")
+    assert requested == [("GET", "https://pypi.org/pypi/pynball/json")]
+
+    validators._fetch_project_json.cache_clear()
+    validators.ping_json("pynball")
+    assert len(requested) == 2
+
+
+def test_ping_project_head_not_allowed(monkeypatch):
+    def head_not_allowed(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 405
+        return response
+
+    requested = []
+    monkeypatch.setattr(network, "head", head_not_allowed)
+    monkeypatch.setattr(network, "get", json_found(requested, "GET"))
+    assert validators.ping_project("pynball") is True
+    assert requested == [("GET", "https://pypi.org/pypi/pynball/json")]
+
+
+def test_ping_project_throttled(monkeypatch):
+    def mock_throttled(url, **kwargs):
+        response = requests.Response()
+        response.status_code = 429
+        response.url = url
+        return response
+
+    monkeypatch.setattr(network, "get", mock_throttled)
+    monkeypatch.setattr(network, "head", mock_throttled)
+    with pytest.raises(SystemExit) as excinfo:
+        validators.ping_project("zeedonk")
+    assert str(excinfo.value) == "An HTTP error occurred."
+
+
+def test_fetch_project_json_throttled_not_kept(monkeypatch):
+    answers = [429, 200, 404]
+
+    def mock_get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = answers.pop(0)
+        return response
+
+    monkeypatch.setattr(network, "get", mock_get)
+    assert validators.fetch_project_json("zeedonk").status_code == 429
+    assert validators.fetch_project_json("zeedonk").status_code == 200
+    assert validators.fetch_project_json("zeedonk").status_code == 200
+    assert answers == [404]
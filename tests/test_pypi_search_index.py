@@ -1,17 +1,104 @@
 #!/usr/bin/env python3
 # Core Library modules
+import shutil
 from pathlib import Path
 
 # First party modules
-from pynamer import pynamer, validators
+from pynamer import index, pynamer, validators
 
 BASE_DIR = Path(__file__).parents[0]
 
 
-def test_pypi_search_index(monkeypatch):
+def test_pypi_search_index(monkeypatch, resource_index):
     monkeypatch.setattr(pynamer, "project_path", BASE_DIR / "resources")
-    monkeypatch.setattr(
-        validators, "pypi_index_file_trv", BASE_DIR / "resources" / "pypi_index"
-    )
-    assert pynamer.pypi_search_index("pynball") is True
-    assert pynamer.pypi_search_index("zeedonk") is False
+    assert validators.pypi_search_index("pynball") is True
+    assert validators.pypi_search_index("zeedonk") is False
+
+
+def test_pypi_search_index_exact_match_only(resource_index):
+    assert validators.pypi_search_index("pyamaha") is True
+    assert validators.pypi_search_index("pyama") is False
+    assert validators.pypi_search_index("pyamahaa") is False
+
+
+def test_pypi_search_index_normalized(resource_index):
+    assert validators.pypi_search_index("PyAmazonWebScraper") is True
+    assert validators.pypi_search_index("pyAMI_core") is True
+    assert validators.pypi_search_index("PynBall") is True
+
+
+def test_pypi_index_loaded_once(resource_index):
+    validators.pypi_search_index("pynball")
+    buffer = resource_index._buffer
+    for project_name in ("zeedonk", "pyamaha"):
+        validators.pypi_search_index(project_name)
+    assert resource_index._buffer is buffer
+
+
+def test_pypi_index_refresh(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    shutil.copy(BASE_DIR / "resources" / "pypi_index", index_file)
+    tmp_index = index.PyPIIndex(index_file)
+    assert "zeedonk" not in tmp_index
+
+    tmp_index.refresh()
+    index.write_index(index_file, [b"zeedonk", b"pynball"])
+    assert "zeedonk" in tmp_index
+    assert "pyamaha" not in tmp_index
+    tmp_index.refresh()
+
+
+def test_pypi_index_block_boundaries(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    names = [f"project{i:05d}".encode() for i in range(1000)]
+    assert index.write_index(index_file, names.copy()) == 1000
+    tmp_index = index.PyPIIndex(index_file)
+    assert len(tmp_index) == 1000
+    for i in (0, 127, 128, 129, 511, 512, 999):
+        assert f"project{i:05d}" in tmp_index
+    for absent in ("project", "aaa", "project01000", "zzz", "project00001a"):
+        assert absent not in tmp_index
+    assert list(tmp_index) == [name.decode() for name in names]
+    tmp_index.refresh()
+
+
+def test_pypi_index_old_format(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    index_file.write_text("pynball \nzeedonk \n")
+    assert index.PyPIIndex(index_file).exists() is False
+    assert index.is_index_file(tmp_path / "missing") is False
+
+
+def test_pypi_search_index_batch(resource_index):
+    project_names = ["zeedonk", "PynBall", "pyama", "pyamaha", "pyAMI_core"]
+    results = validators.pypi_search_index_batch(project_names)
+    assert next(results) == ("pyama", False)
+    assert dict(results) == {
+        "pyamaha": True,
+        "pyAMI_core": True,
+        "PynBall": True,
+        "zeedonk": False,
+    }
+
+
+def test_no_names_leave_the_index_alone(mocker, tmp_path, monkeypatch):
+    generate = mocker.patch.object(validators, "generate_pypi_index")
+    refresh = mocker.patch.object(validators, "refresh_index_in_background")
+    monkeypatch.setattr(validators, "pypi_index", index.PyPIIndex(tmp_path / "none"))
+    assert list(validators.pypi_search_index_batch([])) == []
+    assert validators.pypi_index_lookup([]) == {}
+    generate.assert_not_called()
+    refresh.assert_not_called()
+
+
+def test_index_contains_many_matches_contains(tmp_path):
+    index_file = tmp_path / "pypi_index"
+    filter_file = tmp_path / "pypi_index.filter"
+    names = [f"project{i:05d}".encode() for i in range(0, 2000, 2)]
+    index.write_index(index_file, names, filter_file)
+    tmp_index = index.PyPIIndex(index_file, filter_file)
+    candidates = [f"Project{i:05d}" for i in range(2001)] + ["aaa", "zzz", "project0"]
+    assert dict(tmp_index.contains_many(candidates)) == {
+        candidate: candidate in tmp_index for candidate in candidates
+    }
+    tmp_index.refresh()
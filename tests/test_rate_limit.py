@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# Core Library modules
+from concurrent.futures import ThreadPoolExecutor
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from pynamer import network, rate_limit, validators
+from pynamer.exceptions import RateLimited
+from pynamer.rate_limit import RateLimiter, TokenBucket
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(rate_limit.time, "sleep", clock.sleep)
+    return clock
+
+
+def test_bucket_burst_then_rate(clock):
+    bucket = TokenBucket(2, 1.0)
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+
+
+def test_bucket_refills_up_to_capacity(clock):
+    bucket = TokenBucket(2, 1.0)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_bucket_max_wait_takes_no_token(clock):
+    bucket = TokenBucket(1, 60.0)
+    assert bucket.reserve(10.0) == 0.0
+    assert bucket.reserve(10.0) is None
+    assert bucket.reserve() == 60.0
+
+
+def test_limiter_per_host(clock):
+    limiter = RateLimiter({"api.github.com": (1, 60.0)})
+    assert limiter.acquire("api.github.com") == 0.0
+    assert limiter.acquire("api.github.com") == 60.0
+    assert limiter.acquire("pypi.org") == 0.0
+    assert clock.slept == [60.0]
+
+
+def test_concurrent_workers_queue_in_turn(clock):
+    limiter = RateLimiter({"pypi.org": (1, 0.1)})
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        waits = sorted(executor.map(lambda _: limiter.acquire("pypi.org"), range(8)))
+    assert waits == pytest.approx([0.1 * n for n in range(8)])
+
+
+def test_get_acquires_before_sending(monkeypatch, clock):
+    sent = []
+
+    def session_get(self, url, **kwargs):
+        sent.append(url)
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    monkeypatch.setattr(network, "rate_limiter", RateLimiter({"pypi.org": (1, 2.0)}))
+    network.get("https://pypi.org/pypi/pynamer/json")
+    network.get("https://pypi.org/search/", params={"q": "pynamer"})
+    assert len(sent) == 2
+    assert clock.slept == [2.0]
+
+
+def test_github_stats_skipped_over_the_limit(monkeypatch, clock):
+    def session_get(self, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 404
+        return response
+
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    monkeypatch.setattr(
+        network, "rate_limiter", RateLimiter({"api.github.com": (1, 3600.0)})
+    )
+    assert "Does not exist" in validators.github_meta("https://github.com/psf/black")
+    with pytest.raises(RateLimited):
+        network.get("https://api.github.com/repos/psf/flake8")
+    stats = validators.github_meta("https://github.com/psf/isort")
+    assert stats.endswith("Skipped, the GitHub rate limit is used up")
+    assert clock.slept == []
+
+
+def test_bucket_update_holds_the_refill_until_the_reset(clock):
+    bucket = TokenBucket(55, 3600.0)
+    bucket.update(2, 600.0)
+    assert [bucket.reserve() for _ in range(2)] == [0.0, 0.0]
+    clock.now += 100
+    assert bucket.reserve(60.0) is None
+    assert bucket.reserve() == 500.0
+    clock.now += 500
+    # the count is reset, less the token reserved during the hold
+    assert [bucket.reserve() for _ in range(54)] == [0.0] * 54
+    assert bucket.reserve() == pytest.approx(3600.0 / 55)
+
+
+def test_bucket_update_keeps_fewer_tokens(clock):
+    bucket = TokenBucket(2, 1.0)
+    bucket.reserve()
+    bucket.update(50, 10.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 10.0
+
+
+def _github_response(status, remaining, reset_in):
+    response = requests.Response()
+    response.status_code = status
+    response.headers["X-RateLimit-Remaining"] = str(remaining)
+    response.headers["X-RateLimit-Reset"] = str(int(network.time.time() + reset_in))
+    return response
+
+
+def test_get_updates_the_bucket_from_the_headers(monkeypatch, clock):
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        lambda self, url, **kwargs: _github_response(200, 0, 1800),
+    )
+    monkeypatch.setattr(
+        network, "rate_limiter", RateLimiter({"api.github.com": (55, 3600.0)})
+    )
+    assert network.get("https://api.github.com/repos/psf/black").status_code == 200
+    with pytest.raises(RateLimited):
+        network.get("https://api.github.com/repos/psf/flake8")
+    assert clock.slept == []
+
+
+def test_github_stats_skipped_when_refused(monkeypatch, clock):
+    monkeypatch.setattr(
+        requests.Session,
+        "get",
+        lambda self, url, **kwargs: _github_response(403, 0, 1800),
+    )
+    monkeypatch.setattr(network, "rate_limiter", RateLimiter({}))
+    stats = validators.github_meta("https://github.com/psf/black")
+    assert stats.endswith("Skipped, the GitHub rate limit is used up")
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# Core Library modules
+import io
+import time
+from email.utils import formatdate
+
+# Third party modules
+import pytest
+import requests
+
+# First party modules
+from pynamer import engine, network, validators
+from pynamer.config import config
+from pynamer.exceptions import RequestFailed
+
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.raw = io.BytesIO(b"")
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture()
+def waits(monkeypatch):
+    slept = []
+    monkeypatch.setattr(network.time, "sleep", slept.append)
+    monkeypatch.setattr(config, "http_backoff", 0.5)
+    monkeypatch.setattr(config, "http_retries", 3)
+    return slept
+
+
+@pytest.fixture()
+def answers(monkeypatch):
+    queue = []
+
+    def session_get(self, url, **kwargs):
+        answer = queue.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr(requests.Session, "get", session_get)
+    return queue
+
+
+def test_backoff_grows_with_jitter(monkeypatch):
+    monkeypatch.setattr(config, "http_backoff", 0.5)
+    monkeypatch.setattr(config, "http_backoff_max", 3.0)
+    monkeypatch.setattr(network.random, "uniform", lambda low, high: high)
+    assert [network.backoff(attempt) for attempt in range(5)] == [
+        0.5,
+        1.0,
+        2.0,
+        3.0,
+        3.0,
+    ]
+
+
+def test_retry_after_seconds_and_date():
+    assert network.retry_after(make_response(429, {"Retry-After": "7"})) == 7
+    date = formatdate(time.time() + 60, usegmt=True)
+    delay = network.retry_after(make_response(503, {"Retry-After": date}))
+    assert 55 < delay <= 60
+    assert network.retry_after(make_response(503)) is None
+    assert network.retry_after(make_response(503, {"Retry-After": "soon"})) is None
+
+
+def test_retries_server_errors(waits, answers):
+    answers.extend([make_response(502), make_response(500), make_response(200)])
+    assert network.get("https://pypi.org/pypi/pynamer/json").status_code == 200
+    assert len(waits) == 2
+    assert waits[0] <= 0.5 and waits[1] <= 1.0
+
+
+def test_honors_retry_after(waits, answers):
+    answers.extend([make_response(429, {"Retry-After": "4"}), make_response(200)])
+    assert network.get("https://pypi.org/pypi/pynamer/json").status_code == 200
+    assert waits == [4.0]
+
+
+def test_retry_after_too_long_is_not_waited(monkeypatch, waits, answers):
+    monkeypatch.setattr(config, "http_retry_after_max", 60.0)
+    answers.append(make_response(503, {"Retry-After": "3600"}))
+    assert network.get("https://pypi.org/pypi/pynamer/json").status_code == 503
+    assert waits == []
+
+
+def test_gives_up_after_retries(waits, answers):
+    answers.extend([requests.ConnectionError("refused")] * 4)
+    with pytest.raises(requests.ConnectionError):
+        network.get("https://pypi.org/pypi/pynamer/json")
+    assert len(waits) == 3
+    assert answers == []
+
+
+def test_retry_budget_is_shared(monkeypatch, waits, answers):
+    monkeypatch.setattr(network, "retry_budget", network.RetryBudget(1))
+    answers.extend([make_response(503)] * 3)
+    assert network.get("https://pypi.org/pypi/pynamer/json").status_code == 503
+    assert network.get("https://pypi.org/pypi/pynball/json").status_code == 503
+    assert len(waits) == 1
+    assert network.retry_budget.remaining == 0
+
+
+def test_failed_name_does_not_stop_the_batch(monkeypatch):
+    def ping_project(project_name, details=False):
+        if project_name == "broken":
+            raise RequestFailed("A connection error occurred")
+        return False
+
+    monkeypatch.setattr(engine, "ping_project", ping_project)
+    monkeypatch.setattr(engine, "pypi_search", lambda name: ([], [], "0"))
+    validators._fetch_project_json.cache_clear()
+    results = engine.check_names(["broken", "pynamer"], jobs=2)
+    assert results["broken"].error == "A connection error occurred"
+    assert results["pynamer"].error == ""
+    assert engine.run_checks("broken").error == "A connection error occurred"
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# Core Library modules
+from pathlib import Path
+
+# Third party modules
+import pytest
+
+# First party modules
+from pynamer import index, pynamer, similarity, validators
+
+BASE_DIR = Path(__file__).parents[0]
+
+
+@pytest.fixture()
+def resource_trigrams(monkeypatch, tmp_path):
+    resource_index = index.PyPIIndex(BASE_DIR / "resources" / "pypi_index")
+    names = [name.encode() for name in resource_index if name.startswith("pya")]
+    resource_index.refresh()
+    index_file = tmp_path / "pypi_index"
+    index.write_index(index_file, [*names, b"pynball", b"pyn-ball", b"pydbal"])
+    tmp_index = index.PyPIIndex(index_file)
+    tmp_trigrams = similarity.TrigramIndex(tmp_path / "pypi_index.trigrams", tmp_index)
+    monkeypatch.setattr(validators, "pypi_index", tmp_index)
+    monkeypatch.setattr(validators, "trigram_index", tmp_trigrams)
+    yield tmp_trigrams
+    tmp_trigrams.refresh()
+    tmp_index.refresh()
+
+
+@pytest.mark.parametrize(
+    "first, second, expected",
+    [
+        (b"pynball", b"pynball", 0),
+        (b"pynball", b"pinball", 1),
+        (b"pynball", b"pynbal", 1),
+        (b"pynball", b"pyn-ball", 1),
+        (b"pynball", b"ypnball", 2),
+        (b"pynball", b"pyamaha", 3),
+        (b"", b"ab", 2),
+    ],
+)
+def test_edit_distance(first, second, expected):
+    assert similarity.edit_distance(first, second, 2) == expected
+    assert similarity.edit_distance(second, first, 2) == expected
+
+
+def test_trigrams():
+    assert similarity.trigrams(b"pyn") == {b"^py", b"pyn", b"yn$"}
+    assert similarity.trigrams(b"a") == {b"^a$"}
+
+
+def test_pypi_search_similar(resource_trigrams):
+    similar = pynamer.pypi_search_similar("pynbal")
+    assert ("pynball", 1) in similar
+    assert all(distance <= 2 for _, distance in similar)
+    assert len(similar) <= 10
+
+
+def test_pypi_search_similar_excludes_project(resource_trigrams):
+    similar = pynamer.pypi_search_similar("PynBall")
+    assert "pynball" not in [name for name, _ in similar]
+
+
+def test_pypi_search_similar_matches_linear_scan(resource_trigrams):
+    names = [name.encode() for name in resource_trigrams.names]
+    for query in ("pyamha", "pyapi", "pyadb", "zeedonk", "pyam", "pya"):
+        expected = sorted(
+            distance
+            for distance in (
+                similarity.edit_distance(query.encode(), name, 2) for name in names
+            )
+            if 0 < distance <= 2
+        )[:5]
+        similar = resource_trigrams.nearest(query, limit=5)
+        assert [distance for _, distance in similar] == expected
+
+
+def test_short_query_without_shared_trigrams(monkeypatch, tmp_path):
+    index_file = tmp_path / "pypi_index"
+    index.write_index(index_file, [b"abc", b"axc", b"nampy", b"numpy", b"numpy-x"])
+    tmp_index = index.PyPIIndex(index_file)
+    tmp_trigrams = similarity.TrigramIndex(tmp_path / "pypi_index.trigrams", tmp_index)
+    # 'nampy' is two edits from 'numpx' and shares none of its trigrams
+    assert tmp_trigrams.nearest("numpx") == [
+        ("numpy", 1),
+        ("nampy", 2),
+        ("numpy-x", 2),
+    ]
+    assert ("axc", 1) in tmp_trigrams.nearest("abc")
+    tmp_trigrams.refresh()
+    tmp_index.refresh()
+
+
+def test_trigram_index_saved(resource_trigrams):
+    resource_trigrams.nearest("pynbal")
+    assert resource_trigrams.trigram_file.exists()
+    resource_trigrams.refresh()
+    resource_trigrams.trigram_file.write_bytes(b"not a trigram index")
+    assert ("pynball", 1) in resource_trigrams.nearest("pynbal")
+
+
+def test_trigram_index_rebuilt_for_new_index(resource_trigrams):
+    assert resource_trigrams.nearest("zeedonks") == []
+    resource_trigrams.names.refresh()
+    index.write_index(resource_trigrams.names.index_file, [b"zeedonk", b"pynball"])
+    assert resource_trigrams.nearest("zeedonks") == [("zeedonk", 1)]
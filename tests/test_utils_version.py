@@ -5,12 +5,12 @@
 
 # Third party modules
 import pytest
-import requests
 from colorama import Back, Fore, Style
 from requests.exceptions import ConnectTimeout
 
 # First party modules
 import pynamer
+from pynamer import network
 
 BASE_DIR = Path(__file__).parents[0]
 
@@ -23,7 +23,7 @@ def my_custom_get_found(url, **kwargs):
 
 
 def test_utils_version_old(monkeypatch, capfd):
-    monkeypatch.setattr(requests, "get", my_custom_get_found)
+    monkeypatch.setattr(network, "get", my_custom_get_found)
     monkeypatch.setattr(pynamer, "__version__", "1.0.0")
     result = f"{Fore.YELLOW}{Back.BLACK}{Style.BRIGHT}1.0.0 : (There is a newer version available: 1.1.0){Style.RESET_ALL}\n"
     pynamer.utils.check_version()
@@ -32,7 +32,7 @@ def test_utils_version_old(monkeypatch, capfd):
 
 
 def test_utils_version(monkeypatch, capfd):
-    monkeypatch.setattr(requests, "get", my_custom_get_found)
+    monkeypatch.setattr(network, "get", my_custom_get_found)
     monkeypatch.setattr(pynamer, "__version__", "1.1.0")
     result = f"{Fore.GREEN}{Style.BRIGHT}1.1.0 : (You have the most recent version){Style.RESET_ALL}\n"
     pynamer.utils.check_version()
@@ -44,7 +44,7 @@ def test_ping_json_error(monkeypatch):
     def mock_requests_error(*args, **kwargs):
         raise ConnectTimeout("Connection timed out")
 
-    monkeypatch.setattr(requests, "get", mock_requests_error)
+    monkeypatch.setattr(network, "get", mock_requests_error)
     with pytest.raises(SystemExit) as excinfo:
         pynamer.utils.check_version()
     assert str(excinfo.value) == "A connection error occurred"
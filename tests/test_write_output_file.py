@@ -22,3 +22,10 @@ def test_write_output_file(monkeypatch):
     assert result_text == expected_text
 
     output_file.unlink()
+
+
+def test_write_output_file_error(tmp_path):
+    output_file = tmp_path / "output_file"
+    pynamer.write_output_file(str(output_file), {"pyball": [-1, 0, -1]})
+    line = output_file.read_text().splitlines()[-2]
+    assert line.split() == ["pyball", "Error", "Not", "Found", "Error", "Unknown"]
@@ -0,0 +1,112 @@
+"""Benchmark a fixed number of requests in flight against the adaptive limit.
+
+Serves the JSON API and search page for a set of synthetic names from a local
+stand-in that can only work on a few requests at once, as a busy PyPI can. A
+request beyond that capacity is answered '429 Too Many Requests' with a Retry-After
+of one second. Runs check_names() with a large --jobs, first with the adaptive limit
+turned off and then on, and counts the 429s, the names that could not be checked
+and any name given a wrong answer.
+
+    python tools/bench_adaptive.py [number_of_names] [capacity] [jobs]
+"""
+
+# Core Library modules
+import json
+import sys
+import threading
+import time
+
+# First party modules
+from pynamer import engine, network, validators
+from pynamer.config import config
+from standin_server import StandInServer, synthetic_names
+
+SEARCH_PAGE = b"<html><body><div>no results</div></body></html>"
+LATENCY = 0.05
+
+
+class BusyHost:
+    """Answers while it has capacity, throttles the requests beyond it."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.in_flight = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def route(self, answer):
+        def respond(handler):
+            with self.lock:
+                if self.in_flight >= self.capacity:
+                    self.throttled += 1
+                    return 429, {"Retry-After": "1"}, b"Too Many Requests"
+                self.in_flight += 1
+            try:
+                time.sleep(LATENCY)
+                return answer
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+        return respond
+
+
+def project_json(name):
+    info = {
+        "author": "bench",
+        "author_email": "bench@example.com",
+        "home_page": "",
+        "project_urls": None,
+        "summary": f"the {name} project",
+        "version": "1.0.0",
+    }
+    return json.dumps({"info": info, "urls": []}).encode("utf-8")
+
+
+def main(count, capacity, jobs):
+    names = synthetic_names(count)
+    host = BusyHost(capacity)
+    routes = {"/search/": host.route((200, {"Content-Type": "text/html"}, SEARCH_PAGE))}
+    for name in names[::2]:
+        routes[f"/pypi/{name}/json"] = host.route(
+            (200, {"Content-Type": "application/json"}, project_json(name))
+        )
+    with StandInServer(routes) as server:
+        config.pypi_json_url = f"{server.url}/pypi/"
+        config.pypi_search_url = f"{server.url}/search/"
+        config.index_ttl = 0
+        config.http_cache_bypass = True
+        print(f"{count} names, {capacity} requests at once, --jobs {jobs}")
+        for adaptive in (False, True):
+            config.concurrency_adaptive = adaptive
+            network.retry_budget = network.RetryBudget(config.http_retry_budget)
+            validators._fetch_project_json.cache_clear()
+            host.throttled = 0
+            start = time.perf_counter()
+            results = engine.check_names(names, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            errors = sum(1 for checks in results.values() if checks.error)
+            wrong = sum(
+                1
+                for index, name in enumerate(names)
+                if not results[name].error and results[name].found != (index % 2 == 0)
+            )
+            label = "adaptive" if adaptive else "fixed"
+            print(
+                f"{label:10}{elapsed:8.2f} s {host.throttled:6} throttled "
+                f"{errors:6} errors {wrong:6} wrong"
+            )
+            for limit in network.concurrency.limits():
+                print(
+                    f"{'':10}ended at {int(limit.limit)}, peak {int(limit.peak)}, "
+                    f"cut {limit.cuts} times"
+                )
+            network.close_sessions()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 8,
+        int(sys.argv[3]) if len(sys.argv) > 3 else 32,
+    )
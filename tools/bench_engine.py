@@ -0,0 +1,72 @@
+"""Benchmark checking a list of names one at a time against the concurrent engine.
+
+Serves the JSON API and search page for a set of synthetic names from a local
+stand-in that waits before answering every request, as a remote server would. Half
+of the names are taken. Times run_checks() on each name in turn, as main does
+without --jobs, and check_names() with several values of --jobs, and checks that
+every run gives the same results.
+
+    python tools/bench_engine.py [number_of_names] [latency_ms]
+"""
+
+# Core Library modules
+import json
+import sys
+import time
+
+# First party modules
+from pynamer import engine, network, validators
+from pynamer.config import config
+from standin_server import StandInServer, synthetic_names
+
+SEARCH_PAGE = b"<html><body><div>no results</div></body></html>"
+
+
+def project_json(name):
+    info = {
+        "author": "bench",
+        "author_email": "bench@example.com",
+        "home_page": "",
+        "project_urls": None,
+        "summary": f"the {name} project",
+        "version": "1.0.0",
+    }
+    return json.dumps({"info": info, "urls": []}).encode("utf-8")
+
+
+def main(count, latency):
+    names = synthetic_names(count)
+    routes = {"/search/": (200, {"Content-Type": "text/html"}, SEARCH_PAGE)}
+    for name in names[::2]:
+        routes[f"/pypi/{name}/json"] = (
+            200,
+            {"Content-Type": "application/json"},
+            project_json(name),
+        )
+    with StandInServer(routes, delay=latency / 1000) as server:
+        config.pypi_json_url = f"{server.url}/pypi/"
+        config.pypi_search_url = f"{server.url}/search/"
+        # every request goes to the stand-in, none is answered from the disk cache
+        config.http_cache_bypass = True
+        print(f"{count} names, {latency} ms a request")
+
+        start = time.perf_counter()
+        expected = {name: engine.run_checks(name) for name in names}
+        sequential = time.perf_counter() - start
+        print(f"{'one by one':12}{sequential:8.2f} s")
+
+        for jobs in (4, 16, 64):
+            validators._fetch_project_json.cache_clear()
+            start = time.perf_counter()
+            results = engine.check_names(names, jobs=jobs)
+            elapsed = time.perf_counter() - start
+            assert results == expected
+            print(f"{f'--jobs {jobs}':12}{elapsed:8.2f} s {sequential / elapsed:8.1f}x")
+    network.close_sessions()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
@@ -0,0 +1,66 @@
+"""Benchmark re-checking a shortlist of names with and without the response cache.
+
+Serves the JSON API and search page for a set of synthetic names from a local
+stand-in that waits before answering every request, as a remote server would, and
+checks the names twice in a row with the cache in a temporary directory. Reports the
+time of each run, the requests the stand-in served and the hits and misses of the
+cache.
+
+    python tools/bench_http_cache.py [number_of_names] [latency_ms]
+"""
+
+# Core Library modules
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from bench_engine import SEARCH_PAGE, project_json
+from pynamer import engine, network, validators
+from pynamer.config import config
+from pynamer.http_cache import ResponseCache
+from standin_server import StandInServer, synthetic_names
+
+
+def main(count, latency):
+    names = synthetic_names(count)
+    routes = {"/search/": (200, {"Content-Type": "text/html"}, SEARCH_PAGE)}
+    for name in names[::2]:
+        routes[f"/pypi/{name}/json"] = (
+            200,
+            {"Content-Type": "application/json"},
+            project_json(name),
+        )
+    with (
+        StandInServer(routes, delay=latency / 1000) as server,
+        tempfile.TemporaryDirectory() as tmp,
+    ):
+        config.pypi_json_url = f"{server.url}/pypi/"
+        config.pypi_search_url = f"{server.url}/search/"
+        network.response_cache = ResponseCache(
+            Path(tmp) / "http_cache.sqlite3", config.http_cache_size
+        )
+        print(f"{count} names, {latency} ms a request")
+        for label in ("first run", "second run"):
+            validators._fetch_project_json.cache_clear()
+            server.request_count = 0
+            cache = network.response_cache
+            cache.hits = cache.misses = 0
+            start = time.perf_counter()
+            for name in names:
+                engine.run_checks(name)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:12}{elapsed:8.2f} s{server.request_count:8} requests"
+                f"{cache.hits:8} hits{cache.misses:8} misses"
+            )
+        network.response_cache.close()
+    network.close_sessions()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 50,
+    )
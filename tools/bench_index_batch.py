@@ -0,0 +1,82 @@
+"""Benchmark checking a large batch of names against the index in one pass.
+
+Writes an index of synthetic names with its filter, then checks batches of candidate
+names name by name, through pypi_search_index() as main used to and directly with
+PyPIIndex.__contains__, and in one pass with PyPIIndex.contains_many().
+
+The scattered batches have one taken name in ten spread over the whole index, the
+clustered batches are taken names from one part of the index, such as a list of
+variations on one stem.
+
+    python tools/bench_index_batch.py [number_of_names]
+"""
+
+# Core Library modules
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer import validators
+from pynamer.config import config
+from pynamer.index import PyPIIndex, write_index
+from standin_server import synthetic_names
+
+
+def scattered(names, count, rng):
+    taken = rng.sample(names, min(len(names), count // 10))
+    absent = [f"{name}-{rng.choice(['ng', 'plus', 'lite'])}" for name in taken]
+    return taken + absent * 9
+
+
+def clustered(names, count, rng):
+    start = rng.randrange(max(1, len(names) - count + 1))
+    return names[start : start + count]
+
+
+def main(count):
+    rng = random.Random(503)
+    names = synthetic_names(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "pypi_index"
+        filter_file = Path(tmp) / "pypi_index.filter"
+        write_index(index_file, [name.encode() for name in names], filter_file)
+        pypi_index = PyPIIndex(index_file, filter_file)
+        pypi_index.key()
+        # search the benchmark index and never start a background refresh
+        validators.pypi_index = pypi_index
+        config.index_ttl = 0
+        print(f"{count} names in the index")
+        for batch_size, candidates in (
+            (10_000, scattered),
+            (100_000, scattered),
+            (10_000, clustered),
+            (100_000, clustered),
+        ):
+            batch = candidates(names, batch_size, rng)
+            # run both once untimed so neither pays for first touching the blocks
+            dict(pypi_index.contains_many(batch))
+            start = time.perf_counter()
+            searched = {name: validators.pypi_search_index(name) for name in batch}
+            searched_time = time.perf_counter() - start
+            start = time.perf_counter()
+            per_name = {name: name in pypi_index for name in batch}
+            per_name_time = time.perf_counter() - start
+            start = time.perf_counter()
+            merged = dict(pypi_index.contains_many(batch))
+            merged_time = time.perf_counter() - start
+            assert merged == per_name == searched
+            print(
+                f"{batch_size:7d} {candidates.__name__:9s}  "
+                f"pypi_search_index {searched_time:5.2f} s  "
+                f"__contains__ {per_name_time:5.2f} s  "
+                f"one pass {merged_time:5.2f} s  "
+                f"{searched_time / merged_time:5.1f}x"
+            )
+        pypi_index.refresh()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
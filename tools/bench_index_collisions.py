@@ -0,0 +1,53 @@
+"""Benchmark finding normalization collisions for a large wordlist in one pass.
+
+Writes an index of synthetic names with its filter, then checks a wordlist in which
+every other name is an existing name spelt with different case and separators,
+once name by name and once with PyPIIndex.collisions().
+
+    python tools/bench_index_collisions.py [number_of_names] [number_of_words]
+"""
+
+# Core Library modules
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer.index import PyPIIndex, write_index
+from standin_server import synthetic_names
+
+
+def main(count, word_count):
+    names = synthetic_names(count)
+    step = max(1, count // word_count)
+    words = []
+    for i, name in enumerate(names[::step][:word_count]):
+        words.append(name.upper().replace("-", "_") if i % 2 else f"{name}-new")
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "pypi_index"
+        filter_file = Path(tmp) / "pypi_index.filter"
+        write_index(index_file, [name.encode() for name in names], filter_file)
+        pypi_index = PyPIIndex(index_file, filter_file)
+        pypi_index.key()
+
+        start = time.perf_counter()
+        taken = [word for word in words if word in pypi_index]
+        per_name = time.perf_counter() - start
+        print(f"{len(words)} words against {count} names")
+        print(f"name by name    {per_name:8.2f} s")
+
+        start = time.perf_counter()
+        collisions = dict(pypi_index.collisions(words))
+        batch = time.perf_counter() - start
+        print(f"single pass     {batch:8.2f} s   {per_name / batch:.1f}x")
+        assert sorted(collisions) == sorted(taken)
+        print(f"collisions      {len(collisions):8d}")
+        pypi_index.refresh()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100_000,
+    )
@@ -0,0 +1,61 @@
+"""Benchmark negative lookups with and without the index name filter.
+
+Writes an index of synthetic names with its filter, then measures lookups per
+second for names that are not in the index, with and without the filter, and the
+false positive rate of the filter.
+
+    python tools/bench_index_filter.py [number_of_names] [number_of_lookups]
+"""
+
+# Core Library modules
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer.index import PyPIIndex, write_index
+from standin_server import synthetic_names
+
+
+def lookups_per_second(pypi_index, queries):
+    start = time.perf_counter()
+    found = sum(query in pypi_index for query in queries)
+    elapsed = time.perf_counter() - start
+    assert found == 0
+    return len(queries) / elapsed
+
+
+def main(count, lookups):
+    names = synthetic_names(count)
+    absent = [f"{name}-absent" for name in names[:: max(1, count // lookups)]]
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "pypi_index"
+        filter_file = Path(tmp) / "pypi_index.filter"
+        start = time.perf_counter()
+        write_index(index_file, [name.encode() for name in names], filter_file)
+        print(
+            f"{count} names, index and filter written in "
+            f"{time.perf_counter() - start:.2f} s"
+        )
+        print(f"filter size     {filter_file.stat().st_size / 1e6:10.2f} MB")
+
+        plain_index = PyPIIndex(index_file)
+        filtered_index = PyPIIndex(index_file, filter_file)
+        plain = lookups_per_second(plain_index, absent)
+        filtered = lookups_per_second(filtered_index, absent)
+        print(f"without filter  {plain:10.0f} lookups/s")
+        print(f"with filter     {filtered:10.0f} lookups/s")
+
+        name_filter = filtered_index._filter
+        false_positives = sum(name.encode() in name_filter for name in absent)
+        print(f"false positives {false_positives / len(absent):10.2%}")
+        plain_index.refresh()
+        filtered_index.refresh()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100_000,
+    )
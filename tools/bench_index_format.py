@@ -0,0 +1,56 @@
+"""Benchmark the size, cold start and lookup time of the binary index format.
+
+Writes the same synthetic project list as a plain sorted text file (the previous
+format) and with write_index, then reports the file sizes, the time to the first
+answer in a fresh PyPIIndex and the mean time of further lookups.
+
+    python tools/bench_index_format.py [number_of_names] [number_of_lookups]
+"""
+
+# Core Library modules
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer.index import PyPIIndex, write_index
+from standin_server import synthetic_names
+
+
+def main(count, lookups):
+    names = [name.encode() for name in synthetic_names(count)]
+    queries = [name.decode() for name in random.sample(names, lookups // 2)]
+    queries += [f"{query}-absent" for query in queries]
+    with tempfile.TemporaryDirectory() as tmp:
+        text_file = Path(tmp) / "pypi_index.txt"
+        text_file.write_bytes(b"\n".join(names) + b"\n")
+        index_file = Path(tmp) / "pypi_index"
+        start = time.perf_counter()
+        write_index(index_file, names)
+        write_time = time.perf_counter() - start
+
+        print(f"{count} names")
+        print(f"text file       {text_file.stat().st_size / 1e6:8.2f} MB")
+        print(f"binary index    {index_file.stat().st_size / 1e6:8.2f} MB")
+        print(f"write           {write_time:8.2f} s")
+
+        start = time.perf_counter()
+        pypi_index = PyPIIndex(index_file)
+        assert queries[0] in pypi_index
+        print(f"cold start      {(time.perf_counter() - start) * 1000:8.2f} ms")
+
+        start = time.perf_counter()
+        found = sum(query in pypi_index for query in queries)
+        elapsed = time.perf_counter() - start
+        assert found == len(queries) // 2
+        print(f"lookup          {elapsed / len(queries) * 1e6:8.2f} us")
+        pypi_index.refresh()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 10_000,
+    )
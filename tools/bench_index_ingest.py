@@ -0,0 +1,63 @@
+"""Benchmark index generation from the JSON and the HTML simple index.
+
+Serves the same synthetic project list from a local stand-in, once as a server that
+negotiates the PEP 691 JSON form and once as an HTML only server, and times a full
+generate_pypi_index against each.
+
+    python tools/bench_index_ingest.py [number_of_names]
+"""
+
+# Core Library modules
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer import utils
+from pynamer.config import config
+from pynamer.index import SIMPLE_JSON_CONTENT_TYPE, PyPIIndex
+from standin_server import (
+    StandInServer,
+    simple_index_html,
+    simple_index_json,
+    synthetic_names,
+)
+
+
+def main(count):
+    names = synthetic_names(count)
+    html_body = simple_index_html(names)
+    json_body = simple_index_json(names)
+
+    def negotiated(handler):
+        if SIMPLE_JSON_CONTENT_TYPE in handler.headers.get("Accept", ""):
+            return 200, {"Content-Type": SIMPLE_JSON_CONTENT_TYPE}, json_body
+        return 200, {"Content-Type": "text/html"}, html_body
+
+    servers = {
+        "json": {"/simple/": negotiated},
+        "html": {"/simple/": (200, {"Content-Type": "text/html"}, html_body)},
+    }
+    print(
+        f"{count} names, json {len(json_body) / 1e6:.1f} MB, "
+        f"html {len(html_body) / 1e6:.1f} MB"
+    )
+    for label, routes in servers.items():
+        with StandInServer(routes) as server, tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+            utils.pypi_index_file_trv = tmp_path / "pypi_index"
+            utils.project_count_file_trv = tmp_path / "project_count.pickle"
+            utils.index_meta_file_trv = tmp_path / "index_meta.pickle"
+            config.pypi_simple_index_url = f"{server.url}/simple/"
+            config.project_count = count
+
+            start = time.perf_counter()
+            utils.generate_pypi_index()
+            elapsed = time.perf_counter() - start
+            written = len(PyPIIndex(utils.pypi_index_file_trv))
+            print(f"{label:6}{elapsed:8.2f} s  {written} names")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
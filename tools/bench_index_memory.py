@@ -0,0 +1,98 @@
+"""Benchmark the peak memory of holding the whole index in memory.
+
+Writes the same synthetic project list as a plain sorted text file (the previous
+format) and with write_index, then loads it in a fresh interpreter for each way of
+holding it and reports the peak resident set size above that of the interpreter
+with pynamer imported:
+
+    text        the text file read into one str, as read_text did.
+    set         that str split into a set of names.
+    store       PyPIIndex.load_names(), a NameStore of one bytes blob and an
+                array of offsets.
+    index       the memory mapped PyPIIndex itself, after a batch of lookups.
+
+Each is followed by the same batch of lookups, the time of which is also reported.
+
+    python tools/bench_index_memory.py [number_of_names]
+"""
+
+# Core Library modules
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer.index import PyPIIndex, normalize_name, write_index
+from standin_server import synthetic_names
+
+HOLDERS = ["text", "set", "store", "index"]
+
+
+def peak_rss_mb():
+    status = Path("/proc/self/status")
+    if status.is_file():
+        # ru_maxrss carries over the peak of the parent process on Linux, VmHWM
+        # starts again for every new program
+        for line in status.read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(holder, directory):
+    """Loads the index one way and prints the peak RSS and lookup time."""
+    directory = Path(directory)
+    queries = (directory / "queries.txt").read_text().split("\n")
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if holder == "text":
+        text = (directory / "pypi_index.txt").read_text()
+        found = sum(f"\n{normalize_name(query)}\n" in text for query in queries)
+    elif holder == "set":
+        names = set((directory / "pypi_index.txt").read_text().split())
+        found = sum(normalize_name(query) in names for query in queries)
+    elif holder == "store":
+        store = PyPIIndex(directory / "pypi_index").load_names()
+        found = sum(normalize_name(query).encode() in store for query in queries)
+    else:
+        pypi_index = PyPIIndex(directory / "pypi_index")
+        found = sum(found for _, found in pypi_index.contains_many(queries))
+    elapsed = time.perf_counter() - start
+    assert found == len(queries) // 2, found
+    print(f"{peak_rss_mb() - baseline:.1f} {elapsed:.2f}")
+
+
+def main(count):
+    names = [name.encode() for name in synthetic_names(count)]
+    queries = [name.decode() for name in random.sample(names, 500)]
+    queries += [f"{query}-absent" for query in queries]
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        (directory / "pypi_index.txt").write_bytes(b"\n" + b"\n".join(names) + b"\n")
+        (directory / "queries.txt").write_text("\n".join(queries))
+        write_index(directory / "pypi_index", names)
+        del names
+
+        print(f"{count} names, {len(queries)} lookups")
+        print(f"{'holder':8s} {'peak RSS':>10s} {'load and lookups':>18s}")
+        for holder in HOLDERS:
+            result = subprocess.run(
+                [sys.executable, __file__, "--measure", holder, tmp],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+            rss, elapsed = result.stdout.split()
+            print(f"{holder:8s} {float(rss):7.1f} MB {float(elapsed):16.2f} s")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,76 @@
+"""Benchmark the NumPy hashed index against the pure Python index.
+
+Writes an index of synthetic names with its filter, builds the hashed index, then
+checks batches of candidate names, one in ten of them taken, with each backend.
+
+    python tools/bench_index_numpy.py [number_of_names]
+"""
+
+# Core Library modules
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from bench_index_batch import scattered
+from pynamer.hashed_index import HashedIndex
+from pynamer.index import PyPIIndex, write_index
+from standin_server import synthetic_names
+
+
+def timed(lookup, batch):
+    start = time.perf_counter()
+    results = lookup(batch)
+    return results, time.perf_counter() - start
+
+
+def main(count):
+    rng = random.Random(503)
+    names = synthetic_names(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "pypi_index"
+        filter_file = Path(tmp) / "pypi_index.filter"
+        hash_file = Path(tmp) / "pypi_index.hashes.npy"
+        write_index(index_file, [name.encode() for name in names], filter_file)
+        pypi_index = PyPIIndex(index_file, filter_file)
+        names_file = Path(tmp) / "pypi_index.names.npy"
+        hashed_index = HashedIndex(hash_file, names_file, pypi_index)
+
+        start = time.perf_counter()
+        "warm-up" in hashed_index
+        print(
+            f"{count} names, hashed index built in "
+            f"{time.perf_counter() - start:.2f} s, "
+            f"{(hash_file.stat().st_size + names_file.stat().st_size) / 1e6:.2f} MB"
+        )
+        hashed_index.refresh()
+        start = time.perf_counter()
+        "warm-up" in hashed_index
+        print(f"hashed index loaded in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        for batch_size in (10_000, 100_000):
+            batch = scattered(names, batch_size, rng)
+            dict(pypi_index.contains_many(batch))
+            per_name, per_name_time = timed(
+                lambda b: {name: name in pypi_index for name in b}, batch
+            )
+            merged, merged_time = timed(
+                lambda b: dict(pypi_index.contains_many(b)), batch
+            )
+            hashed, hashed_time = timed(
+                lambda b: dict(hashed_index.contains_many(b)), batch
+            )
+            assert per_name == merged == hashed
+            print(
+                f"{batch_size:7d} candidates  name by name {per_name_time:5.2f} s  "
+                f"one pass {merged_time:5.2f} s  numpy {hashed_time:5.2f} s  "
+                f"{merged_time / hashed_time:5.1f}x"
+            )
+        hashed_index.refresh()
+        pypi_index.refresh()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,97 @@
+"""Benchmark the parse-and-write phase of the simple index generation.
+
+Compares the previous line by line parser (str() of each line, a non-greedy regex,
+one write and one progress update per project) with the streaming chunk parser in
+pynamer.index on a synthetic simple index page. Both progress bars are rendered,
+to a string buffer, as they would be on a terminal.
+
+The chunk parser also writes the compact binary index, see pynamer.index, rather
+than a line of text per name, so its time is shown split into the parse and the
+write. The parse alone is over 5x quicker than the line parser. With 1M names the
+front coding and compression of the write take twice as long again, which leaves
+the whole phase about 2x quicker, e.g.
+
+    line_parser       3.34 s
+    chunk_parser      1.54 s
+      parse           0.48 s
+      write_index     1.04 s
+    speed up           2.2x, 6.9x for the parse alone
+
+    python tools/bench_index_parse.py [number_of_names]
+"""
+
+# Core Library modules
+import io
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Third party modules
+import requests
+from tqdm import tqdm
+
+# First party modules
+from pynamer.index import iter_simple_index, write_index
+from standin_server import simple_index_html, synthetic_names
+
+
+def make_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+def line_parser(response, index_file, total):
+    pattern = re.compile(r">([\w\W]*?)<")
+    with tqdm(total=total, file=io.StringIO()) as progress_bar:
+        with index_file.open("a") as file:
+            for line in response.iter_lines():
+                line = str(line)
+                project_text = re.search(pattern, line)
+                if project_text is not None:
+                    progress_bar.update(1)
+                    file.write("".join([project_text.group(1), " \n"]))
+
+
+def chunk_parser(response, index_file, total, phases):
+    project_names = []
+    start = time.perf_counter()
+    with tqdm(total=total, file=io.StringIO()) as progress_bar:
+        for names in iter_simple_index(response.iter_content(chunk_size=1 << 20)):
+            project_names.extend(names)
+            progress_bar.update(len(names))
+    phases["parse"] = time.perf_counter() - start
+    start = time.perf_counter()
+    write_index(index_file, project_names)
+    phases["write_index"] = time.perf_counter() - start
+
+
+def main(count):
+    body = simple_index_html(synthetic_names(count))
+    print(f"{count} names, {len(body) / 1e6:.1f} MB page")
+    timings = {}
+    phases = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        line_parser(make_response(body), Path(tmp) / "line_parser", count)
+        timings["line_parser"] = time.perf_counter() - start
+        start = time.perf_counter()
+        chunk_parser(make_response(body), Path(tmp) / "chunk_parser", count, phases)
+        timings["chunk_parser"] = time.perf_counter() - start
+    for name, elapsed in timings.items():
+        print(f"{name:14}{elapsed:8.2f} s")
+        if name == "chunk_parser":
+            for phase, phase_elapsed in phases.items():
+                print(f"  {phase:12}{phase_elapsed:8.2f} s")
+    print(
+        f"speed up      {timings['line_parser'] / timings['chunk_parser']:8.1f}x, "
+        f"{timings['line_parser'] / phases['parse']:.1f}x for the parse alone"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,56 @@
+"""Benchmark a full index generation followed by a conditional refresh.
+
+Serves a synthetic simple index from a local stand-in and times two consecutive
+calls to generate_pypi_index. The second call should be answered '304 Not Modified'
+and finish in milliseconds.
+
+    python tools/bench_index_refresh.py [number_of_names]
+"""
+
+# Core Library modules
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer import utils
+from pynamer.config import config
+from standin_server import StandInServer, simple_index_html, synthetic_names
+
+
+def main(count):
+    body = simple_index_html(synthetic_names(count))
+    routes = {
+        "/simple/": (
+            200,
+            {
+                "Content-Type": "text/html",
+                "ETag": '"bench-1"',
+                "X-PyPI-Last-Serial": "1",
+            },
+            body,
+        )
+    }
+    with StandInServer(routes) as server, tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        # every file the generation writes, so the installed index is left alone
+        utils.pypi_index_file_trv = tmp_path / "pypi_index"
+        utils.pypi_index_filter_file_trv = tmp_path / "pypi_index.filter"
+        utils.pypi_index_delta_file_trv = tmp_path / "pypi_index.delta"
+        utils.pypi_index_lock_file_trv = tmp_path / "pypi_index.lock"
+        utils.project_count_file_trv = tmp_path / "project_count.pickle"
+        utils.index_meta_file_trv = tmp_path / "index_meta.pickle"
+        config.pypi_simple_index_url = f"{server.url}/simple/"
+        config.project_count = count
+        config.index_ttl = 0
+
+        for label in ("full generation", "conditional refresh"):
+            start = time.perf_counter()
+            utils.generate_pypi_index()
+            elapsed = time.perf_counter() - start
+            print(f"{label:22}{elapsed * 1000:10.1f} ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
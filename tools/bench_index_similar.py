@@ -0,0 +1,95 @@
+"""Benchmark offline similarity queries against the local index.
+
+Writes an index of synthetic names, builds its trigram index, then times queries
+for misspelt names (one edit away from an existing name) and, for a few of them,
+compares the distances found with a linear scan of every name in the index.
+
+    python tools/bench_index_similar.py [number_of_names] [number_of_queries]
+"""
+
+# Core Library modules
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# First party modules
+from pynamer.index import PyPIIndex, write_index
+from pynamer.similarity import TrigramIndex, edit_distance
+from standin_server import synthetic_names
+
+
+def misspell(name, rng):
+    position = rng.randrange(len(name))
+    letter = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    edit = rng.randrange(3)
+    if edit == 0:
+        return name[:position] + letter + name[position + 1 :]
+    if edit == 1:
+        return name[:position] + letter + name[position:]
+    return name[:position] + name[position + 1 :]
+
+
+def linear_scan(pypi_index, query, limit=10, max_distance=2):
+    target = query.encode()
+    similar = []
+    for name in pypi_index:
+        distance = edit_distance(target, name.encode(), max_distance)
+        if 0 < distance <= max_distance:
+            similar.append((distance, name))
+    similar.sort()
+    return [(name, distance) for distance, name in similar[:limit]]
+
+
+def main(count, query_count):
+    rng = random.Random(503)
+    names = synthetic_names(count)
+    queries = [misspell(rng.choice(names), rng) for _ in range(query_count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = Path(tmp) / "pypi_index"
+        trigram_file = Path(tmp) / "pypi_index.trigrams"
+        write_index(index_file, [name.encode() for name in names])
+        pypi_index = PyPIIndex(index_file)
+        trigram_index = TrigramIndex(trigram_file, pypi_index)
+
+        start = time.perf_counter()
+        trigram_index.nearest("warm-up")
+        print(
+            f"{count} names, trigram index built in "
+            f"{time.perf_counter() - start:.2f} s"
+        )
+        print(f"trigram index size {trigram_file.stat().st_size / 1e6:10.2f} MB")
+
+        trigram_index.refresh()
+        start = time.perf_counter()
+        trigram_index.nearest("warm-up")
+        print(f"trigram index loaded in {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+        start = time.perf_counter()
+        results = [trigram_index.nearest(query) for query in queries]
+        elapsed = time.perf_counter() - start
+        print(
+            f"{query_count} queries in {elapsed:.2f} s, "
+            f"{elapsed / query_count * 1e3:.2f} ms per query"
+        )
+        print(f"queries with a match {sum(map(bool, results)) / query_count:10.1%}")
+
+        start = time.perf_counter()
+        for query, result in list(zip(queries, results))[:3]:
+            # names tied at the largest distance may differ, the distances may not
+            expected = linear_scan(pypi_index, query)
+            assert [d for _, d in expected] == [d for _, d in result], query
+        print(
+            f"linear scan          "
+            f"{(time.perf_counter() - start) / 3 * 1e3:10.0f} ms per query"
+        )
+        trigram_index.refresh()
+        pypi_index.refresh()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000,
+    )
@@ -0,0 +1,91 @@
+"""Benchmark the shared per-host session against a new connection per request.
+
+Serves the JSON API of a set of synthetic projects from a local stand-in and runs
+ping_project and ping_json for every name, first with a plain requests.get per
+request (how every validator used to connect) and then through the shared sessions
+of pynamer.network. Reports the mean time per name and the number of requests,
+bytes and connections the stand-in served. Both tests of a name share one download
+of its JSON document, see validators.fetch_project_json.
+
+The stand-in speaks plain HTTP on the loopback interface, so this only measures the
+TCP connection saved per request. Against PyPI each request also saves a TLS
+handshake and the round trips to a remote host, which cost far more.
+
+    python tools/bench_network_session.py [number_of_names]
+"""
+
+# Core Library modules
+import json
+import sys
+import time
+
+# Third party modules
+import requests
+
+# First party modules
+from pynamer import network, validators
+from pynamer.config import config
+from standin_server import StandInServer, synthetic_names
+
+
+def project_json(name):
+    info = {
+        "author": "bench",
+        "author_email": "bench@example.com",
+        "home_page": "",
+        "project_urls": None,
+        "summary": f"the {name} project",
+        "version": "1.0.0",
+    }
+    return json.dumps({"info": info, "urls": []}).encode("utf-8")
+
+
+def plain_request(method):
+    # the signature of network.get and network.head, with nothing cached
+    def request(url, ttl=0.0, **kwargs):
+        return requests.request(method, url, **kwargs)
+
+    return request
+
+
+def run(names):
+    start = time.perf_counter()
+    for name in names:
+        validators.ping_project(name)
+        validators.ping_json(name)
+    return (time.perf_counter() - start) / len(names)
+
+
+def main(count):
+    names = synthetic_names(count)
+    routes = {}
+    for name in names:
+        route = (200, {"Content-Type": "application/json"}, project_json(name))
+        routes[f"/pypi/{name}/json/"] = route
+        routes[f"/pypi/{name}/json"] = route
+    shared = network.get, network.head
+    with StandInServer(routes) as server:
+        config.pypi_json_url = f"{server.url}/pypi/"
+        # every request goes to the stand-in, none is answered from the disk cache
+        config.http_cache_bypass = True
+        print(f"{count} names")
+        for label, (get, head) in (
+            ("requests.get", (plain_request("GET"), plain_request("HEAD"))),
+            ("shared session", shared),
+        ):
+            network.get, network.head = get, head
+            validators._fetch_project_json.cache_clear()
+            server.connection_ids.clear()
+            server.request_count = server.bytes_sent = 0
+            per_name = run(names)
+            print(
+                f"{label:16}{per_name * 1000:8.2f} ms/name"
+                f"{server.request_count:8} requests"
+                f"{server.bytes_sent / 1e3:10.1f} kB"
+                f"{len(server.connection_ids):8} connections"
+            )
+        network.close_sessions()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
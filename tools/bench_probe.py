@@ -0,0 +1,98 @@
+"""Benchmark the bytes transferred by test 1 with a HEAD probe and with the JSON GET.
+
+Serves JSON API documents shaped like those of PyPI, with a releases map of many
+versions and files, from a local stand-in for the taken half of a set of synthetic
+names. For both settings of config.project_probe, counts the body bytes the
+stand-in sends for test 1 alone (ping_project) and for test 1 with the details of
+a taken name (ping_project with details=True then ping_json, as the engine does),
+per taken and per free name.
+
+    python tools/bench_probe.py [number_of_names] [releases_per_project]
+"""
+
+# Core Library modules
+import json
+import sys
+
+# First party modules
+from pynamer import network, validators
+from pynamer.config import config
+from standin_server import StandInServer, synthetic_names
+
+
+def project_json(name, releases):
+    def release_file(version, kind):
+        return {
+            "filename": f"{name}-{version}-{kind}",
+            "url": f"https://files.example.com/{name}/{name}-{version}-{kind}",
+            "digests": {"sha256": "0" * 64, "md5": "0" * 32},
+            "size": 123456,
+            "upload_time_iso_8601": "2023-01-01T00:00:00.000000Z",
+            "requires_python": ">=3.9",
+            "yanked": False,
+        }
+
+    versions = [f"1.{n}.0" for n in range(releases)]
+    info = {
+        "author": "bench",
+        "author_email": "bench@example.com",
+        "home_page": "",
+        "project_urls": None,
+        "summary": f"the {name} project",
+        "version": versions[-1],
+    }
+    document = {
+        "info": info,
+        "releases": {
+            version: [release_file(version, kind) for kind in ("whl", "tar.gz")]
+            for version in versions
+        },
+        "urls": [release_file(versions[-1], "whl")],
+    }
+    return json.dumps(document).encode("utf-8")
+
+
+def transferred(server, names, details):
+    validators._fetch_project_json.cache_clear()
+    before = server.bytes_sent
+    for name in names:
+        if validators.ping_project(name, details=details) and details:
+            validators.ping_json(name)
+    return (server.bytes_sent - before) / len(names)
+
+
+def main(count, releases):
+    names = synthetic_names(count)
+    taken, free = names[::2], names[1::2]
+    routes = {
+        f"/pypi/{name}/json": (
+            200,
+            {"Content-Type": "application/json"},
+            project_json(name, releases),
+        )
+        for name in taken
+    }
+    with StandInServer(routes) as server:
+        config.pypi_json_url = f"{server.url}/pypi/"
+        config.index_ttl = 0
+        config.http_cache_bypass = True
+        size = len(next(iter(routes.values()))[2])
+        print(f"{count} names, {releases} releases, {size / 1024:.0f} KiB a document")
+        print(f"{'probe':8}{'':18}{'per taken':>10}{'per free':>12}")
+        for probe in ("json", "head"):
+            config.project_probe = probe
+            for details in (False, True):
+                label = "test 1 + details" if details else "test 1"
+                print(
+                    f"{probe:8}{label:18}"
+                    f"{transferred(server, taken, details):8.0f} B"
+                    f"{transferred(server, free, details):10.0f} B"
+                )
+    network.close_sessions()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 40,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 300,
+    )
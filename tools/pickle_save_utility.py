@@ -108,6 +108,39 @@ def manual_simple_index():
         pickle.dump(response, f)
 
 
+small_json_content = b"""{"meta":{"_last-serial":31000000,"api-version":"1.1"},"projects":[
+{"_last-serial":30000001,"name":"pynavigator"},
+{"_last-serial":30000002,"name":"pynavio"},
+{"_last-serial":30000003,"name":"pyNAVIS"},
+{"_last-serial":30000004,"name":"pynavmesh"},
+{"_last-serial":30000005,"name":"pynavt"},
+{"_last-serial":30000006,"name":"pynb"},
+{"_last-serial":30000007,"name":"pynb2docker"},
+{"_last-serial":30000008,"name":"pynba"},
+{"_last-serial":30000009,"name":"pynbaapi"},
+{"_last-serial":30000010,"name":"pynball"},
+{"_last-serial":30000011,"name":"py-nba-stats"},
+{"_last-serial":30000012,"name":"pynbcache"},
+{"_last-serial":30000013,"name":"pynb-dag-runner"},
+{"_last-serial":30000014,"name":"pynb-dag-runner-snapshot"},
+{"_last-serial":30000015,"name":"pynb-dag-runner-webui"}]}"""
+
+
+def manual_simple_index_json():
+    index_file_name = BASE_DIR / "tests" / "resources" / "simple_index_json.pickle"
+    response = requests.Response()
+    response.status_code = 200
+    response.headers = requests.structures.CaseInsensitiveDict(
+        {
+            "Content-Type": "application/vnd.pypi.simple.v1+json",
+            "X-PyPI-Last-Serial": "31000000",
+        }
+    )
+    response._content = small_json_content
+    with open(index_file_name, "wb") as f:
+        pickle.dump(response, f)
+
+
 def get_github_meta(url):
     print(url)
     return_text = "GitHub Stats\n------------\n"
@@ -0,0 +1,122 @@
+"""A local HTTP stand-in for PyPI used by the benchmark scripts in this directory.
+
+Routes map a URL path to either a (status, headers, body) tuple or a callable taking
+the request handler and returning one. Responses carrying an ETag are answered with
+'304 Not Modified' when the request sends a matching If-None-Match header.
+"""
+
+# Core Library modules
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # the headers and body are written separately, which on a kept-alive connection
+    # would otherwise wait on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, send_body):
+        server = self.server
+        with server.lock:
+            server.request_count += 1
+            server.connection_ids.add(self.client_address)
+        if server.delay:
+            time.sleep(server.delay)
+        route = server.routes.get(urlsplit(self.path).path)
+        if route is None:
+            status, headers, body = 404, {}, b"Not Found"
+        elif callable(route):
+            status, headers, body = route(self)
+        else:
+            status, headers, body = route
+        etag = headers.get("ETag")
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if send_body and body:
+            self.wfile.write(body)
+            with server.lock:
+                server.bytes_sent += len(body)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, routes, delay=0.0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.routes = routes
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.bytes_sent = 0
+        self.connection_ids = set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+def simple_index_html(names):
+    """Builds a PEP 503 simple index page listing the given project names."""
+    anchors = "".join(f'    <a href="/simple/{name}/">{name}</a>\n' for name in names)
+    return "".join(
+        [
+            "<!DOCTYPE html>\n<html>\n  <head>\n",
+            '    <meta name="pypi:repository-version" content="1.1">\n',
+            "    <title>Simple index</title>\n  </head>\n  <body>\n",
+            anchors,
+            "  </body>\n</html>",
+        ]
+    ).encode("utf-8")
+
+
+def simple_index_json(names, last_serial=1):
+    """Builds a PEP 691 JSON simple index listing the given project names."""
+    projects = ",".join(
+        f'{{"_last-serial":{last_serial},"name":"{name}"}}' for name in names
+    )
+    return "".join(
+        [
+            f'{{"meta":{{"_last-serial":{last_serial},"api-version":"1.1"}},',
+            f'"projects":[{projects}]}}',
+        ]
+    ).encode("utf-8")
+
+
+def synthetic_names(count):
+    """Returns a deterministic, sorted list of plausible, unique project names.
+
+    Sorted because PyPI serves its simple index in (almost) normalized order.
+    """
+    stems = ["py", "django-", "flask-", "lib", "data", "ml", "async", "tool", ""]
+    words = ["core", "utils", "client", "api", "kit", "lab", "io", "x", "hub"]
+    names = []
+    for i in range(count):
+        stem = stems[i % len(stems)]
+        word = words[(i // len(stems)) % len(words)]
+        names.append(f"{stem}{word}{i}")
+    return sorted(names)